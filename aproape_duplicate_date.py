@@ -0,0 +1,251 @@
+"""
+Detectarea rândurilor aproape duplicate (ex. înregistrări introduse de două ori cu mici diferențe), cu MinHash și LSH.
+
+- Fiecare rând devine o mulțime de jetoane: câte un jeton per valoare categorială sau booleană și câte două
+  jetoane per valoare numerică (intervalul valorii în două grile decalate cu o jumătate de interval,
+  astfel încât valori apropiate aflate la granița unui interval să aibă totuși un jeton comun).
+- Semnătura MinHash a unui rând păstrează minimul a `NUMAR_PERMUTARI` funcții hash peste jetoanele sale;
+  probabilitatea ca două semnături să coincidă pe o poziție este similaritatea Jaccard a rândurilor.
+- Semnăturile sunt împărțite în benzi (LSH): rândurile cu aceeași bandă ajung în aceeași găleată, iar
+  perechile candidate sunt găsite în timp aproape liniar, fără a compara toate perechile de rânduri.
+- Fiecare pereche candidată este verificată cu similaritatea Jaccard exactă a jetoanelor, iar perechile
+  peste prag sunt grupate în componente conexe.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+import streamlit as st
+
+from contingenta_date import coduri_coloana
+from schema_date import coloane_de_tip, get_schema, get_versiune
+
+
+NUMAR_BENZI = 16
+RANDURI_BANDA = 4
+NUMAR_PERMUTARI = NUMAR_BENZI * RANDURI_BANDA
+NUMAR_INTERVALE = 50
+ELEMENTE_BLOC = 2 ** 24
+MARIME_GALEATA_COMPLETA = 32
+PRAG_SIMILARITATE = 0.8
+
+
+def amestecare(x: np.ndarray) -> np.ndarray:
+	"""
+	Amestecă biții unor valori `uint64` (finalizatorul SplitMix64), pentru jetoane distribuite uniform.
+	"""
+	x = x.astype(np.uint64)
+	x ^= x >> np.uint64(30)
+	x *= np.uint64(0xBF58476D1CE4E5B9)
+	x ^= x >> np.uint64(27)
+	x *= np.uint64(0x94D049BB133111EB)
+	x ^= x >> np.uint64(31)
+	return x
+
+
+def calcul_jetoane(df: pd.DataFrame, coloane_numerice: list, coloane_categoriale: list) -> np.ndarray:
+	"""
+	Transformă fiecare rând într-o mulțime de jetoane de 32 de biți.
+
+	Parametri:
+	----------
+	df : pd.DataFrame
+		Setul de date.
+	coloane_numerice : list of str
+		Coloanele numerice, împărțite în `NUMAR_INTERVALE` intervale egale (două grile decalate).
+	coloane_categoriale : list of str
+		Coloanele categoriale sau booleene, folosite cu valorile lor exacte.
+
+	Returnează:
+	-----------
+	np.ndarray
+		Matrice `uint32` (rânduri × jetoane); jetonul include poziția coloanei,
+		deci aceeași valoare în coloane diferite dă jetoane diferite. Valorile lipsă au propriul jeton.
+	"""
+	coduri = []
+	for col in coloane_categoriale:
+		coduri.append(coduri_coloana(df[col])[0])
+	for col in coloane_numerice:
+		valori = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+		prezente = ~np.isnan(valori)
+		minim = valori[prezente].min() if prezente.any() else 0.0
+		maxim = valori[prezente].max() if prezente.any() else 0.0
+		latime = (maxim - minim) / NUMAR_INTERVALE or 1.0
+		for decalaj in [0.0, 0.5]:
+			interval = np.floor((np.where(prezente, valori, minim) - minim) / latime + decalaj).astype(np.int64)
+			coduri.append(np.where(prezente, interval, -1))
+
+	jetoane = np.empty((len(df), len(coduri)), dtype=np.uint32)
+	for j, cod in enumerate(coduri):
+		jetoane[:, j] = amestecare((np.uint64(j) << np.uint64(32)) + (cod + 1).astype(np.uint64)) >> np.uint64(32)
+	return jetoane
+
+
+def calcul_semnaturi(jetoane: np.ndarray, seed: int = 0) -> np.ndarray:
+	"""
+	Calculează semnăturile MinHash ale rândurilor (rânduri × `NUMAR_PERMUTARI`, `uint32`).
+
+	Fiecare permutare este h(x) = (a·x + b) mod 2³², cu `a` impar (o bijecție pe 32 de biți), aplicată
+	jetoanelor deja amestecate. Rândurile sunt procesate pe blocuri, cu jetoanele unui bloc transpuse
+	(jetoane × rânduri), astfel încât minimul pe rând să fie o reducere pe memorie contiguă.
+	"""
+	rng = np.random.default_rng(seed)
+	a = (rng.integers(0, 2 ** 31, size=NUMAR_PERMUTARI, dtype=np.uint32) * np.uint32(2) + np.uint32(1)).astype(np.uint32)
+	b = rng.integers(0, 2 ** 32, size=NUMAR_PERMUTARI, dtype=np.uint64).astype(np.uint32)
+	n, m = jetoane.shape
+	semnaturi = np.empty((NUMAR_PERMUTARI, n), dtype=np.uint32)
+	if m == 0:
+		semnaturi[:] = 0
+		return semnaturi.T
+	pas = max(1, ELEMENTE_BLOC // m)
+	for start in range(0, n, pas):
+		bloc = np.ascontiguousarray(jetoane[start:start + pas].T)
+		temporar = np.empty_like(bloc)
+		for k in range(NUMAR_PERMUTARI):
+			np.multiply(bloc, a[k], out=temporar)
+			np.add(temporar, b[k], out=temporar)
+			temporar.min(axis=0, out=semnaturi[k, start:start + pas])
+	return semnaturi.T
+
+
+def perechi_candidate(semnaturi: np.ndarray) -> np.ndarray:
+	"""
+	Returnează perechile candidate (i < j) care au cel puțin o bandă LSH identică.
+
+	În fiecare bandă, rândurile sunt grupate după valoarea benzii. În gălețile mici (cel mult
+	`MARIME_GALEATA_COMPLETA` rânduri) sunt generate toate perechile; în cele mari, fiecare rând este pus
+	în pereche doar cu primul rând al găleții, astfel încât numărul de perechi rămâne liniar.
+	"""
+	n = len(semnaturi)
+	if n < 2:
+		return np.empty((0, 2), dtype=np.int64)
+	perechi = []
+	for banda in range(NUMAR_BENZI):
+		# Cheia găleții: valorile benzii combinate într-un singur hash de 64 de biți
+		cheie = np.zeros(n, dtype=np.uint64)
+		for k in range(banda * RANDURI_BANDA, (banda + 1) * RANDURI_BANDA):
+			cheie = amestecare(cheie ^ semnaturi[:, k].astype(np.uint64))
+		galeata, _ = pd.factorize(cheie)
+		marime = np.bincount(galeata)
+		# Gălețile sunt numerotate în ordinea primei apariții, deci primul rând al fiecăreia este un nou maxim
+		noi = np.empty(n, dtype=bool)
+		noi[0] = True
+		noi[1:] = galeata[1:] > np.maximum.accumulate(galeata)[:-1]
+		reprezentant = np.flatnonzero(noi)[galeata]
+		mari = np.flatnonzero(~noi & (marime[galeata] > MARIME_GALEATA_COMPLETA))
+		perechi.append(reprezentant[mari] * n + mari)
+
+		# Găleți mici: rândurile sortate după găleată și toate perechile aflate la distanța 1..marime-1
+		mici = np.flatnonzero((marime[galeata] > 1) & (marime[galeata] <= MARIME_GALEATA_COMPLETA))
+		mici = mici[np.argsort(galeata[mici], kind="stable")]
+		for distanta in range(1, min(int(marime.max()), MARIME_GALEATA_COMPLETA)):
+			aceeasi = galeata[mici[distanta:]] == galeata[mici[:-distanta]]
+			perechi.append(mici[:-distanta][aceeasi] * n + mici[distanta:][aceeasi])
+	unice = np.unique(np.concatenate(perechi))
+	return np.column_stack(np.divmod(unice, n))
+
+
+def similaritate_jetoane(jetoane: np.ndarray, perechi: np.ndarray) -> np.ndarray:
+	"""
+	Calculează similaritatea Jaccard exactă a mulțimilor de jetoane pentru fiecare pereche de rânduri.
+	Fiecare rând are același număr `m` de jetoane distincte, deci J = comune / (2m - comune).
+	"""
+	m = jetoane.shape[1]
+	similaritate = np.empty(len(perechi), dtype=np.float64)
+	pas = max(1, ELEMENTE_BLOC // max(m, 1))
+	for start in range(0, len(perechi), pas):
+		bloc = perechi[start:start + pas]
+		comune = (jetoane[bloc[:, 0]] == jetoane[bloc[:, 1]]).sum(axis=1)
+		similaritate[start:start + pas] = comune / (2 * m - comune)
+	return similaritate
+
+
+def grupare_perechi(n: int, perechi: np.ndarray, similaritate: np.ndarray) -> pd.DataFrame:
+	"""
+	Grupează rândurile legate prin perechi similare în componente conexe.
+
+	Returnează:
+	-----------
+	pd.DataFrame
+		Câte un rând per rând al setului de date aflat într-un grup, cu coloanele "Grup" (numerotat de la 1,
+		în ordinea descrescătoare a mărimii) "Rând" (poziția rândului) și "Similaritate" (cea mai mare
+		similaritate cu un alt rând din grup).
+	"""
+	if len(perechi) == 0:
+		return pd.DataFrame({"Grup": [], "Rând": [], "Similaritate": []})
+	graf = coo_matrix((np.ones(len(perechi)), (perechi[:, 0], perechi[:, 1])), shape=(n, n))
+	_, componenta = connected_components(graf, directed=False)
+	maxim = np.zeros(n)
+	np.maximum.at(maxim, perechi[:, 0], similaritate)
+	np.maximum.at(maxim, perechi[:, 1], similaritate)
+
+	randuri = np.unique(perechi)
+	grupuri = pd.DataFrame({"componenta": componenta[randuri], "Rând": randuri, "Similaritate": maxim[randuri]})
+	marime = grupuri["componenta"].map(grupuri["componenta"].value_counts())
+	grupuri = grupuri.assign(marime=marime).sort_values(["marime", "componenta", "Rând"], ascending=[False, True, True])
+	grupuri.insert(0, "Grup", pd.factorize(grupuri["componenta"])[0] + 1)
+	return grupuri.drop(columns=["componenta", "marime"]).reset_index(drop=True)
+
+
+def calcul_aproape_duplicate(jetoane: np.ndarray, semnaturi: np.ndarray, prag: float = PRAG_SIMILARITATE) -> dict:
+	"""
+	Găsește grupurile de rânduri aproape duplicate.
+
+	Parametri:
+	----------
+	jetoane : np.ndarray
+		Jetoanele rândurilor (vezi `calcul_jetoane`).
+	semnaturi : np.ndarray
+		Semnăturile MinHash ale rândurilor (vezi `calcul_semnaturi`).
+	prag : float, implicit 0.8
+		Similaritatea Jaccard minimă dintre două rânduri considerate aproape duplicate.
+
+	Returnează:
+	-----------
+	dict
+		- "grupuri": pd.DataFrame — rândurile din grupuri, cu "Grup", "Rând" și "Similaritate" (vezi `grupare_perechi`)
+		- "perechi": pd.DataFrame — perechile verificate peste prag ("Rând 1", "Rând 2", "Similaritate")
+		- "numar_candidate": int — numărul de perechi candidate găsite prin LSH
+	"""
+	candidate = perechi_candidate(semnaturi)
+	similaritate = similaritate_jetoane(jetoane, candidate)
+	pastrate = similaritate >= prag
+	perechi, similaritate = candidate[pastrate], similaritate[pastrate]
+	return {
+		"grupuri": grupare_perechi(len(jetoane), perechi, similaritate),
+		"perechi": pd.DataFrame({"Rând 1": perechi[:, 0], "Rând 2": perechi[:, 1], "Similaritate": similaritate}),
+		"numar_candidate": len(candidate),
+	}
+
+
+@st.cache_resource(show_spinner="Calcul semnături MinHash...", max_entries=4)
+def semnaturi_versiune(versiune: str, _df: pd.DataFrame, _schema: pd.DataFrame) -> dict:
+	"""
+	Returnează jetoanele și semnăturile MinHash pentru o versiune a datelor, calculate o singură dată
+	și partajate între sesiuni.
+	"""
+	jetoane = calcul_jetoane(
+		_df, coloane_de_tip(_schema, "numerică"), coloane_de_tip(_schema, "categorială", "booleană")
+	)
+	return {"jetoane": jetoane, "semnaturi": calcul_semnaturi(jetoane)}
+
+
+@st.cache_data(show_spinner="Căutare aproape duplicate...", max_entries=16)
+def aproape_duplicate_versiune(versiune: str, prag: float, _df: pd.DataFrame, _schema: pd.DataFrame) -> dict:
+	"""
+	Returnează grupurile de rânduri aproape duplicate pentru o versiune a datelor și un prag de similaritate.
+	"""
+	semnaturi = semnaturi_versiune(versiune, _df, _schema)
+	return calcul_aproape_duplicate(semnaturi["jetoane"], semnaturi["semnaturi"], prag)
+
+
+def get_aproape_duplicate(prag: float = PRAG_SIMILARITATE):
+	"""
+	Returnează grupurile de rânduri aproape duplicate ale datelor din session_state
+	sau None dacă nu există date încărcate.
+	"""
+	df = st.session_state.get("df")
+	if df is None:
+		return None
+	return aproape_duplicate_versiune(get_versiune(), prag, df, get_schema())
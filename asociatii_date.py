@@ -0,0 +1,122 @@
+"""
+Matricele de asociere dintre variabilele categoriale (Cramér's V și informație mutuală), calculate o singură dată per versiune.
+
+- Fiecare coloană categorială sau booleană este înlocuită cu codurile întregi ale valorilor.
+- Pentru fiecare pereche de coloane, tabelul de contingență este obținut dintr-un singur `np.bincount`
+  pe codul combinat (vezi `asociatii_lucru.asocieri_coloana`).
+- Pe seturi de date mari, perechile sunt împărțite între procese (`ProcessPoolExecutor`); codurile
+  sunt copiate o singură dată într-un bloc de memorie partajată, la care procesele se atașează la pornire.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from multiprocessing import shared_memory
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from asociatii_lucru import asocieri_coloana, initializare_proces, sarcina_coloana
+from contingenta_date import coduri_coloana
+from schema_date import coloane_de_tip, get_schema, get_versiune
+
+
+PRAG_RANDURI_PROCESE = 200_000
+NUMAR_MAXIM_PROCESE = 8
+
+
+def matrice_coduri(df: pd.DataFrame, coloane: list):
+	"""
+	Returnează matricea codurilor întregi (coloane × rânduri, -1 pentru valori lipsă) și cardinalitățile coloanelor.
+	Fiecare coloană ocupă un rând contiguu în memorie.
+	"""
+	coduri = np.empty((len(coloane), len(df)), dtype=np.int32)
+	cardinalitati = np.empty(len(coloane), dtype=np.int64)
+	for j, col in enumerate(coloane):
+		coduri_col, valori = coduri_coloana(df[col])
+		coduri[j] = coduri_col
+		cardinalitati[j] = len(valori)
+	return coduri, cardinalitati
+
+
+def asocieri_in_procese(coduri: np.ndarray, cardinalitati: np.ndarray, numar_procese: int) -> list:
+	"""
+	Calculează asocierile tuturor perechilor de coloane, împărțite pe coloane între mai multe procese.
+	"""
+	memorie = shared_memory.SharedMemory(create=True, size=max(coduri.nbytes, 1))
+	try:
+		partajate = np.ndarray(coduri.shape, dtype=coduri.dtype, buffer=memorie.buf)
+		partajate[:] = coduri
+		p = coduri.shape[0]
+		with ProcessPoolExecutor(
+			max_workers=numar_procese,
+			mp_context=multiprocessing.get_context("spawn"),
+			initializer=initializare_proces,
+			initargs=(memorie.name, coduri.shape, coduri.dtype.str, cardinalitati),
+		) as executor:
+			sarcini = [executor.submit(sarcina_coloana, i, list(range(i + 1, p))) for i in range(p - 1)]
+			return [rezultat for sarcina in sarcini for rezultat in sarcina.result()]
+	finally:
+		memorie.close()
+		memorie.unlink()
+
+
+def calcul_asocieri(df: pd.DataFrame, coloane: list, numar_procese: int = None) -> dict:
+	"""
+	Calculează matricele de asociere pentru toate perechile de coloane categoriale.
+
+	Parametri:
+	----------
+	df : pd.DataFrame
+		Setul de date.
+	coloane : list of str
+		Coloanele categoriale (sau booleene) analizate.
+	numar_procese : int, optional
+		Numărul de procese folosite. Implicit, procesele sunt folosite doar pentru seturi de date
+		cu cel puțin `PRAG_RANDURI_PROCESE` rânduri, câte unul per nucleu (cel mult `NUMAR_MAXIM_PROCESE`).
+
+	Returnează:
+	-----------
+	dict
+		- "cramer_v": pd.DataFrame — Cramér's V (0 = independență, 1 = asociere perfectă)
+		- "informatie_mutuala": pd.DataFrame — informația mutuală normalizată (0-1)
+		- "informatie_mutuala_nats": pd.DataFrame — informația mutuală în nats
+	"""
+	coduri, cardinalitati = matrice_coduri(df, coloane)
+	p = len(coloane)
+	if numar_procese is None:
+		numar_procese = min(os.cpu_count() or 1, NUMAR_MAXIM_PROCESE) if len(df) >= PRAG_RANDURI_PROCESE else 1
+
+	if numar_procese > 1 and p > 2:
+		rezultate = asocieri_in_procese(coduri, cardinalitati, numar_procese)
+	else:
+		rezultate = [r for i in range(p - 1) for r in asocieri_coloana(coduri, cardinalitati, i, list(range(i + 1, p)))]
+
+	matrice = {nume: np.full((p, p), np.nan) for nume in ["cramer_v", "informatie_mutuala_nats", "informatie_mutuala"]}
+	for i, j, *valori in rezultate:
+		for nume, valoare in zip(matrice, valori):
+			matrice[nume][i, j] = matrice[nume][j, i] = valoare
+	prezente = (coduri >= 0).sum(axis=1)
+	diagonala = np.where((cardinalitati > 1) & (prezente > 0), 1.0, np.nan)
+	np.fill_diagonal(matrice["cramer_v"], diagonala)
+	np.fill_diagonal(matrice["informatie_mutuala"], diagonala)
+	return {nume: pd.DataFrame(valori, index=coloane, columns=coloane) for nume, valori in matrice.items()}
+
+
+@st.cache_data(show_spinner="Calcul matrice de asociere...", max_entries=8)
+def asocieri_versiune(versiune: str, _df: pd.DataFrame, _schema: pd.DataFrame) -> dict:
+	"""
+	Returnează matricele de asociere pentru o versiune a datelor, calculate o singură dată și partajate între sesiuni.
+	"""
+	return calcul_asocieri(_df, coloane_de_tip(_schema, "categorială", "booleană"))
+
+
+def get_asocieri():
+	"""
+	Returnează matricele de asociere ale datelor din session_state sau None dacă nu există date încărcate.
+	"""
+	df = st.session_state.get("df")
+	if df is None:
+		return None
+	return asocieri_versiune(get_versiune(), df, get_schema())
@@ -0,0 +1,124 @@
+"""
+Funcțiile de lucru pentru calculul asocierilor dintre variabilele categoriale (Cramér's V, informație mutuală).
+
+Modulul depinde doar de NumPy, pentru a putea fi importat rapid în procesele de lucru
+(`ProcessPoolExecutor`). Codurile întregi ale coloanelor sunt puse la dispoziția proceselor
+o singură dată, printr-un bloc de memorie partajată atașat în `initializare_proces`.
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+_CODURI = None
+_CARDINALITATI = None
+_MEMORIE = None
+
+
+LIMITA_CELULE_TABEL = 2 ** 24
+
+
+def asociere_din_celule(rand: np.ndarray, coloana: np.ndarray, numarari: np.ndarray):
+	"""
+	Calculează asocierea dintre două variabile categoriale din celulele nenule ale tabelului lor de contingență.
+
+	Parametri:
+	----------
+	rand, coloana : np.ndarray
+		Codurile (0..k-1) valorilor celor două variabile pentru fiecare celulă.
+	numarari : np.ndarray
+		Numărul de rânduri din fiecare celulă.
+
+	Returnează:
+	-----------
+	tuple (float, float, float)
+		Cramér's V, informația mutuală (în nats) și informația mutuală normalizată (MI / sqrt(H(a) * H(b))).
+		NaN dacă una dintre variabile are o singură valoare.
+	"""
+	n = numarari.sum()
+	total_rand = np.bincount(rand, weights=numarari)
+	total_coloana = np.bincount(coloana, weights=numarari)
+	total_rand = total_rand[total_rand > 0]
+	total_coloana = total_coloana[total_coloana > 0]
+	if n == 0 or min(len(total_rand), len(total_coloana)) < 2:
+		return np.nan, np.nan, np.nan
+
+	p = numarari / n
+	asteptat = (np.bincount(rand, weights=numarari)[rand] / n) * (np.bincount(coloana, weights=numarari)[coloana] / n)
+	chi2 = n * ((p ** 2 / asteptat).sum() - 1)
+	cramer_v = np.sqrt(max(chi2, 0.0) / (n * (min(len(total_rand), len(total_coloana)) - 1)))
+
+	informatie_mutuala = max(float((p * np.log(p / asteptat)).sum()), 0.0)
+	p_rand = total_rand / n
+	p_coloana = total_coloana / n
+	entropie_rand = -(p_rand * np.log(p_rand)).sum()
+	entropie_coloana = -(p_coloana * np.log(p_coloana)).sum()
+	normalizata = informatie_mutuala / np.sqrt(entropie_rand * entropie_coloana)
+	return float(min(cramer_v, 1.0)), informatie_mutuala, float(min(normalizata, 1.0))
+
+
+def asocieri_coloana(coduri: np.ndarray, cardinalitati: np.ndarray, i: int, coloane_j: list) -> list:
+	"""
+	Calculează asocierile coloanei `i` cu fiecare coloană din `coloane_j`.
+
+	Parametri:
+	----------
+	coduri : np.ndarray
+		Codurile coloanelor, câte un rând per coloană (coloane × rânduri; -1 pentru valori lipsă).
+	cardinalitati : np.ndarray
+		Numărul de valori posibile ale fiecărei coloane.
+	i : int
+		Indicele coloanei analizate.
+	coloane_j : list of int
+		Indicii coloanelor cu care se calculează asocierea.
+
+	Returnează:
+	-----------
+	list of tuple
+		Tupluri (i, j, cramer_v, informatie_mutuala, informatie_mutuala_normalizata).
+
+	Codul valorii din coloana `i` este înmulțit o singură dată cu un pas comun tuturor perechilor,
+	iar tabelul fiecărei perechi este un singur `np.bincount` pe `baza + cod_j`. Valorile lipsă
+	primesc codul 0 (după deplasarea cu 1) și sunt eliminate din tabel.
+	"""
+	if not coloane_j:
+		return []
+	k_a = int(cardinalitati[i])
+	pas = int(cardinalitati[coloane_j].max()) + 1
+	rezultate = []
+	if (k_a + 1) * pas <= LIMITA_CELULE_TABEL:
+		baza = (coduri[i].astype(np.int64) + 1) * pas + 1
+		for j in coloane_j:
+			tabel = np.bincount(baza + coduri[j], minlength=(k_a + 1) * pas).reshape(k_a + 1, pas)
+			rand, coloana = np.nonzero(tabel[1:, 1:])
+			rezultate.append((i, j, *asociere_din_celule(rand, coloana, tabel[rand + 1, coloana + 1])))
+		return rezultate
+
+	# Cardinalități foarte mari: doar celulele nenule, obținute prin sortare
+	for j in coloane_j:
+		prezente = (coduri[i] >= 0) & (coduri[j] >= 0)
+		combinate = coduri[i][prezente].astype(np.int64) * int(cardinalitati[j]) + coduri[j][prezente]
+		celule, numarari = np.unique(combinate, return_counts=True)
+		rand, coloana = np.divmod(celule, int(cardinalitati[j]))
+		_, rand = np.unique(rand, return_inverse=True)
+		_, coloana = np.unique(coloana, return_inverse=True)
+		rezultate.append((i, j, *asociere_din_celule(rand, coloana, numarari)))
+	return rezultate
+
+
+def initializare_proces(nume_memorie: str, forma: tuple, tip: str, cardinalitati: np.ndarray):
+	"""
+	Atașează procesul de lucru la blocul de memorie partajată ce conține codurile coloanelor.
+	"""
+	global _CODURI, _CARDINALITATI, _MEMORIE
+	_MEMORIE = shared_memory.SharedMemory(name=nume_memorie)
+	_CODURI = np.ndarray(forma, dtype=tip, buffer=_MEMORIE.buf)
+	_CARDINALITATI = cardinalitati
+
+
+def sarcina_coloana(i: int, coloane_j: list) -> list:
+	"""
+	Sarcina executată în procesele de lucru: asocierile coloanei `i`, din codurile partajate.
+	"""
+	return asocieri_coloana(_CODURI, _CARDINALITATI, i, coloane_j)
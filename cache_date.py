@@ -0,0 +1,190 @@
+"""
+Cache pe disc pentru seturile de date încărcate, indexat după hash-ul conținutului fișierului.
+
+- Calculează un hash SHA-256 al fișierului încărcat, citit în blocuri.
+- Salvează DataFrame-ul parsat în format columnar binar (Arrow IPC / Feather, necomprimat).
+- La încărcările ulterioare, fișierul este deschis prin memory-mapping, fără a mai parsa textul CSV.
+- Datele citite din cache sunt păstrate o singură dată în proces (`st.cache_resource`),
+  astfel încât toate sesiunile care deschid același fișier folosesc aceeași copie; sunt păstrate
+  cel mult `MAX_SETURI_IN_MEMORIE` seturi de date.
+- Directorul de cache este limitat după dimensiune (`LIMITA_DIMENSIUNE_CACHE`): după fiecare salvare sunt
+  șterse fișierele folosite cel mai demult (LRU, după data ultimei citiri sau scrieri), împreună cu
+  copia lor din memorie.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+
+DIRECTOR_CACHE = Path(__file__).parent / ".cache_date"
+DIMENSIUNE_BLOC = 1024 ** 2
+LIMITA_DIMENSIUNE_CACHE = 2 * 1024 ** 3
+MAX_SETURI_IN_MEMORIE = 4
+
+
+def hash_continut(fisier) -> str:
+	"""
+	Calculează hash-ul SHA-256 al conținutului unui fișier, citit în blocuri.
+
+	Parametri:
+	----------
+	fisier : file-like
+		Fișierul încărcat (ex. obiectul returnat de `st.file_uploader`).
+
+	Returnează:
+	-----------
+	str
+		Hash-ul hexazecimal al conținutului. Poziția fișierului este readusă la început.
+	"""
+	h = hashlib.sha256()
+	fisier.seek(0)
+	while bloc := fisier.read(DIMENSIUNE_BLOC):
+		h.update(bloc)
+	fisier.seek(0)
+	return h.hexdigest()
+
+
+def get_hash_continut(fisier) -> str:
+	"""
+	Returnează hash-ul conținutului unui fișier încărcat, calculat o singură dată per fișier.
+
+	Hash-ul ultimului fișier este păstrat în `st.session_state.hash_fisier`, indexat după `file_id`
+	(identificatorul atribuit de `st.file_uploader` fiecărei încărcări), astfel încât rerulările paginii
+	nu mai parcurg tot fișierul.
+	"""
+	id_fisier = getattr(fisier, "file_id", None)
+	if id_fisier is None:
+		return hash_continut(fisier)
+	memorat = st.session_state.get("hash_fisier")
+	if memorat is None or memorat[0] != id_fisier:
+		memorat = (id_fisier, hash_continut(fisier))
+		st.session_state.hash_fisier = memorat
+	return memorat[1]
+
+
+def cale_cache(cheie: str) -> Path:
+	"""
+	Returnează calea fișierului Arrow asociat unei chei de cache.
+	"""
+	return DIRECTOR_CACHE / f"{cheie}.arrow"
+
+
+def salvare_in_cache(df: pd.DataFrame, cheie: str) -> bool:
+	"""
+	Salvează un DataFrame în cache-ul de pe disc, în format Arrow IPC necomprimat.
+
+	Fișierul este scris mai întâi sub un nume temporar și apoi redenumit, astfel încât
+	o altă sesiune să nu poată citi un fișier scris parțial.
+
+	Parametri:
+	----------
+	df : pd.DataFrame
+		Setul de date parsat.
+	cheie : str
+		Cheia de cache (hash-ul conținutului și modul de citire).
+
+	Returnează:
+	-----------
+	bool
+		True dacă salvarea a reușit, False dacă datele nu pot fi convertite în Arrow
+		sau directorul de cache nu poate fi scris.
+	"""
+	cale = cale_cache(cheie)
+	cale_temporara = cale.with_suffix(f".{os.getpid()}.tmp")
+	try:
+		DIRECTOR_CACHE.mkdir(parents=True, exist_ok=True)
+		tabel = pa.Table.from_pandas(df, preserve_index=False)
+		with pa.OSFile(str(cale_temporara), "wb") as sink:
+			with pa.ipc.new_file(sink, tabel.schema) as writer:
+				writer.write_table(tabel)
+		os.replace(cale_temporara, cale)
+		limitare_cache(pastrate=(cheie,))
+		return True
+	except (OSError, pa.ArrowException):
+		cale_temporara.unlink(missing_ok=True)
+		return False
+
+
+def limitare_cache(limita: int = LIMITA_DIMENSIUNE_CACHE, pastrate: tuple = ()) -> int:
+	"""
+	Șterge fișierele din cache folosite cel mai demult până când dimensiunea totală nu mai depășește limita.
+
+	Parametri:
+	----------
+	limita : int
+		Dimensiunea maximă (în octeți) a fișierelor din cache.
+	pastrate : tuple of str
+		Cheile care nu sunt șterse (ex. intrarea tocmai salvată), chiar dacă depășesc singure limita.
+
+	Returnează:
+	-----------
+	int
+		Numărul de fișiere șterse. Fișierele care nu pot fi șterse (ex. deschise în altă parte) sunt ignorate.
+	"""
+	intrari = []
+	for cale in DIRECTOR_CACHE.glob("*.arrow"):
+		try:
+			stare = cale.stat()
+		except OSError:
+			continue
+		intrari.append((stare.st_mtime, stare.st_size, cale))
+	total = sum(dimensiune for _, dimensiune, _ in intrari)
+	pastrate = {cale_cache(cheie) for cheie in pastrate}
+	sterse = 0
+	for _, dimensiune, cale in sorted(intrari, key=lambda intrare: intrare[0]):
+		if total <= limita:
+			break
+		if cale in pastrate:
+			continue
+		try:
+			cale.unlink()
+		except OSError:
+			continue
+		incarcare_arrow.clear(cale.stem)
+		total -= dimensiune
+		sterse += 1
+	return sterse
+
+
+@st.cache_resource(show_spinner=False, max_entries=MAX_SETURI_IN_MEMORIE)
+def incarcare_arrow(cheie: str) -> pd.DataFrame:
+	"""
+	Citește fișierul Arrow asociat unei chei prin memory-mapping și îl convertește în DataFrame.
+
+	Coloanele numerice fără valori lipsă sunt convertite în Pandas fără copiere (`split_blocks=True`),
+	iar coloanele dictionary din Arrow devin coloane `category`. Rezultatul este păstrat
+	o singură dată în proces și partajat între toate sesiunile aplicației.
+	"""
+	with pa.memory_map(str(cale_cache(cheie)), "r") as sursa:
+		tabel = pa.ipc.open_file(sursa).read_all()
+	return tabel.to_pandas(split_blocks=True)
+
+
+def citire_din_cache(cheie: str):
+	"""
+	Citește un set de date din cache-ul de pe disc, dacă există.
+
+	Parametri:
+	----------
+	cheie : str
+		Cheia de cache.
+
+	Returnează:
+	-----------
+	pd.DataFrame or None
+		DataFrame-ul din cache sau None dacă nu există o intrare validă pentru cheia dată.
+	"""
+	cale = cale_cache(cheie)
+	if not cale.exists():
+		return None
+	try:
+		# Data modificării marchează ultima folosire, pentru ordinea LRU din `limitare_cache`
+		os.utime(cale)
+		return incarcare_arrow(cheie)
+	except (OSError, pa.ArrowException):
+		return None
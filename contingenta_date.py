@@ -0,0 +1,125 @@
+"""
+Cubul de contingență categorie × `Target`, calculat o singură dată per versiune a datelor.
+
+- Pentru fiecare coloană categorială se numără aparițiile fiecărei perechi (valoare, clasă `Target`).
+- Numărarea folosește codurile întregi ale valorilor și un singur `np.bincount` pe codul combinat
+  `cod_valoare * (numar_clase + 1) + cod_clasa`, fără `groupby`.
+- Rândurile cu `Target` lipsă sunt numărate într-o coloană separată, astfel încât suma pe rând
+  să fie numărul total de apariții al valorii.
+- Paginile de pie charts, bar charts și descriere citesc felii din cub (`get_cub`, `frecvente_din_cub`).
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from schema_date import coloane_de_tip, get_schema, get_versiune
+
+
+COLOANA_TINTA = "Target"
+ETICHETA_TINTA_LIPSA = "(lipsă)"
+
+
+def coduri_coloana(serie: pd.Series):
+	"""
+	Returnează codurile întregi ale unei coloane (-1 pentru valori lipsă) și valorile corespunzătoare codurilor.
+	"""
+	if isinstance(serie.dtype, pd.CategoricalDtype):
+		return serie.cat.codes.to_numpy().astype(np.int64), serie.cat.categories
+	coduri, valori = pd.factorize(serie, sort=True)
+	return coduri.astype(np.int64), valori
+
+
+def tabel_contingenta(coduri: np.ndarray, numar_valori: int, coduri_tinta: np.ndarray, numar_clase: int) -> np.ndarray:
+	"""
+	Numără aparițiile perechilor (valoare, clasă) dintr-un singur `np.bincount`.
+
+	Parametri:
+	----------
+	coduri : np.ndarray
+		Codurile valorilor coloanei (-1 pentru valori lipsă, care sunt ignorate).
+	numar_valori : int
+		Numărul de valori distincte posibile ale coloanei.
+	coduri_tinta : np.ndarray
+		Codurile claselor țintă, unde `numar_clase` marchează o țintă lipsă.
+	numar_clase : int
+		Numărul de clase țintă.
+
+	Returnează:
+	-----------
+	np.ndarray
+		Matrice (numar_valori × numar_clase + 1) cu numărul de apariții; ultima coloană numără ținta lipsă.
+	"""
+	prezente = coduri >= 0
+	combinate = coduri[prezente] * (numar_clase + 1) + coduri_tinta[prezente]
+	numarari = np.bincount(combinate, minlength=numar_valori * (numar_clase + 1))
+	return numarari.reshape(numar_valori, numar_clase + 1)
+
+
+def calcul_cub(df: pd.DataFrame, coloane: list, tinta: str = COLOANA_TINTA) -> dict:
+	"""
+	Calculează tabelele de contingență ale coloanelor date față de variabila țintă.
+
+	Parametri:
+	----------
+	df : pd.DataFrame
+		Setul de date.
+	coloane : list of str
+		Coloanele categoriale incluse în cub.
+	tinta : str, implicit "Target"
+		Variabila țintă.
+
+	Returnează:
+	-----------
+	dict
+		{coloană: pd.DataFrame} — tabel indexat după valorile coloanei, cu câte o coloană per clasă țintă
+		(plus coloana "(lipsă)" dacă ținta are valori lipsă sau nu există în setul de date).
+	"""
+	if tinta in df.columns:
+		coduri_tinta, clase = coduri_coloana(df[tinta])
+	else:
+		coduri_tinta, clase = np.full(len(df), -1, dtype=np.int64), []
+	numar_clase = len(clase)
+	coduri_tinta = np.where(coduri_tinta < 0, numar_clase, coduri_tinta)
+	etichete_clase = list(clase) + [ETICHETA_TINTA_LIPSA]
+	tinta_lipsa = (coduri_tinta == numar_clase).any()
+
+	cub = {}
+	for coloana in coloane:
+		coduri, valori = coduri_coloana(df[coloana])
+		numarari = tabel_contingenta(coduri, len(valori), coduri_tinta, numar_clase)
+		tabel = pd.DataFrame(
+			numarari,
+			index=pd.Index(valori, name=coloana),
+			columns=pd.Index(etichete_clase, name=tinta),
+		)
+		if not tinta_lipsa:
+			tabel = tabel.drop(columns=ETICHETA_TINTA_LIPSA)
+		cub[coloana] = tabel
+	return cub
+
+
+def frecvente_din_cub(tabel: pd.DataFrame) -> pd.Series:
+	"""
+	Returnează numărul total de apariții per valoare (suma pe rând), sortat descrescător, fără valorile absente.
+	"""
+	frecvente = tabel.sum(axis=1).rename("count")
+	return frecvente[frecvente > 0].sort_values(ascending=False, kind="stable")
+
+
+@st.cache_data(show_spinner="Calcul tabele de contingență...", max_entries=8)
+def cub_versiune(versiune: str, _df: pd.DataFrame, _schema: pd.DataFrame) -> dict:
+	"""
+	Returnează cubul de contingență pentru o versiune a datelor, calculat o singură dată și partajat între sesiuni.
+	"""
+	return calcul_cub(_df, coloane_de_tip(_schema, "categorială"))
+
+
+def get_cub():
+	"""
+	Returnează cubul de contingență al datelor din session_state sau None dacă nu există date încărcate.
+	"""
+	df = st.session_state.get("df")
+	if df is None:
+		return None
+	return cub_versiune(get_versiune(), df, get_schema())
@@ -0,0 +1,201 @@
+"""
+Matricea codificată numeric a setului de date și matricele de corelație, calculate o singură dată per versiune.
+
+- Coloanele categoriale sunt codificate ca în `LabelEncoder` (codurile valorilor sortate), iar cele
+  booleene ca 0/1; valorile lipsă rămân NaN.
+- Corelațiile Pearson pentru toate perechile de coloane sunt calculate din câteva produse matriceale,
+  folosind pentru fiecare pereche doar rândurile în care ambele valori sunt prezente (ca `DataFrame.corr`).
+- Corelațiile Spearman sunt corelațiile Pearson ale rangurilor (medii) fiecărei coloane.
+- Orice selecție de coloane din pagina de corelații este o simplă extragere a unei submatrice.
+- Aceleași matrice pot fi calculate și pentru setul de antrenare procesat (pagina de procesare),
+  identificat prin `st.session_state.seturi_date["versiune"]`.
+"""
+
+import uuid
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from schema_date import calcul_schema, coloane_de_tip, get_schema, get_versiune
+
+
+def codificare_df(df: pd.DataFrame, schema: pd.DataFrame) -> pd.DataFrame:
+	"""
+	Codifică numeric toate coloanele utilizabile ale unui DataFrame.
+
+	Parametri:
+	----------
+	df : pd.DataFrame
+		Setul de date original.
+	schema : pd.DataFrame
+		Schema setului de date, folosită pentru a identifica tipul coloanelor.
+
+	Returnează:
+	-----------
+	pd.DataFrame
+		DataFrame `float64` cu coloanele numerice, booleene (0/1) și categoriale (codurile valorilor
+		sortate, ca `LabelEncoder`). Valorile lipsă rămân NaN.
+	"""
+	coloane = coloane_de_tip(schema, "numerică", "booleană", "categorială")
+	codificat = {}
+	for col in coloane:
+		if schema.at[col, "tip"] == "categorială":
+			coduri, _ = pd.factorize(df[col].astype(object), sort=True)
+			codificat[col] = np.where(coduri >= 0, coduri, np.nan)
+		else:
+			codificat[col] = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+	return pd.DataFrame(codificat, index=df.index, columns=coloane)
+
+
+def corelatie_pearson(X: np.ndarray) -> np.ndarray:
+	"""
+	Calculează matricea de corelație Pearson a coloanelor unei matrice, cu valori lipsă tratate pe perechi.
+
+	Pentru fiecare pereche (i, j) sunt folosite doar rândurile în care ambele coloane au valori,
+	iar sumele necesare sunt obținute din produse matriceale între valori și masca valorilor prezente.
+
+	Parametri:
+	----------
+	X : np.ndarray
+		Matrice (rânduri × coloane) de tip `float64`, cu NaN pentru valorile lipsă.
+
+	Returnează:
+	-----------
+	np.ndarray
+		Matricea de corelație (coloane × coloane); NaN pentru perechile cu mai puțin de două rânduri
+		comune sau cu o coloană constantă pe rândurile comune.
+	"""
+	prezent = ~np.isnan(X)
+	M = prezent.astype(np.float64)
+	# Centrarea față de media fiecărei coloane reduce erorile de rotunjire din diferențele de sume
+	with np.errstate(invalid="ignore", divide="ignore"):
+		centrare = np.nansum(X, axis=0) / prezent.sum(axis=0)
+	X0 = np.where(prezent, X - np.nan_to_num(centrare), 0.0)
+
+	n = M.T @ M
+	suma = X0.T @ M
+	suma_patrate = (X0 ** 2).T @ M
+	produse = X0.T @ X0
+
+	with np.errstate(invalid="ignore", divide="ignore"):
+		covarianta = produse - suma * suma.T / n
+		varianta = suma_patrate - suma ** 2 / n
+		corelatie = covarianta / np.sqrt(varianta * varianta.T)
+	corelatie[(n < 2) | (varianta <= 0) | (varianta.T <= 0)] = np.nan
+	np.fill_diagonal(corelatie, np.where((np.diag(n) >= 2) & (np.diag(varianta) > 0), 1.0, np.nan))
+	return np.clip(corelatie, -1.0, 1.0)
+
+
+def calcul_corelatii(df_codificat: pd.DataFrame) -> dict:
+	"""
+	Calculează matricele de corelație Pearson și Spearman pentru toate coloanele codificate.
+
+	Parametri:
+	----------
+	df_codificat : pd.DataFrame
+		Matricea codificată numeric (vezi `codificare_df`).
+
+	Returnează:
+	-----------
+	dict
+		- "pearson": pd.DataFrame — corelațiile Pearson
+		- "spearman": pd.DataFrame — corelațiile Spearman (rangurile sunt calculate pe toate valorile
+		  prezente ale fiecărei coloane; fără valori lipsă, rezultatul este identic cu `corr(method="spearman")`)
+	"""
+	coloane = df_codificat.columns
+	pearson = corelatie_pearson(df_codificat.to_numpy(dtype=np.float64))
+	spearman = corelatie_pearson(df_codificat.rank().to_numpy(dtype=np.float64))
+	return {
+		"pearson": pd.DataFrame(pearson, index=coloane, columns=coloane),
+		"spearman": pd.DataFrame(spearman, index=coloane, columns=coloane),
+	}
+
+
+def filtrare_matrice(matrice: pd.DataFrame, prag: float = None, top_k: int = None) -> pd.DataFrame:
+	"""
+	Păstrează doar corelațiile puternice dintr-o matrice simetrică, pentru afișarea matricelor late.
+
+	Parametri:
+	----------
+	matrice : pd.DataFrame
+		Matricea de corelație sau de asociere (simetrică).
+	prag : float, optional
+		Sunt păstrate doar valorile cu |valoare| >= prag.
+	top_k : int, optional
+		Sunt păstrate doar cele mai puternice `top_k` perechi de coloane distincte (după |valoare|).
+
+	Returnează:
+	-----------
+	pd.DataFrame
+		Matricea cu valorile eliminate înlocuite cu NaN, restrânsă la coloanele care mai au cel puțin
+		o valoare păstrată în afara diagonalei. Fără filtre, matricea este returnată neschimbată.
+	"""
+	if prag is None and top_k is None:
+		return matrice
+	valori = matrice.to_numpy(dtype=np.float64)
+	# Perechile fără valoare (NaN) primesc -1, astfel încât să fie ordonate după toate perechile reale
+	absolute = np.where(np.isnan(valori), -1.0, np.abs(valori))
+	pastrate = np.ones(valori.shape, dtype=bool)
+	if prag is not None:
+		pastrate &= absolute >= prag
+	if top_k is not None:
+		sus = np.triu_indices(len(valori), k=1)
+		ordine = np.argsort(-absolute[sus], kind="stable")[:top_k]
+		selectate = np.zeros(valori.shape, dtype=bool)
+		selectate[sus[0][ordine], sus[1][ordine]] = True
+		pastrate &= selectate | selectate.T
+	np.fill_diagonal(pastrate, False)
+	pastrate &= ~np.isnan(valori)
+
+	coloane = pastrate.any(axis=0)
+	filtrate = np.where(pastrate, valori, np.nan)
+	np.fill_diagonal(filtrate, np.diag(valori))
+	return pd.DataFrame(filtrate, index=matrice.index, columns=matrice.columns).loc[coloane, coloane]
+
+
+@st.cache_data(show_spinner="Codificare date...", max_entries=4)
+def codificare_versiune(versiune: str, _df: pd.DataFrame, _schema: pd.DataFrame) -> pd.DataFrame:
+	"""
+	Returnează matricea codificată numeric pentru o versiune a datelor, calculată o singură dată.
+	"""
+	return codificare_df(_df, _schema)
+
+
+@st.cache_data(show_spinner="Calcul matrice de corelație...", max_entries=8)
+def corelatii_versiune(versiune: str, _df: pd.DataFrame, _schema: pd.DataFrame) -> dict:
+	"""
+	Returnează matricele de corelație pentru o versiune a datelor, calculate o singură dată și partajate între sesiuni.
+	"""
+	return calcul_corelatii(codificare_versiune(versiune, _df, _schema))
+
+
+def get_corelatii():
+	"""
+	Returnează matricele de corelație ale datelor din session_state sau None dacă nu există date încărcate.
+	"""
+	df = st.session_state.get("df")
+	if df is None:
+		return None
+	return corelatii_versiune(get_versiune(), df, get_schema())
+
+
+@st.cache_data(show_spinner="Calcul matrice de corelație...", max_entries=4)
+def corelatii_seturi_versiune(versiune: str, _X: pd.DataFrame) -> dict:
+	"""
+	Returnează matricele de corelație ale unui set de antrenare procesat, calculate o singură dată per versiune.
+	"""
+	return calcul_corelatii(codificare_df(_X, calcul_schema(_X)))
+
+
+def get_corelatii_seturi():
+	"""
+	Returnează matricele de corelație ale setului de antrenare procesat (pagina de procesare)
+	sau None dacă datele nu au fost încă procesate.
+	"""
+	seturi_date = st.session_state.get("seturi_date")
+	if seturi_date is None:
+		return None
+	if "versiune" not in seturi_date:
+		seturi_date["versiune"] = uuid.uuid4().hex
+	return corelatii_seturi_versiune(seturi_date["versiune"], seturi_date["X_train"])
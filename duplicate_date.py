@@ -0,0 +1,125 @@
+"""
+Detectarea rândurilor duplicate din amprente de 64 de biți, calculate o singură dată per versiune a datelor.
+
+- Fiecare coloană este transformată o singură dată într-un vector de amprente `uint64` (`pd.util.hash_pandas_object`).
+- Amprenta unui rând, pentru orice submulțime de coloane cheie, este o combinare a amprentelor coloanelor,
+  fără a mai citi valorile din DataFrame.
+- Grupurile de duplicate sunt obținute dintr-un singur `pd.factorize` pe amprentele rândurilor;
+  numărul de duplicate, grupurile afișate și eliminarea duplicatelor folosesc același index.
+- Două rânduri diferite pot avea aceeași amprentă doar cu o probabilitate neglijabilă (~n² / 2⁶⁵).
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from schema_date import get_versiune
+
+
+MULTIPLICATOR_AMPRENTA = np.uint64(0x100000001B3)
+AMPRENTA_INITIALA = np.uint64(0xCBF29CE484222325)
+
+
+def amprente_coloane(df: pd.DataFrame) -> np.ndarray:
+	"""
+	Returnează amprentele tuturor valorilor, câte un rând contiguu per coloană (coloane × rânduri, `uint64`).
+	Valorile egale (inclusiv valorile lipsă) au aceeași amprentă.
+	"""
+	amprente = np.empty((df.shape[1], len(df)), dtype=np.uint64)
+	for j, col in enumerate(df.columns):
+		amprente[j] = pd.util.hash_pandas_object(df[col], index=False).to_numpy()
+	return amprente
+
+
+def combinare_amprente(amprente: np.ndarray) -> np.ndarray:
+	"""
+	Combină amprentele coloanelor (coloane × rânduri) într-o singură amprentă de 64 de biți per rând.
+	Ordinea coloanelor contează, astfel încât valori egale în coloane diferite nu se anulează.
+	"""
+	rezultat = np.full(amprente.shape[1], AMPRENTA_INITIALA, dtype=np.uint64)
+	for amprenta_coloana in amprente:
+		rezultat ^= amprenta_coloana
+		rezultat *= MULTIPLICATOR_AMPRENTA
+	return rezultat
+
+
+def calcul_duplicate(amprente_randuri: np.ndarray) -> dict:
+	"""
+	Identifică rândurile duplicate din amprentele rândurilor.
+
+	Parametri:
+	----------
+	amprente_randuri : np.ndarray
+		Amprenta fiecărui rând (vezi `combinare_amprente`).
+
+	Returnează:
+	-----------
+	dict
+		- "grup": np.ndarray — identificatorul grupului fiecărui rând, în ordinea primei apariții
+		- "duplicat": np.ndarray — True pentru rândurile care repetă un rând anterior (ca `df.duplicated()`)
+		- "in_grup_duplicat": np.ndarray — True pentru toate rândurile care au cel puțin un duplicat (ca `duplicated(keep=False)`)
+		- "numar_duplicate": int — numărul de rânduri duplicate
+		- "numar_grupuri": int — numărul de grupuri cu cel puțin două rânduri
+	"""
+	grup, _ = pd.factorize(amprente_randuri)
+	if len(grup) == 0:
+		gol = np.zeros(0, dtype=bool)
+		return {"grup": grup, "duplicat": gol, "in_grup_duplicat": gol, "numar_duplicate": 0, "numar_grupuri": 0}
+	# Codurile grupurilor apar crescător: un rând este primul din grupul său dacă îi depășește pe toți cei anteriori
+	primul = np.empty(len(grup), dtype=bool)
+	primul[0] = True
+	primul[1:] = grup[1:] > np.maximum.accumulate(grup)[:-1]
+	marime = np.bincount(grup)
+	return {
+		"grup": grup,
+		"duplicat": ~primul,
+		"in_grup_duplicat": marime[grup] > 1,
+		"numar_duplicate": int((~primul).sum()),
+		"numar_grupuri": int((marime > 1).sum()),
+	}
+
+
+def grupuri_duplicate(df: pd.DataFrame, duplicate: dict) -> pd.DataFrame:
+	"""
+	Returnează rândurile care fac parte dintr-un grup de duplicate, ordonate după grup,
+	cu o coloană "Grup" numerotată de la 1 în ordinea primei apariții.
+	"""
+	pozitii = np.flatnonzero(duplicate["in_grup_duplicat"])
+	grup = duplicate["grup"][pozitii]
+	_, grup = np.unique(grup, return_inverse=True)
+	ordine = np.argsort(grup, kind="stable")
+	rezultat = df.iloc[pozitii[ordine]].copy()
+	rezultat.insert(0, "Grup", grup[ordine] + 1)
+	return rezultat
+
+
+@st.cache_resource(show_spinner="Calcul amprente rânduri...", max_entries=4)
+def amprente_versiune(versiune: str, _df: pd.DataFrame) -> np.ndarray:
+	"""
+	Returnează amprentele coloanelor pentru o versiune a datelor, calculate o singură dată și partajate
+	între sesiuni (fără copiere, deoarece sunt doar citite).
+	"""
+	return amprente_coloane(_df)
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def duplicate_versiune(versiune: str, coloane: tuple, _df: pd.DataFrame) -> dict:
+	"""
+	Returnează indexul duplicatelor pentru o versiune a datelor și o submulțime de coloane cheie
+	(toate coloanele dacă `coloane` este gol), din amprentele coloanelor deja calculate.
+	"""
+	amprente = amprente_versiune(versiune, _df)
+	if coloane:
+		amprente = amprente[_df.columns.get_indexer(list(coloane))]
+	return calcul_duplicate(combinare_amprente(amprente))
+
+
+def get_duplicate(coloane: list = None):
+	"""
+	Returnează indexul duplicatelor datelor din session_state (după coloanele cheie date, implicit toate)
+	sau None dacă nu există date încărcate.
+	"""
+	df = st.session_state.get("df")
+	if df is None:
+		return None
+	return duplicate_versiune(get_versiune(), tuple(coloane or ()), df)
@@ -0,0 +1,117 @@
+"""
+Memorarea rezultatelor etapelor de preprocesare (pagina de procesare a datelor).
+
+- Rezultatul fiecărei etape (outlieri, valori lipsă, codificare, scalare, împărțire) este păstrat sub o cheie
+  derivată din versiunea datelor și din configurația etapei curente și a tuturor etapelor anterioare.
+- Schimbarea unei opțiuni dintr-o etapă târzie refolosește rezultatele etapelor anterioare și recalculează
+  doar de la etapa modificată încolo.
+- Etapele antrenate pe o submulțime de rânduri (setul de antrenare) sunt indexate după amprenta pozițiilor
+  rândurilor (`amprenta_randuri`), nu după opțiunile care au produs submulțimea.
+- Rezultatele sunt păstrate o singură dată în proces (`st.cache_resource`), într-un cache LRU limitat
+  după memoria ocupată (`LIMITA_MEMORIE_ETAPE`), nu după numărul de intrări.
+"""
+
+from collections import OrderedDict
+import hashlib
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+LIMITA_MEMORIE_ETAPE = 1024 ** 3
+
+
+def dimensiune_rezultat(rezultat) -> int:
+	"""
+	Estimează memoria ocupată de rezultatul unei etape (DataFrame, Series sau colecții ale acestora), în octeți.
+	"""
+	if isinstance(rezultat, pd.DataFrame):
+		return int(rezultat.memory_usage(deep=True, index=True).sum())
+	if isinstance(rezultat, pd.Series):
+		return int(rezultat.memory_usage(deep=True, index=True))
+	if isinstance(rezultat, (tuple, list)):
+		return sum(dimensiune_rezultat(element) for element in rezultat)
+	if isinstance(rezultat, dict):
+		return sum(dimensiune_rezultat(element) for element in rezultat.values())
+	return 0
+
+
+def cheie_etapa(cheie_anterioara: str, etapa: str, configuratie) -> str:
+	"""
+	Returnează cheia rezultatului unei etape: hash-ul cheii etapei anterioare (sau al versiunii datelor),
+	al numelui etapei și al configurației acesteia.
+	"""
+	continut = json.dumps([cheie_anterioara, etapa, configuratie], sort_keys=True, default=str)
+	return hashlib.sha256(continut.encode("utf-8")).hexdigest()
+
+
+def amprenta_randuri(pozitii: np.ndarray) -> str:
+	"""
+	Returnează amprenta (SHA-256) unei submulțimi de rânduri, dată prin pozițiile lor, în ordine.
+	"""
+	return hashlib.sha256(np.ascontiguousarray(pozitii, dtype=np.int64).tobytes()).hexdigest()
+
+
+class CacheEtape:
+	"""
+	Cache LRU pentru rezultatele etapelor de preprocesare, limitat după memoria ocupată.
+
+	Parametri:
+	----------
+	limita_memorie : int
+		Memoria maximă (în octeți) ocupată de rezultatele păstrate. Când este depășită, sunt eliminate
+		rezultatele folosite cel mai demult; un rezultat mai mare decât limita nu este păstrat.
+	"""
+
+	def __init__(self, limita_memorie: int = LIMITA_MEMORIE_ETAPE):
+		self.limita_memorie = limita_memorie
+		self.memorie = 0
+		self.intrari = OrderedDict()
+		self.blocare = threading.Lock()
+
+	def __len__(self):
+		return len(self.intrari)
+
+	def obtinere(self, cheie: str, calcul):
+		"""
+		Returnează rezultatul păstrat sub `cheie` sau îl calculează cu `calcul()` și îl păstrează.
+
+		Returnează:
+		-----------
+		tuple (rezultat, bool)
+			Rezultatul etapei și True dacă a fost citit din cache.
+		"""
+		with self.blocare:
+			if cheie in self.intrari:
+				self.intrari.move_to_end(cheie)
+				return self.intrari[cheie][0], True
+
+		rezultat = calcul()
+		dimensiune = dimensiune_rezultat(rezultat)
+		with self.blocare:
+			if cheie not in self.intrari and dimensiune <= self.limita_memorie:
+				self.intrari[cheie] = (rezultat, dimensiune)
+				self.memorie += dimensiune
+				while self.memorie > self.limita_memorie:
+					_, (_, dimensiune_eliminata) = self.intrari.popitem(last=False)
+					self.memorie -= dimensiune_eliminata
+		return rezultat, False
+
+	def golire(self):
+		"""
+		Elimină toate rezultatele păstrate.
+		"""
+		with self.blocare:
+			self.intrari.clear()
+			self.memorie = 0
+
+
+@st.cache_resource(show_spinner=False)
+def get_cache_etape() -> CacheEtape:
+	"""
+	Returnează cache-ul etapelor de preprocesare, unic în proces și partajat între sesiuni.
+	"""
+	return CacheEtape()
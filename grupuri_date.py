@@ -0,0 +1,168 @@
+"""
+Distribuțiile coloanelor numerice pe clasele unei variabile categoriale (implicit `Target`).
+
+- Pentru fiecare clasă și fiecare coloană numerică: număr de valori, medie, deviație standard, skewness,
+  minim, maxim, quantile, mustățile boxplot-ului, numărul de outlieri și histograma de bază.
+- Rândurile sunt sortate o singură dată după clasă; momentele sunt calculate pe segmentele claselor
+  cu `np.add.reduceat`, iar quantilele din valorile sortate în interiorul fiecărei clase.
+- Histogramele folosesc aceleași margini ca histograma de bază a întregii coloane
+  (vezi `profil_date.histograma_versiune`), deci pot fi regrupate și suprapuse direct.
+- Coloanele și marginile sunt citite din profilul activ (vezi `profil_date.get_profil`): în modul aproximativ,
+  din profilul construit din schițe, fără o trecere suplimentară pentru profilul exact.
+- Rezultatul este calculat o singură dată per versiune a datelor, variabilă de grupare și mod de calcul
+  și citit de paginile de histograme și box plots.
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from contingenta_date import COLOANA_TINTA, coduri_coloana
+from profil_date import NUME_QUANTILE, QUANTILE, get_profil, margini_histograma, std_skew
+from schema_date import get_versiune
+
+
+def coduri_grupuri(serie: pd.Series):
+	"""
+	Returnează codurile claselor prezente (0..G-1, -1 pentru valori lipsă) și etichetele lor.
+	Clasele fără nicio apariție (ex. categorii nefolosite) sunt eliminate.
+	"""
+	coduri, etichete = coduri_coloana(serie)
+	numarari = np.bincount(coduri[coduri >= 0], minlength=len(etichete))
+	prezente = np.flatnonzero(numarari)
+	recodare = np.full(len(etichete), -1, dtype=np.int64)
+	recodare[prezente] = np.arange(len(prezente))
+	coduri = np.where(coduri >= 0, recodare[np.maximum(coduri, 0)], -1)
+	return coduri, list(etichete[prezente])
+
+
+def calcul_distributii(df: pd.DataFrame, coloana_grupare: str, coloane: list, margini: dict) -> dict:
+	"""
+	Calculează distribuțiile coloanelor numerice pe clasele unei variabile, într-o singură trecere grupată.
+
+	Parametri:
+	----------
+	df : pd.DataFrame
+		Setul de date.
+	coloana_grupare : str
+		Variabila categorială după care se grupează (ex. "Target", "Course").
+	coloane : list of str
+		Coloanele numerice analizate.
+	margini : dict
+		{coloană: np.ndarray} — marginile binurilor histogramei de bază ale fiecărei coloane.
+
+	Returnează:
+	-----------
+	dict
+		- "grupuri": list — etichetele claselor, în ordinea rândurilor din tabele
+		- "statistici": dict {coloană: pd.DataFrame} — indexat după clase, cu "numar", "media", "std", "skew",
+		  "min", "max", quantilele ("q01", "q25", "mediana", "q75", "q99"), "mustata_jos", "mustata_sus"
+		  și "numar_outlieri"
+		- "histograme": dict {coloană: np.ndarray} — matrice (clase × binuri de bază) cu numărul de observații
+		- "margini": dict {coloană: np.ndarray} — marginile binurilor de bază
+	"""
+	coduri, grupuri = coduri_grupuri(df[coloana_grupare])
+	numar_grupuri = len(grupuri)
+	valide = coduri >= 0
+	if numar_grupuri == 0:
+		return {"grupuri": grupuri, "statistici": {}, "histograme": {}, "margini": margini}
+
+	# Sortare stabilă după clasă: fiecare clasă devine un segment contiguu
+	ordine = np.argsort(coduri[valide], kind="stable")
+	g = coduri[valide][ordine]
+	X = df[coloane].to_numpy(dtype=np.float64, na_value=np.nan)[valide][ordine]
+	inceputuri = np.searchsorted(g, np.arange(numar_grupuri))
+
+	# Momente pe segmente
+	prezent = ~np.isnan(X)
+	n = np.add.reduceat(prezent, inceputuri, axis=0)
+	with np.errstate(invalid="ignore", divide="ignore"):
+		media = np.add.reduceat(np.where(prezent, X, 0.0), inceputuri, axis=0) / n
+	abateri = np.where(prezent, X - media[g], 0.0)
+	m2 = np.add.reduceat(abateri ** 2, inceputuri, axis=0)
+	m3 = np.add.reduceat(abateri ** 3, inceputuri, axis=0)
+	std, skew = std_skew(n, m2, m3)
+
+	statistici = {}
+	histograme = {}
+	q = np.asarray(QUANTILE)
+	for j, coloana in enumerate(coloane):
+		# În interiorul fiecărei clase, valorile sortate crescător, cu valorile lipsă la final
+		valori = X[np.lexsort((X[:, j], g)), j]
+		nj = n[:, j]
+		ultim = inceputuri + np.maximum(nj - 1, 0)
+
+		pozitii = inceputuri[:, None] + q[None, :] * np.maximum(nj - 1, 0)[:, None]
+		jos = np.floor(pozitii).astype(np.int64)
+		sus = np.minimum(jos + 1, ultim[:, None])
+		fractiune = pozitii - jos
+		quantile = np.where(nj[:, None] > 0, valori[jos] + fractiune * (valori[sus] - valori[jos]), np.nan)
+
+		# Mustăți și outlieri: valorile din interiorul limitelor IQR, numărate pe segmente
+		q1, q3 = quantile[:, 1], quantile[:, 3]
+		limita_jos = (q1 - 1.5 * (q3 - q1))[g]
+		limita_sus = (q3 + 1.5 * (q3 - q1))[g]
+		sub = np.add.reduceat(valori < limita_jos, inceputuri)
+		pana_la_sus = np.add.reduceat(valori <= limita_sus, inceputuri)
+		mustata_jos = np.where(nj > 0, valori[np.minimum(inceputuri + sub, ultim)], np.nan)
+		mustata_sus = np.where(nj > 0, valori[np.maximum(inceputuri + pana_la_sus - 1, inceputuri)], np.nan)
+
+		tabel = pd.DataFrame({
+			"numar": nj,
+			"media": media[:, j],
+			"std": std[:, j],
+			"skew": skew[:, j],
+			"min": np.where(nj > 0, valori[inceputuri], np.nan),
+			"max": np.where(nj > 0, valori[ultim], np.nan),
+		}, index=pd.Index(grupuri, name=coloana_grupare))
+		for nume, valori_quantila in zip(NUME_QUANTILE, quantile.T):
+			tabel[nume] = valori_quantila
+		tabel["mustata_jos"] = mustata_jos
+		tabel["mustata_sus"] = mustata_sus
+		tabel["numar_outlieri"] = sub + nj - pana_la_sus
+		statistici[coloana] = tabel
+
+		# Histograme pe clase: bin-ul fiecărei valori și un singur bincount pe (clasă, bin)
+		margini_coloana = margini[coloana]
+		numar_binuri = len(margini_coloana) - 1
+		prezente = prezent[:, j]
+		binuri = np.clip(np.searchsorted(margini_coloana, X[prezente, j], side="right") - 1, 0, numar_binuri - 1)
+		histograme[coloana] = np.bincount(
+			g[prezente] * numar_binuri + binuri, minlength=numar_grupuri * numar_binuri
+		).reshape(numar_grupuri, numar_binuri)
+
+	return {"grupuri": grupuri, "statistici": statistici, "histograme": histograme, "margini": margini}
+
+
+@st.cache_data(show_spinner="Calcul distribuții pe clase...", max_entries=16)
+def distributii_versiune(
+	versiune: str, coloana_grupare: str, aproximativ: bool, _df: pd.DataFrame, _statistici: pd.DataFrame
+) -> dict:
+	"""
+	Returnează distribuțiile pe clase pentru o versiune a datelor și o variabilă de grupare,
+	calculate o singură dată și partajate între sesiuni.
+
+	Parametrii `_df` și `_statistici` (statisticile numerice ale profilului activ) nu fac parte din cheia de cache;
+	`aproximativ` indică dacă marginile histogramelor provin din profilul aproximativ.
+	"""
+	margini = {col: margini_histograma(_statistici.at[col, "min"], _statistici.at[col, "max"]) for col in _statistici.index}
+	return calcul_distributii(_df, coloana_grupare, _statistici.index.tolist(), margini)
+
+
+def coloane_grupare(schema: pd.DataFrame) -> list:
+	"""
+	Returnează variabilele după care se pot compara distribuțiile (cu 2-20 de clase), cu `Target` primul.
+	"""
+	coloane = schema.index[schema["tinta"]].tolist()
+	return sorted(coloane, key=lambda col: col != COLOANA_TINTA)
+
+
+def get_distributii(coloana_grupare: str = COLOANA_TINTA):
+	"""
+	Returnează distribuțiile pe clase ale datelor din session_state sau None dacă nu există date încărcate.
+	"""
+	profil = get_profil()
+	if profil is None:
+		return None
+	aproximativ = st.session_state.get("mod_aproximativ", False)
+	return distributii_versiune(get_versiune(), coloana_grupare, aproximativ, st.session_state.df, profil["numerice"])
@@ -0,0 +1,194 @@
+"""
+Datele hărții choropleth a țărilor de origine, calculate o singură dată per versiune a datelor.
+
+- Numele țărilor sunt rezolvate în coduri ISO 3166-1 alpha-3 din geometria inclusă (numele și codul fiecărei țări),
+  completată cu denumiri alternative (`COD_ISO_TARI`); tabelul este normalizat o singură dată la importul
+  modulului, iar harta folosește `locationmode="ISO-3"`.
+- Țările nerecunoscute și cele fără geometrie (ex. statele insulare mici, absente la scara 1:110m)
+  sunt raportate separat, pentru a nu dispărea fără explicație de pe hartă.
+- Geometria lumii (`world_110m.json`, în formatul topojson folosit de Plotly) este inclusă în proiect și servită
+  local de Streamlit din directorul `static/geo`, astfel încât browserul nu mai descarcă nimic de pe CDN-ul Plotly.
+  Adresa ține cont de `server.baseUrlPath`, pentru aplicațiile servite sub un prefix.
+- Figura conține doar câte un punct per țară (numărul de studenți agregat) și este memorizată per versiune.
+"""
+
+from pathlib import Path
+import json
+import unicodedata
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from contingenta_date import cub_versiune, frecvente_din_cub
+from schema_date import get_schema, get_versiune
+
+
+COLOANA_TARA = "Country of origin"
+DIRECTOR_GEO = Path(__file__).parent / "static" / "geo"
+FISIER_GEOMETRIE = "world_110m.json"
+
+# Denumiri alternative, pentru țări al căror nume din date diferă de cel din geometrie (sau care nu au geometrie)
+COD_ISO_TARI = {
+	"Bosnia and Herzegovina": "BIH",
+	"Cabo Verde": "CPV",
+	"Cape Verde": "CPV",
+	"Central African Republic": "CAF",
+	"Czech Republic": "CZE",
+	"Democratic Republic of the Congo": "COD",
+	"Dominican Republic": "DOM",
+	"East Timor": "TLS",
+	"England": "GBR",
+	"Equatorial Guinea": "GNQ",
+	"Eswatini": "SWZ",
+	"Falkland Islands": "FLK",
+	"Ivory Coast": "CIV",
+	"Kosovo": "XKX",
+	"Macedonia": "MKD",
+	"Northern Ireland": "GBR",
+	"Russian Federation": "RUS",
+	"São Tomé and Príncipe": "STP",
+	"Scotland": "GBR",
+	"Solomon Islands": "SLB",
+	"South Sudan": "SSD",
+	"Swaziland": "SWZ",
+	"Türkiye": "TUR",
+	"UK": "GBR",
+	"United States": "USA",
+	"USA": "USA",
+	"Wales": "GBR",
+	"Western Sahara": "ESH",
+}
+
+
+def normalizare_nume(nume: str) -> str:
+	"""
+	Returnează forma normalizată a numelui unei țări (fără diacritice, litere mici, fără spații și cratime).
+	"""
+	fara_diacritice = unicodedata.normalize("NFKD", str(nume)).encode("ascii", "ignore").decode("ascii")
+	return "".join(c for c in fara_diacritice.casefold() if c.isalnum())
+
+
+def tari_geometrie() -> dict:
+	"""
+	Returnează țările din geometria inclusă, ca dicționar {nume: cod ISO-3}, sau un dicționar gol dacă fișierul lipsește.
+	"""
+	cale = DIRECTOR_GEO / FISIER_GEOMETRIE
+	if not cale.is_file():
+		return {}
+	with open(cale, encoding="utf-8") as fisier:
+		geometrie = json.load(fisier)
+	return {
+		tara["properties"]["name"]: tara["id"]
+		for tara in geometrie["objects"]["countries"]["geometries"]
+		if "id" in tara
+	}
+
+
+_TARI_GEOMETRIE = tari_geometrie()
+_COD_ISO_NORMALIZAT = {
+	normalizare_nume(nume): cod for nume, cod in [*_TARI_GEOMETRIE.items(), *COD_ISO_TARI.items()]
+}
+_CODURI_GEOMETRIE = set(_TARI_GEOMETRIE.values())
+
+
+def cod_iso(nume: str):
+	"""
+	Returnează codul ISO 3166-1 alpha-3 al unei țări sau None dacă numele nu este cunoscut.
+	"""
+	return _COD_ISO_NORMALIZAT.get(normalizare_nume(nume))
+
+
+def geometrie_locala() -> bool:
+	"""
+	Verifică dacă fișierul cu geometria lumii există local, în directorul servit de Streamlit.
+	"""
+	return (DIRECTOR_GEO / FISIER_GEOMETRIE).is_file()
+
+
+def url_geometrie() -> str:
+	"""
+	Returnează adresa directorului cu geometria, servit de Streamlit sub `/app/static`,
+	precedată de prefixul aplicației (`server.baseUrlPath`), dacă există.
+	"""
+	prefix = st.get_option("server.baseUrlPath").strip("/")
+	return f"{'/' + prefix if prefix else ''}/app/static/{DIRECTOR_GEO.name}/"
+
+
+def config_harta() -> dict:
+	"""
+	Returnează configurația Plotly a hărții: geometria este citită de la serverul aplicației, dacă există local.
+	"""
+	return {"topojsonURL": url_geometrie()} if geometrie_locala() else {}
+
+
+def calcul_harta(frecvente: pd.Series) -> dict:
+	"""
+	Construiește harta choropleth din numărul de studenți per țară.
+
+	Parametri:
+	----------
+	frecvente : pd.Series
+		Numărul de studenți, indexat după numele țării.
+
+	Returnează:
+	-----------
+	dict
+		- "figura": go.Figure — harta, colorată după log(1 + număr de studenți)
+		- "tari": pd.DataFrame — țara, codul ISO și numărul de studenți
+		- "nerezolvate": list — țările al căror nume nu a putut fi rezolvat într-un cod ISO
+		- "fara_geometrie": list — țările rezolvate, dar fără contur în geometria inclusă
+	"""
+	tari = pd.DataFrame({
+		"Țară": frecvente.index.astype(str),
+		"Cod ISO": [cod_iso(nume) for nume in frecvente.index],
+		"Număr de studenți": frecvente.to_numpy(),
+	})
+	nerezolvate = tari.loc[tari["Cod ISO"].isna(), "Țară"].tolist()
+	rezolvate = tari.dropna(subset=["Cod ISO"])
+	# Fără geometrie locală, harta folosește CDN-ul Plotly, deci nu se poate verifica acoperirea
+	fara_geometrie = (
+		rezolvate.loc[~rezolvate["Cod ISO"].isin(_CODURI_GEOMETRIE), "Țară"].tolist() if _CODURI_GEOMETRIE else []
+	)
+	# Mai multe nume pot avea același cod (ex. "England" și "United Kingdom")
+	pe_cod = rezolvate.groupby("Cod ISO", sort=False).agg({"Țară": " / ".join, "Număr de studenți": "sum"}).reset_index()
+
+	fig = go.Figure(
+		go.Choropleth(
+			locations=pe_cod["Cod ISO"],
+			locationmode="ISO-3",
+			z=np.log1p(pe_cod["Număr de studenți"].to_numpy(dtype=np.float64)),
+			text=pe_cod["Țară"],
+			customdata=pe_cod["Număr de studenți"],
+			colorscale="magenta",
+			colorbar=dict(title="log(1 + număr)"),
+			hovertemplate="<b>%{text}</b><br>Număr de studenți: %{customdata}<extra></extra>",
+		)
+	)
+	fig.update_layout(title="Distribuția studenților pe țări", height=700)
+	return {"figura": fig, "tari": tari, "nerezolvate": nerezolvate, "fara_geometrie": fara_geometrie}
+
+
+@st.cache_data(show_spinner="Construire hartă...", max_entries=8)
+def harta_versiune(versiune: str, _df: pd.DataFrame, _schema: pd.DataFrame) -> dict:
+	"""
+	Returnează harta pentru o versiune a datelor, construită o singură dată și partajată între sesiuni.
+	Numărul de studenți per țară este citit din cubul de contingență, dacă țara este o coloană categorială.
+	"""
+	cub = cub_versiune(versiune, _df, _schema)
+	if COLOANA_TARA in cub:
+		frecvente = frecvente_din_cub(cub[COLOANA_TARA])
+	else:
+		frecvente = _df[COLOANA_TARA].value_counts()
+	return calcul_harta(frecvente)
+
+
+def get_harta():
+	"""
+	Returnează harta datelor din session_state sau None dacă nu există date încărcate sau coloana țării lipsește.
+	"""
+	df = st.session_state.get("df")
+	if df is None or COLOANA_TARA not in df.columns:
+		return None
+	return harta_versiune(get_versiune(), df, get_schema())
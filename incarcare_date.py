@@ -0,0 +1,423 @@
+"""
+Modul pentru citirea fișierelor de date (CSV, CSV comprimat, Parquet) pe bucăți (chunks), cu memorie limitată.
+
+- Acceptă fișiere `.csv`, `.csv.gz`, `.csv.zst`, `.zip` și `.parquet`; decomprimarea se face în flux.
+- Citește fișierul încărcat în bucăți de dimensiune fixă, fără a parsa tot textul deodată.
+- Convertește tipurile de date pe fiecare bucată (bool, întregi mici, category),
+  astfel încât DataFrame-ul final să fie construit direct în forma compactă.
+- Raportează progresul citirii și oprește citirea dacă se depășește limita de memorie configurată.
+- Oferă o reprezentare compactă pentru un DataFrame deja citit, împreună cu un raport de memorie.
+"""
+
+import gzip
+import zipfile
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+import pyarrow.parquet as pq
+
+from schite_date import construire_schite
+
+
+DIMENSIUNE_BUCATA = 100_000
+LIMITA_MEMORIE_MB = 1024
+PRAG_CATEGORIE = 0.5
+EXTENSII_ACCEPTATE = ["csv", "gz", "zst", "zip", "parquet"]
+EXTENSII_COMPRESIE = {".gz": "gzip", ".zst": "zstd", ".zip": "zip"}
+
+
+def stabilire_plan_tipuri(bucata: pd.DataFrame, prag_categorie: float = PRAG_CATEGORIE) -> dict:
+	"""
+	Stabilește, pe baza primei bucăți citite, tipul în care va fi convertită fiecare coloană.
+
+	Parametri:
+	----------
+	bucata : pd.DataFrame
+		Prima bucată citită din fișier.
+	prag_categorie : float, implicit 0.5
+		Raportul maxim dintre numărul de valori unice și numărul de rânduri pentru care
+		o coloană de tip obiect este convertită la `category`.
+
+	Returnează:
+	-----------
+	dict
+		Dicționar {coloană: tip}, unde tipul este unul dintre "bool", "integer", "float", "category" sau "object".
+		Planul este păstrat pentru toate bucățile, astfel încât tipurile să fie consistente;
+		o coloană este lărgită (vezi `tip_potrivit`) doar dacă o bucată ulterioară nu se încadrează în plan.
+	"""
+	plan = {}
+	for col in bucata.columns:
+		serie = bucata[col]
+		valori = serie.dropna()
+		if pd.api.types.is_bool_dtype(serie) or (
+			pd.api.types.is_object_dtype(serie) and len(valori) > 0 and valori.isin([True, False]).all()
+		):
+			plan[col] = "bool"
+		elif pd.api.types.is_integer_dtype(serie):
+			plan[col] = "integer"
+		elif pd.api.types.is_float_dtype(serie):
+			plan[col] = "float"
+		elif valori.nunique() <= max(1, prag_categorie * len(bucata)):
+			plan[col] = "category"
+		else:
+			plan[col] = "object"
+	return plan
+
+
+def tip_potrivit(serie: pd.Series, tip: str) -> str:
+	"""
+	Verifică dacă valorile unei coloane dintr-o bucată se încadrează în tipul planificat
+	și returnează tipul (eventual lărgit) care le poate păstra fără pierderi.
+
+	- "bool" rămâne doar dacă valorile prezente sunt True/False; altfel devine "object".
+	- "integer" devine "float" pentru valori reale sau lipsă și "object" pentru valori nenumerice.
+	- "float" devine "object" pentru valori nenumerice.
+	- "category" și "object" păstrează orice valoare.
+	"""
+	if tip == "bool":
+		if pd.api.types.is_bool_dtype(serie):
+			return tip
+		valori = serie.dropna()
+		if pd.api.types.is_object_dtype(serie) and valori.map(type).isin([bool, np.bool_]).all():
+			return tip
+		return "bool" if len(valori) == 0 else "object"
+	if tip == "integer" and not pd.api.types.is_integer_dtype(serie):
+		return "float" if pd.api.types.is_float_dtype(serie) else "object"
+	if tip == "float" and not (pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie)):
+		return "object"
+	return tip
+
+
+def conversie_bucata(bucata: pd.DataFrame, plan: dict) -> pd.DataFrame:
+	"""
+	Convertește coloanele unei bucăți conform planului de tipuri.
+
+	Dacă o coloană a bucății nu se încadrează în tipul planificat (ex. o valoare text într-o coloană
+	planificată bool), tipul din plan este lărgit pe loc (vezi `tip_potrivit`), astfel încât nici bucata
+	curentă, nici cele următoare să nu fie convertite cu pierderi.
+
+	Parametri:
+	----------
+	bucata : pd.DataFrame
+		Bucata citită din fișier.
+	plan : dict
+		Planul de tipuri obținut cu `stabilire_plan_tipuri`.
+
+	Returnează:
+	-----------
+	pd.DataFrame
+		Bucata cu tipuri compacte:
+		- "bool" → `bool` (sau `boolean` dacă există valori lipsă)
+		- "integer" → cel mai mic tip întreg care păstrează valorile
+		- "float" → rămâne `float64`
+		- "category" → `category`
+	"""
+	for col in plan:
+		serie = bucata[col]
+		tip = plan[col] = tip_potrivit(serie, plan[col])
+		if tip == "bool":
+			if serie.isnull().any():
+				bucata[col] = serie.astype("boolean")
+			else:
+				bucata[col] = serie.astype(bool)
+		elif tip == "integer" and pd.api.types.is_integer_dtype(serie):
+			bucata[col] = pd.to_numeric(serie, downcast="integer")
+		elif tip == "category":
+			bucata[col] = serie.astype("category")
+	return bucata
+
+
+def concatenare_bucati(bucati: list) -> pd.DataFrame:
+	"""
+	Unește bucățile citite într-un singur DataFrame, coloană cu coloană.
+
+	Coloanele de tip `category` sunt unite cu `union_categoricals`, astfel încât rezultatul
+	să rămână categorial chiar dacă bucățile au categorii diferite. Bucățile sunt eliberate
+	pe măsură ce fiecare coloană este construită, pentru a evita o copie intermediară completă.
+
+	Parametri:
+	----------
+	bucati : list of pd.DataFrame
+		Bucățile convertite, în ordinea citirii.
+
+	Returnează:
+	-----------
+	pd.DataFrame
+		DataFrame-ul complet, cu index continuu.
+	"""
+	if len(bucati) == 1:
+		return bucati[0].reset_index(drop=True)
+
+	coloane = {}
+	for col in bucati[0].columns:
+		serii = [bucata.pop(col) for bucata in bucati]
+		if all(isinstance(serie.dtype, pd.CategoricalDtype) for serie in serii):
+			coloane[col] = pd.Series(union_categoricals(serii), name=col)
+		else:
+			coloane[col] = pd.concat(serii, ignore_index=True)
+	return pd.DataFrame(coloane)
+
+
+def format_fisier(nume: str):
+	"""
+	Determină formatul și compresia unui fișier încărcat, pe baza extensiei.
+
+	Parametri:
+	----------
+	nume : str
+		Numele fișierului (ex. "student_data.csv.gz").
+
+	Returnează:
+	-----------
+	tuple:
+		- format: "csv" sau "parquet"
+		- compresie: "gzip", "zstd", "zip" sau None, în formatul acceptat de `pd.read_csv`
+	"""
+	nume = nume.lower()
+	if nume.endswith(".parquet"):
+		return "parquet", None
+	for extensie, compresie in EXTENSII_COMPRESIE.items():
+		if nume.endswith(extensie):
+			return "csv", compresie
+	return "csv", None
+
+
+def bucati_csv(fisier, dimensiune_bucata: int, compresie: str = None):
+	"""
+	Generează bucățile unui fișier CSV, eventual comprimat, împreună cu fracțiunea citită.
+
+	Decomprimarea se face în flux de către Pandas, astfel încât fișierul decomprimat
+	nu este niciodată păstrat complet în memorie.
+
+	Parametri:
+	----------
+	fisier : file-like
+		Fișierul încărcat.
+	dimensiune_bucata : int
+		Numărul de rânduri citite la fiecare pas.
+	compresie : str, optional
+		Tipul de compresie ("gzip", "zstd", "zip") sau None pentru CSV simplu.
+
+	Returnează:
+	-----------
+	generator of (pd.DataFrame, float or None)
+		Bucata citită și fracțiunea din fișier parcursă până acum (calculată pe octeții comprimați).
+	"""
+	dimensiune_totala = getattr(fisier, "size", None)
+	for bucata in pd.read_csv(fisier, chunksize=dimensiune_bucata, compression=compresie):
+		fractiune = None
+		if dimensiune_totala and hasattr(fisier, "tell"):
+			fractiune = min(fisier.tell() / dimensiune_totala, 1.0)
+		yield bucata, fractiune
+
+
+def bucati_parquet(fisier, dimensiune_bucata: int):
+	"""
+	Generează bucățile unui fișier Parquet, citite direct din format binar, fără parsare text.
+
+	Parametri:
+	----------
+	fisier : file-like
+		Fișierul încărcat.
+	dimensiune_bucata : int
+		Numărul de rânduri citite la fiecare pas.
+
+	Returnează:
+	-----------
+	generator of (pd.DataFrame, float or None)
+		Bucata citită și fracțiunea din numărul total de rânduri parcursă până acum.
+	"""
+	fisier_parquet = pq.ParquetFile(fisier)
+	total_randuri = fisier_parquet.metadata.num_rows
+	randuri_citite = 0
+	for lot in fisier_parquet.iter_batches(batch_size=dimensiune_bucata):
+		bucata = lot.to_pandas()
+		randuri_citite += len(bucata)
+		yield bucata, randuri_citite / total_randuri if total_randuri else None
+
+
+def citire_pe_bucati(
+	bucati,
+	limita_memorie_mb: float = LIMITA_MEMORIE_MB,
+	progres=None,
+	schite=None,
+) -> pd.DataFrame:
+	"""
+	Construiește un DataFrame din bucăți succesive, cu conversie de tipuri pe fiecare bucată și limită de memorie.
+
+	Parametri:
+	----------
+	bucati : iterable of (pd.DataFrame, float or None)
+		Bucățile citite și fracțiunea parcursă (ex. `bucati_csv` sau `bucati_parquet`).
+	limita_memorie_mb : float, implicit 1024
+		Memoria maximă (în MB) pe care o pot ocupa datele citite.
+	progres : callable, optional
+		Funcție apelată după fiecare bucată cu (fracțiune_citită, număr_rânduri).
+	schite : SchiteDate, optional
+		Schițe actualizate cu fiecare bucată convertită (vezi `schite_date`). Dacă tipul unei coloane
+		este lărgit după prima bucată, schițele sunt reconstruite din DataFrame-ul final.
+
+	Returnează:
+	-----------
+	pd.DataFrame
+		DataFrame-ul complet, cu tipuri compacte.
+
+	Excepții:
+	---------
+	MemoryError
+		Dacă datele citite depășesc limita de memorie configurată.
+	"""
+	limita_octeti = limita_memorie_mb * 1024 ** 2
+
+	bucati_convertite = []
+	plan = None
+	memorie = 0
+	nr_randuri = 0
+
+	schite_invalide = False
+
+	for bucata, fractiune in bucati:
+		if plan is None:
+			plan = stabilire_plan_tipuri(bucata)
+		plan_anterior = dict(plan)
+		bucata = conversie_bucata(bucata, plan)
+		if plan != plan_anterior and bucati_convertite:
+			schite_invalide = True
+
+		memorie += bucata.memory_usage(deep=True).sum()
+		if memorie > limita_octeti:
+			raise MemoryError(
+				f"Datele depășesc limita de memorie de {limita_memorie_mb:.0f} MB "
+				f"după {nr_randuri + len(bucata)} rânduri."
+			)
+
+		bucati_convertite.append(bucata)
+		nr_randuri += len(bucata)
+		if schite is not None and not schite_invalide:
+			schite.actualizare(bucata)
+
+		if progres is not None:
+			progres(fractiune, nr_randuri)
+
+	if not bucati_convertite:
+		return pd.DataFrame()
+
+	df = concatenare_bucati(bucati_convertite)
+	if schite is not None and schite_invalide:
+		schite.golire()
+		schite.combinare(construire_schite(df))
+	return df
+
+
+def citire_fisier(
+	fisier,
+	pe_bucati: bool = False,
+	dimensiune_bucata: int = DIMENSIUNE_BUCATA,
+	limita_memorie_mb: float = LIMITA_MEMORIE_MB,
+	progres=None,
+	schite=None,
+) -> pd.DataFrame:
+	"""
+	Citește un fișier încărcat (CSV, CSV comprimat sau Parquet) într-un DataFrame.
+
+	Parametri:
+	----------
+	fisier : file-like
+		Fișierul încărcat (ex. obiectul returnat de `st.file_uploader`), cu atributul `name`.
+	pe_bucati : bool, implicit False
+		Dacă este True, fișierul este citit pe bucăți, cu tipuri compacte și limită de memorie.
+	dimensiune_bucata : int, implicit 100 000
+		Numărul de rânduri citite la fiecare pas.
+	limita_memorie_mb : float, implicit 1024
+		Memoria maximă (în MB) pe care o pot ocupa datele citite în modul pe bucăți.
+	progres : callable, optional
+		Funcție apelată după fiecare bucată cu (fracțiune_citită, număr_rânduri).
+	schite : SchiteDate, optional
+		Schițe actualizate cu fiecare bucată în modul pe bucăți (vezi `schite_date`).
+
+	Returnează:
+	-----------
+	pd.DataFrame
+		Setul de date citit.
+
+	Excepții:
+	---------
+	ValueError
+		Dacă fișierul comprimat este corupt sau incomplet.
+	"""
+	format_date, compresie = format_fisier(getattr(fisier, "name", ""))
+
+	try:
+		if not pe_bucati:
+			if format_date == "parquet":
+				return pd.read_parquet(fisier)
+			return pd.read_csv(fisier, compression=compresie)
+
+		if format_date == "parquet":
+			bucati = bucati_parquet(fisier, dimensiune_bucata)
+		else:
+			bucati = bucati_csv(fisier, dimensiune_bucata, compresie)
+		return citire_pe_bucati(bucati, limita_memorie_mb, progres, schite)
+	except (zipfile.BadZipFile, gzip.BadGzipFile, EOFError) as e:
+		raise ValueError(f"Fișierul comprimat este corupt sau incomplet: {e}") from e
+
+
+def compactare_df(df: pd.DataFrame, prag_categorie: float = PRAG_CATEGORIE) -> pd.DataFrame:
+	"""
+	Convertește un DataFrame la o reprezentare compactă în memorie.
+
+	Parametri:
+	----------
+	df : pd.DataFrame
+		Setul de date original.
+	prag_categorie : float, implicit 0.5
+		Raportul maxim dintre numărul de valori unice și numărul de rânduri pentru care
+		o coloană de tip obiect este convertită la `category`.
+
+	Returnează:
+	-----------
+	pd.DataFrame
+		O copie a DataFrame-ului în care:
+		- coloanele text cu puține valori distincte devin `category`;
+		- coloanele obiect care conțin doar True/False devin `bool`;
+		- coloanele întregi sunt reduse la cel mai mic tip întreg care păstrează valorile;
+		- coloanele reale sunt reduse la `float32` doar dacă valorile se păstrează exact.
+	"""
+	df = conversie_bucata(df.copy(deep=False), stabilire_plan_tipuri(df, prag_categorie))
+	for col in df.select_dtypes(include="float64").columns:
+		valori = df[col].to_numpy()
+		valori_reduse = valori.astype(np.float32)
+		if np.array_equal(valori_reduse.astype(np.float64), valori, equal_nan=True):
+			df[col] = valori_reduse
+	return df
+
+
+def raport_memorie(df_initial: pd.DataFrame, df_compact: pd.DataFrame) -> pd.DataFrame:
+	"""
+	Compară memoria ocupată de fiecare coloană înainte și după compactare.
+
+	Parametri:
+	----------
+	df_initial : pd.DataFrame
+		Setul de date în forma inițială.
+	df_compact : pd.DataFrame
+		Setul de date după `compactare_df`.
+
+	Returnează:
+	-----------
+	pd.DataFrame
+		Tabel cu tipul și memoria (în KB) fiecărei coloane în cele două forme,
+		sortat descrescător după memoria economisită.
+	"""
+	memorie_initiala = df_initial.memory_usage(index=False, deep=True)
+	memorie_compacta = df_compact.memory_usage(index=False, deep=True)
+	raport = pd.DataFrame({
+		"Tip inițial": df_initial.dtypes.astype(str),
+		"Tip compact": df_compact.dtypes.astype(str),
+		"Memorie inițială (KB)": np.round(memorie_initiala / 1024, 1),
+		"Memorie compactă (KB)": np.round(memorie_compacta / 1024, 1),
+	})
+	raport.index.name = "Coloană"
+	economie = memorie_initiala - memorie_compacta
+	return raport.loc[economie.sort_values(ascending=False).index]
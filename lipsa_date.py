@@ -0,0 +1,284 @@
+"""
+Introducerea artificială a valorilor lipsă și analiza tiparelor de lipsă.
+
+- Masca valorilor lipsă este generată vectorizat, dintr-un `np.random.Generator` inițializat cu o sămânță,
+  deci rezultatul poate fi reprodus.
+- Modele de lipsă suportate:
+	- "MCAR" (missing completely at random): fiecare coloană pierde exact proporția aleasă de valori, la întâmplare;
+	- "MAR" (missing at random): probabilitatea lipsei crește cu rangul valorii dintr-o coloană de condiționare;
+	- "Blocuri": valorile lipsesc în blocuri de rânduri consecutive (ex. o perioadă fără înregistrări).
+- Masca este generată și aplicată pe blocuri de coloane (`DataFrame.mask`), fără atribuiri rând cu rând.
+- Pentru analiză, masca valorilor lipsă a fiecărei coloane este împachetată o singură dată per versiune
+  într-un șir de biți (`np.packbits`, 8 rânduri per octet). Numărul de valori lipsă, co-apariția pe perechi
+  de coloane (ȘI pe biți + numărarea biților cu un tabel precalculat pentru toate valorile de 16 biți),
+  tiparele de rânduri și matricea valorilor lipsă sunt derivate din aceste șiruri de biți.
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from contingenta_date import COLOANA_TINTA
+from duplicate_date import combinare_amprente
+from schema_date import get_versiune
+
+
+MODELE_LIPSA = ["MCAR", "MAR", "Blocuri"]
+LUNGIME_BLOC = 50
+ELEMENTE_BLOC_MASCA = 2 ** 24
+NUMAR_BENZI_MATRICE = 200
+NUMAR_MAXIM_TIPARE = 50
+BITI_OCTET = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+BITI_CUVANT = (BITI_OCTET[:, None] + BITI_OCTET[None, :]).ravel()
+
+
+def ponderi_mar(serie: pd.Series) -> np.ndarray:
+	"""
+	Returnează ponderile rândurilor pentru modelul MAR: rangul procentual al valorii din coloana de condiționare
+	(codul valorii pentru coloanele nenumerice). Rândurile cu valoare lipsă primesc ponderea medie.
+	"""
+	if not pd.api.types.is_numeric_dtype(serie) or pd.api.types.is_bool_dtype(serie):
+		coduri, _ = pd.factorize(serie, sort=True)
+		serie = pd.Series(np.where(coduri >= 0, coduri, np.nan), index=serie.index)
+	ponderi = serie.rank(pct=True).to_numpy(dtype=np.float64)
+	return np.where(np.isnan(ponderi), 0.5, ponderi)
+
+
+def generare_masca_lipsa(
+	numar_randuri: int,
+	proportii: np.ndarray,
+	rng: np.random.Generator,
+	model: str = "MCAR",
+	ponderi: np.ndarray = None,
+	lungime_bloc: int = LUNGIME_BLOC,
+) -> np.ndarray:
+	"""
+	Generează masca valorilor lipsă pentru un bloc de coloane.
+
+	Parametri:
+	----------
+	numar_randuri : int
+		Numărul de rânduri ale setului de date.
+	proportii : np.ndarray
+		Proporția de valori lipsă dorită pentru fiecare coloană.
+	rng : np.random.Generator
+		Generatorul de numere aleatoare.
+	model : str, implicit "MCAR"
+		Modelul de lipsă: "MCAR", "MAR" sau "Blocuri".
+	ponderi : np.ndarray, optional
+		Ponderile rândurilor (între 0 și 1) pentru modelul MAR (vezi `ponderi_mar`).
+	lungime_bloc : int, implicit 50
+		Numărul de rânduri consecutive dintr-un bloc, pentru modelul "Blocuri".
+
+	Returnează:
+	-----------
+	np.ndarray
+		Matrice booleană (rânduri × coloane); True marchează o valoare ce devine lipsă.
+
+	Masca este construită coloană cu coloană contiguu în memorie (coloane × rânduri) și returnată transpusă.
+	"""
+	n, k = numar_randuri, len(proportii)
+	if n == 0 or k == 0:
+		return np.zeros((n, k), dtype=bool)
+
+	if model == "MCAR":
+		# Exact `proportie * n` valori per coloană: cele mai mici numere aleatoare din coloană
+		aleator = rng.random((k, n), dtype=np.float32)
+		numar = (proportii * n).astype(np.int64)
+		praguri = np.array([
+			np.partition(aleator[j], numar[j])[numar[j]] if numar[j] < n else np.inf for j in range(k)
+		])
+		return (aleator < praguri[:, None]).T
+
+	if model == "MAR":
+		# Probabilitate proporțională cu ponderea rândului, cu media egală cu proporția dorită
+		aleator = rng.random((k, n), dtype=np.float32)
+		probabilitati = np.minimum(proportii[:, None] * (ponderi / ponderi.mean())[None, :], 1.0)
+		return (aleator < probabilitati).T
+
+	if model == "Blocuri":
+		# Începuturile blocurilor, marcate într-un tablou de diferențe cumulat pe fiecare coloană
+		lungime_bloc = max(1, min(lungime_bloc, n))
+		numar_blocuri = np.ceil(proportii * n / lungime_bloc).astype(np.int64)
+		inceputuri = rng.integers(0, n - lungime_bloc + 1, size=(k, max(int(numar_blocuri.max()), 1)))
+		folosite = np.arange(inceputuri.shape[1])[None, :] < numar_blocuri[:, None]
+		coloane = np.broadcast_to(np.arange(k)[:, None], inceputuri.shape)
+		diferente = np.zeros((k, n + 1), dtype=np.int32)
+		np.add.at(diferente, (coloane[folosite], inceputuri[folosite]), 1)
+		np.add.at(diferente, (coloane[folosite], inceputuri[folosite] + lungime_bloc), -1)
+		return (np.cumsum(diferente[:, :-1], axis=1) > 0).T
+
+	raise ValueError(f"Model de lipsă necunoscut: {model}")
+
+
+def introducere_valori_lipsa(
+	df: pd.DataFrame,
+	procent_min: float = 0.01,
+	procent_max: float = 0.1,
+	model: str = "MCAR",
+	coloana_conditie: str = None,
+	lungime_bloc: int = LUNGIME_BLOC,
+	seed: int = None,
+) -> pd.DataFrame:
+	"""
+	Introduce artificial valori lipsă (NaN) într-un DataFrame, cu o proporție aleasă per coloană dintr-un interval.
+
+	Parametri:
+	----------
+	df : pd.DataFrame
+		DataFrame-ul original.
+	procent_min : float, implicit 0.01
+		Procentul minim de valori lipsă ce vor fi introduse per coloană.
+	procent_max : float, implicit 0.1
+		Procentul maxim de valori lipsă ce pot fi introduse per coloană.
+	model : str, implicit "MCAR"
+		Modelul de lipsă: "MCAR", "MAR" sau "Blocuri" (vezi `generare_masca_lipsa`).
+	coloana_conditie : str, optional
+		Coloana de care depinde probabilitatea lipsei în modelul MAR; ea rămâne completă.
+	lungime_bloc : int, implicit 50
+		Numărul de rânduri consecutive dintr-un bloc, pentru modelul "Blocuri".
+	seed : int, optional
+		Sămânța generatorului de numere aleatoare; aceeași sămânță produce aceeași mască.
+
+	Returnează:
+	-----------
+	pd.DataFrame
+		O copie a DataFrame-ului original cu valori lipsă introduse (exceptând coloana 'Target'
+		și coloana de condiționare).
+	"""
+	if model == "MAR" and coloana_conditie is None:
+		raise ValueError("Modelul MAR necesită o coloană de condiționare.")
+	rng = np.random.default_rng(seed)
+	excluse = {COLOANA_TINTA, coloana_conditie}
+	coloane = [col for col in df.columns if col not in excluse]
+	proportii = rng.uniform(procent_min, procent_max, size=len(coloane))
+	ponderi = ponderi_mar(df[coloana_conditie]) if model == "MAR" else None
+
+	parti = [df[[col for col in df.columns if col in excluse]]]
+	coloane_bloc = max(1, ELEMENTE_BLOC_MASCA // max(len(df), 1))
+	for start in range(0, len(coloane), coloane_bloc):
+		bloc = coloane[start:start + coloane_bloc]
+		masca = generare_masca_lipsa(
+			len(df), proportii[start:start + coloane_bloc], rng, model, ponderi, lungime_bloc
+		)
+		parti.append(df[bloc].mask(pd.DataFrame(masca, index=df.index, columns=bloc)))
+	return pd.concat(parti, axis=1)[df.columns]
+
+
+def numarare_biti(biti: np.ndarray) -> np.ndarray:
+	"""
+	Numără biții setați pe fiecare rând al unei matrice de octeți (cu un număr par de octeți pe rând),
+	citind octeții câte doi, ca valori de 16 biți, din tabelul `BITI_CUVANT`.
+	"""
+	return BITI_CUVANT[biti.view(np.uint16)].sum(axis=-1, dtype=np.int64)
+
+
+def matrice_lipsa_benzi(biti: np.ndarray, numar_randuri: int, numar_benzi: int = NUMAR_BENZI_MATRICE) -> np.ndarray:
+	"""
+	Returnează proporția valorilor lipsă pe benzi de rânduri consecutive, pentru fiecare coloană.
+
+	Parametri:
+	----------
+	biti : np.ndarray
+		Șirurile de biți ale coloanelor (coloane × octeți).
+	numar_randuri : int
+		Numărul de rânduri ale setului de date.
+	numar_benzi : int, implicit 200
+		Numărul maxim de benzi; o bandă are un număr întreg de octeți (multiplu de 8 rânduri).
+
+	Returnează:
+	-----------
+	tuple (np.ndarray, np.ndarray)
+		Matricea (coloane × benzi) cu proporția valorilor lipsă și primul rând al fiecărei benzi.
+	"""
+	numar_octeti = biti.shape[1]
+	if numar_octeti == 0:
+		return np.zeros((biti.shape[0], 0)), np.zeros(0, dtype=np.int64)
+	octeti_banda = -(-numar_octeti // numar_benzi)
+	inceputuri = np.arange(0, numar_octeti, octeti_banda)
+	lipsa = np.add.reduceat(BITI_OCTET[biti].astype(np.int64), inceputuri, axis=1)
+	randuri = np.diff(np.minimum(np.append(inceputuri, numar_octeti) * 8, numar_randuri))
+	return lipsa / randuri, inceputuri * 8
+
+
+def calcul_tipare_lipsa(df: pd.DataFrame, numar_maxim_tipare: int = NUMAR_MAXIM_TIPARE) -> dict:
+	"""
+	Analizează valorile lipsă dintr-un DataFrame, pornind de la masca fiecărei coloane împachetată pe biți.
+
+	Parametri:
+	----------
+	df : pd.DataFrame
+		Setul de date analizat.
+	numar_maxim_tipare : int, implicit 50
+		Numărul maxim de tipare de rânduri păstrate (cele mai frecvente).
+
+	Returnează:
+	-----------
+	dict
+		- "numarari": pd.Series — numărul de valori lipsă per coloană
+		- "total": int — numărul total de valori lipsă
+		- "coocurenta": pd.DataFrame — pentru coloanele cu valori lipsă, numărul de rânduri în care
+		  ambele coloane lipsesc (pe diagonală, numărul de valori lipsă ale coloanei)
+		- "tipare": pd.DataFrame — combinațiile de coloane care lipsesc împreună (True = lipsă),
+		  cu "Număr rânduri" și "Procent", ordonate descrescător
+		- "numar_tipare": int — numărul total de tipare distincte (inclusiv rândurile complete)
+		- "matrice": pd.DataFrame — proporția valorilor lipsă pe benzi de rânduri (benzi × coloane)
+	"""
+	n = len(df)
+	numar_octeti = -(-n // 8)
+	# Rânduri de lungime multiplu de 8 octeți, completate cu zero, pentru citirea pe cuvinte
+	biti = np.zeros((df.shape[1], -(-numar_octeti // 8) * 8), dtype=np.uint8)
+	for j, col in enumerate(df.columns):
+		biti[j, :numar_octeti] = np.packbits(df[col].isna().to_numpy())
+	numarari = pd.Series(numarare_biti(biti), index=df.columns)
+
+	# Co-apariția: ȘI pe biți între fiecare coloană cu valori lipsă și toate celelalte
+	cu_lipsa = np.flatnonzero(numarari.to_numpy() > 0)
+	coloane_lipsa = df.columns[cu_lipsa]
+	biti_lipsa = biti[cu_lipsa]
+	coocurenta = np.empty((len(cu_lipsa), len(cu_lipsa)), dtype=np.int64)
+	for i in range(len(cu_lipsa)):
+		coocurenta[i] = numarare_biti(biti_lipsa[i] & biti_lipsa)
+
+	# Tiparele rândurilor: biții coloanelor cu valori lipsă, reîmpachetați pe rânduri în cuvinte de 64 de biți
+	# și grupați după o singură cheie de 64 de biți per rând (exactă pentru cel mult 64 de coloane)
+	pe_randuri = np.zeros((n, -(-len(cu_lipsa) // 64) * 8), dtype=np.uint8)
+	if n > 0 and len(cu_lipsa) > 0:
+		pe_randuri[:, :-(-len(cu_lipsa) // 8)] = np.packbits(np.unpackbits(biti_lipsa, axis=1, count=n).T, axis=1)
+	cheie = combinare_amprente(np.ascontiguousarray(pe_randuri.view(np.uint64).T))
+	_, primul, numar = np.unique(cheie, return_index=True, return_counts=True)
+	tipare = pe_randuri[primul]
+	ordine = np.argsort(-numar, kind="stable")[:numar_maxim_tipare]
+	tabel_tipare = pd.DataFrame(
+		np.unpackbits(tipare[ordine], axis=1, count=len(cu_lipsa)).astype(bool), columns=coloane_lipsa
+	)
+	tabel_tipare["Număr rânduri"] = numar[ordine]
+	tabel_tipare["Procent"] = numar[ordine] / max(n, 1) * 100
+
+	proportii, inceputuri = matrice_lipsa_benzi(biti_lipsa[:, :numar_octeti], n)
+	return {
+		"numarari": numarari,
+		"total": int(numarari.sum()),
+		"coocurenta": pd.DataFrame(coocurenta, index=coloane_lipsa, columns=coloane_lipsa),
+		"tipare": tabel_tipare,
+		"numar_tipare": len(numar),
+		"matrice": pd.DataFrame(proportii.T, index=pd.Index(inceputuri, name="Primul rând"), columns=coloane_lipsa),
+	}
+
+
+@st.cache_data(show_spinner="Analiză valori lipsă...", max_entries=8)
+def tipare_lipsa_versiune(versiune: str, _df: pd.DataFrame) -> dict:
+	"""
+	Returnează analiza valorilor lipsă pentru o versiune a datelor, calculată o singură dată și partajată între sesiuni.
+	"""
+	return calcul_tipare_lipsa(_df)
+
+
+def get_tipare_lipsa():
+	"""
+	Returnează analiza valorilor lipsă a datelor din session_state sau None dacă nu există date încărcate.
+	"""
+	df = st.session_state.get("df")
+	if df is None:
+		return None
+	return tipare_lipsa_versiune(get_versiune(), df)
@@ -0,0 +1,107 @@
+"""
+Raportul de outlieri pentru toate coloanele numerice, calculat vectorizat și păstrat în cache.
+
+- Limitele IQR (Q1 - 1.5*IQR, Q3 + 1.5*IQR) sunt calculate pentru toate coloanele deodată,
+  din quartilele profilului exact (o singură apelare `nanquantile` pe blocul numeric).
+- Pentru fiecare coloană: numărul și procentul de outlieri și skewness-ul.
+- O hartă de biți per rând (`np.packbits`, un bit pentru fiecare coloană numerică) marchează
+  valorile din afara limitelor.
+- Raportul este calculat o singură dată per versiune a datelor și citit de paginile de box plots
+  și de procesare.
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from profil_date import profil_versiune
+from schema_date import get_schema, get_versiune
+
+
+def calcul_raport_outlieri(df: pd.DataFrame, statistici: pd.DataFrame) -> dict:
+	"""
+	Calculează raportul de outlieri pentru coloanele numerice, într-o singură trecere vectorizată.
+
+	Parametri:
+	----------
+	df : pd.DataFrame
+		Setul de date.
+	statistici : pd.DataFrame
+		Statisticile coloanelor numerice din profilul exact (vezi `profil_date.profil_numeric`).
+
+	Returnează:
+	-----------
+	dict
+		- "raport": pd.DataFrame — indexat după coloane, cu "q1", "q3", "iqr", "limita_inferioara",
+		  "limita_superioara", "numar_outlieri", "procent_outlieri" și "skew"
+		- "bitmap": np.ndarray — matrice `uint8` (rânduri × ceil(coloane / 8)), cu bitul coloanei j
+		  setat pentru rândurile în care valoarea este outlier
+		- "coloane": list — coloanele numerice, în ordinea biților
+	"""
+	coloane = statistici.index.tolist()
+	X = df[coloane].to_numpy(dtype=np.float64, na_value=np.nan)
+
+	q1 = statistici["q25"].to_numpy()
+	q3 = statistici["q75"].to_numpy()
+	iqr = q3 - q1
+	limita_inferioara = q1 - 1.5 * iqr
+	limita_superioara = q3 + 1.5 * iqr
+
+	# Valorile lipsă nu sunt outlieri (comparațiile cu NaN sunt False)
+	masca = (X < limita_inferioara) | (X > limita_superioara)
+	numar_outlieri = masca.sum(axis=0)
+	with np.errstate(invalid="ignore", divide="ignore"):
+		procent_outlieri = 100 * numar_outlieri / statistici["numar"].to_numpy()
+
+	raport = pd.DataFrame({
+		"q1": q1,
+		"q3": q3,
+		"iqr": iqr,
+		"limita_inferioara": limita_inferioara,
+		"limita_superioara": limita_superioara,
+		"numar_outlieri": numar_outlieri,
+		"procent_outlieri": procent_outlieri,
+		"skew": statistici["skew"].to_numpy(),
+	}, index=statistici.index)
+	return {"raport": raport, "bitmap": np.packbits(masca, axis=1), "coloane": coloane}
+
+
+def masca_coloana(raport_outlieri: dict, coloana: str) -> np.ndarray:
+	"""
+	Returnează masca booleană a rândurilor în care coloana dată are outlieri, citită din harta de biți.
+	"""
+	j = raport_outlieri["coloane"].index(coloana)
+	return ((raport_outlieri["bitmap"][:, j >> 3] >> (7 - (j & 7))) & 1).astype(bool)
+
+
+def randuri_cu_outlieri(raport_outlieri: dict, coloane: list = None) -> np.ndarray:
+	"""
+	Returnează masca booleană a rândurilor care au cel puțin un outlier (pe toate coloanele sau doar pe `coloane`).
+	"""
+	if coloane is None:
+		return (raport_outlieri["bitmap"] != 0).any(axis=1)
+	masca = np.zeros(len(raport_outlieri["bitmap"]), dtype=bool)
+	for coloana in coloane:
+		masca |= masca_coloana(raport_outlieri, coloana)
+	return masca
+
+
+@st.cache_data(show_spinner="Calcul raport outlieri...", max_entries=8)
+def raport_outlieri_versiune(versiune: str, _df: pd.DataFrame, _schema: pd.DataFrame) -> dict:
+	"""
+	Returnează raportul de outlieri pentru o versiune a datelor, calculat o singură dată și partajat între sesiuni.
+	"""
+	statistici = profil_versiune(versiune, _df, _schema)["numerice"]
+	return calcul_raport_outlieri(_df, statistici)
+
+
+def get_raport_outlieri():
+	"""
+	Returnează raportul de outlieri al datelor din session_state sau None dacă nu există date încărcate.
+
+	Raportul folosește întotdeauna profilul exact, chiar și în modul aproximativ.
+	"""
+	df = st.session_state.get("df")
+	if df is None:
+		return None
+	return raport_outlieri_versiune(get_versiune(), df, get_schema())
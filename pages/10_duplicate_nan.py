@@ -1,19 +1,31 @@
 """
 Gestionează valori lipsă și duplicate într-un set de date încărcat.
 
-Permite introducerea artificială a valorilor NaN și afișează un grafic cu cele mai afectate coloane.
+Permite introducerea artificială a valorilor NaN (reproductibilă, cu modelele MCAR, MAR sau pe blocuri;
+vezi `lipsa_date`) și afișează un grafic cu cele mai afectate coloane, matricea valorilor lipsă,
+tiparele de rânduri (coloanele care lipsesc împreună) și co-apariția valorilor lipsă pe perechi de coloane,
+toate derivate din masca valorilor lipsă împachetată pe biți o singură dată per versiune.
 
-Verifică și raportează rândurile duplicate, oferind opțiunea de afișare.
-"""
+Verifică și raportează rândurile duplicate (după toate coloanele sau după coloanele cheie alese),
+din amprentele rândurilor calculate o singură dată per versiune (vezi `duplicate_date`),
+oferind opțiunea de afișare a grupurilor și de eliminare a duplicatelor.
 
-import random
+Caută și rândurile aproape duplicate (înregistrări introduse de două ori cu mici diferențe),
+cu semnături MinHash și LSH (vezi `aproape_duplicate_date`).
+"""
 
 import numpy as np
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 import streamlit as st
 
+from aproape_duplicate_date import PRAG_SIMILARITATE, get_aproape_duplicate
+from duplicate_date import get_duplicate, grupuri_duplicate
+from lipsa_date import LUNGIME_BLOC, MODELE_LIPSA, get_tipare_lipsa, introducere_valori_lipsa
 from nav_bar import nav_bar
+from schema_date import get_versiune, setare_date
+from schite_date import schite_daca_aproximativ
 
 
 st.set_page_config(page_title="Duplicate și valori lipsă", page_icon="🚨", layout="wide")
@@ -22,51 +34,26 @@ st.title("Duplicate și valori lipsă")
 df: pd.DataFrame = st.session_state.get("df", default=None)
 
 
-def introducere_valori_lipsa(df: pd.DataFrame, procent_min=0.01, procent_max=0.1):
-	"""
-	Introduce artificial valori lipsă (NaN) într-un DataFrame într-un interval procentual specificat.
-
-	Parametri:
-	----------
-	df : pd.DataFrame
-		DataFrame-ul original.
-	procent_min : float, implicit 0.01
-		Procentul minim de valori lipsă ce vor fi introduse per coloană.
-	procent_max : float, implicit 0.1
-		Procentul maxim de valori lipsă ce pot fi introduse per coloană.
-
-	Returnează:
-	-----------
-	pd.DataFrame
-		O copie a DataFrame-ului original cu valori lipsă introduse aleatoriu (exceptând coloana 'Target').
-	"""
-	df_copy = df.copy()
-	for col in df_copy.columns:
-		if col != "Target":
-			procent = random.uniform(procent_min, procent_max)
-			n = int(len(df_copy) * procent)
-			index_to_nan = df_copy.sample(n=n).index
-			df_copy.loc[index_to_nan, col] = np.nan
-	return df_copy
-
-
-def plot_valori_lipsa(df: pd.DataFrame):
+def plot_valori_lipsa(missing_vals: pd.Series, numar_randuri: int, numar_coloane: int = 5):
 	"""
 	Afișează un grafic cu cele mai afectate coloane de valori lipsă într-un DataFrame.
 
 	Parametri:
 	----------
-	df : pd.DataFrame
-		DataFrame-ul analizat pentru identificarea valorilor lipsă.
+	missing_vals : pd.Series
+		Numărul de valori lipsă per coloană (vezi `lipsa_date.calcul_tipare_lipsa`).
+	numar_randuri : int
+		Numărul de rânduri ale setului de date.
+	numar_coloane : int, implicit 5
+		Numărul de coloane afișate.
 
 	Ce face funcția:
 	----------------
-	- Calculează numărul și procentul valorilor lipsă pentru fiecare coloană.
-	- Afișează un bar chart interactiv cu primele 5 coloane cu cele mai multe valori lipsă.
+	- Calculează procentul valorilor lipsă pentru fiecare coloană.
+	- Afișează un bar chart interactiv cu primele `numar_coloane` coloane cu cele mai multe valori lipsă.
 	- Ignoră coloanele fără valori lipsă și nu afișează nimic dacă nu există lipsuri.
 	"""
-	missing_vals = df.isnull().sum()
-	missing_percent = (missing_vals / len(df)) * 100
+	missing_percent = (missing_vals / numar_randuri) * 100
 
 	missing_df = pd.DataFrame({
 		'Coloană': missing_vals.index,
@@ -75,7 +62,7 @@ def plot_valori_lipsa(df: pd.DataFrame):
 	})
 
 	missing_df = missing_df[missing_df['Valori lipsă'] > 0]
-	missing_df = missing_df.sort_values(by='Procent', ascending=False).head(5)
+	missing_df = missing_df.sort_values(by='Procent', ascending=False).head(numar_coloane)
 
 	if missing_df.empty:
 		return
@@ -94,45 +81,185 @@ def plot_valori_lipsa(df: pd.DataFrame):
 	fig.update_layout(
 		xaxis_title='Procent (%)',
 		yaxis_title='Coloană',
-		height=400
+		height=max(400, 25 * len(missing_df))
 	)
 
 	st.plotly_chart(fig, use_container_width=True)
 
 
+def plot_matrice_lipsa(matrice: pd.DataFrame):
+	"""
+	Afișează matricea valorilor lipsă: proporția valorilor lipsă pe benzi de rânduri consecutive (axa verticală)
+	pentru fiecare coloană cu valori lipsă (axa orizontală).
+
+	Parametri:
+	----------
+	matrice : pd.DataFrame
+		Proporțiile pe benzi (benzi × coloane), indexate după primul rând al benzii.
+	"""
+	fig = go.Figure(
+		go.Heatmap(
+			z=matrice.to_numpy(),
+			x=matrice.columns.astype(str),
+			y=matrice.index,
+			zmin=0,
+			zmax=1,
+			colorscale="Oranges",
+			colorbar=dict(title="Proporție"),
+			hovertemplate="Coloană: %{x}<br>Rândurile de la %{y}<br>Proporție lipsă: %{z:.1%}<extra></extra>",
+		)
+	)
+	fig.update_layout(
+		title="Matricea valorilor lipsă",
+		xaxis_title="Coloană",
+		yaxis=dict(title="Rând", autorange="reversed"),
+		height=600,
+	)
+	st.plotly_chart(fig, use_container_width=True)
+
+
+def plot_coocurenta(coocurenta: pd.DataFrame):
+	"""
+	Afișează numărul de rânduri în care două coloane lipsesc simultan (pe diagonală, numărul de valori lipsă).
+
+	Parametri:
+	----------
+	coocurenta : pd.DataFrame
+		Matricea de co-apariție a valorilor lipsă (coloane × coloane).
+	"""
+	fig = go.Figure(
+		go.Heatmap(
+			z=coocurenta.to_numpy(),
+			x=coocurenta.columns.astype(str),
+			y=coocurenta.index.astype(str),
+			colorscale="Oranges",
+			hovertemplate="%{y} și %{x}: %{z} rânduri<extra></extra>",
+		)
+	)
+	fig.update_layout(
+		title="Co-apariția valorilor lipsă",
+		yaxis=dict(autorange="reversed"),
+		height=min(max(500, 18 * len(coocurenta)), 1600),
+	)
+	st.plotly_chart(fig, use_container_width=True)
+
+
 if "has_nan_values" not in st.session_state:
 	st.session_state.has_nan_values = False
 
 if df is not None:
 	if not st.session_state.has_nan_values:
+		with st.expander("Setări valori lipsă"):
+			model = st.radio("Model de lipsă", MODELE_LIPSA, horizontal=True)
+			procent_min, procent_max = st.slider(
+				"Procent de valori lipsă per coloană", min_value=0.0, max_value=50.0, value=(1.0, 10.0), step=0.5
+			)
+			coloana_conditie = lungime_bloc = None
+			if model == "MAR":
+				coloane_conditie = [col for col in df.columns if col != "Target"]
+				coloana_conditie = st.selectbox("Coloana de care depinde lipsa valorilor", coloane_conditie)
+			elif model == "Blocuri":
+				lungime_bloc = st.number_input("Lungimea unui bloc (rânduri)", min_value=1, value=LUNGIME_BLOC)
+			seed = st.number_input("Sămânța generatorului aleator", min_value=0, value=42, step=1)
 		if st.button("Introducere valori NaN"):
-			st.session_state.df = introducere_valori_lipsa(df)
+			df_nan = introducere_valori_lipsa(
+				df,
+				procent_min / 100,
+				procent_max / 100,
+				model=model,
+				coloana_conditie=coloana_conditie,
+				lungime_bloc=lungime_bloc or LUNGIME_BLOC,
+				seed=int(seed),
+			)
+			parametri = f"{model}-{procent_min}-{procent_max}-{coloana_conditie}-{lungime_bloc}-{int(seed)}"
+			versiune = f"{get_versiune()}-nan-{parametri}"
+			setare_date(df_nan, versiune, schite_daca_aproximativ(versiune, df_nan))
 			st.session_state.has_nan_values = True
 			st.warning("Am introdus artificial valori lipsă în setul de date.")
 	elif st.session_state.has_nan_values:
 		st.warning("Am introdus artificial valori lipsă în setul de date.")
 
 	st.subheader("📦 Cod folosit pentru a verifica valorile lipsă")
-	st.code("df.isnull().sum()", language="python")
+	st.code(
+		"biti = np.packbits(df[col].isna().to_numpy())  # o dată per coloană și versiune\n"
+		"numar_lipsa = BITI_CUVANT[biti.view(np.uint16)].sum()\n"
+		"lipsa_impreuna = BITI_CUVANT[(biti_a & biti_b).view(np.uint16)].sum()",
+		language="python",
+	)
 
-	missing = st.session_state.df.isnull().sum()
-	total_missing = missing.sum()
+	tipare_lipsa = get_tipare_lipsa()
+	total_missing = tipare_lipsa["total"]
 
 	if total_missing == 0:
 		st.success("Nu există valori lipsă.")
 	else:
 		st.warning(f"Există {total_missing} valori lipsă în total.")
-		plot_valori_lipsa(st.session_state.df)
+		coloane_cu_lipsa = int((tipare_lipsa["numarari"] > 0).sum())
+		numar_coloane = st.slider(
+			"Numărul de coloane afișate", min_value=1, max_value=coloane_cu_lipsa, value=min(5, coloane_cu_lipsa)
+		) if coloane_cu_lipsa > 1 else 1
+		plot_valori_lipsa(tipare_lipsa["numarari"], len(st.session_state.df), numar_coloane)
+
+		with st.expander("Matricea valorilor lipsă"):
+			plot_matrice_lipsa(tipare_lipsa["matrice"])
+
+		with st.expander("Tipare de valori lipsă"):
+			st.caption(
+				f"{tipare_lipsa['numar_tipare']} combinații distincte de coloane lipsă; "
+				f"sunt afișate cele mai frecvente {len(tipare_lipsa['tipare'])} (True = valoare lipsă)."
+			)
+			st.dataframe(tipare_lipsa["tipare"], hide_index=True)
+
+		with st.expander("Co-apariția valorilor lipsă"):
+			plot_coocurenta(tipare_lipsa["coocurenta"])
 
 	st.subheader("📦 Cod folosit pentru a verifica duplicatele")
-	st.code("df.duplicated().sum()", language="python")
+	st.code(
+		"amprente = [pd.util.hash_pandas_object(df[col], index=False) for col in coloane]  # o dată per versiune\n"
+		"grup, _ = pd.factorize(combinare_amprente(amprente))\n"
+		"numar_duplicate = len(grup) - grup.max() - 1",
+		language="python",
+	)
 
-	duplicates = st.session_state.df.duplicated().sum()
-	if duplicates == 0:
+	coloane_cheie = st.multiselect(
+		"Coloane cheie pentru verificarea duplicatelor (implicit toate coloanele)", st.session_state.df.columns
+	)
+	duplicate = get_duplicate(coloane_cheie)
+	if duplicate["numar_duplicate"] == 0:
 		st.success("Nu există rânduri duplicate.")
 	else:
-		st.warning(f"Există {duplicates} rânduri duplicate.")
+		st.warning(
+			f"Există {duplicate['numar_duplicate']} rânduri duplicate, în {duplicate['numar_grupuri']} grupuri."
+		)
 		if st.checkbox("Afișează duplicatele"):
-			st.dataframe(st.session_state.df[st.session_state.df.duplicated()])
+			st.dataframe(grupuri_duplicate(st.session_state.df, duplicate), hide_index=True)
+		if st.button("Eliminare duplicate (păstrează prima apariție)"):
+			cheie = ",".join(coloane_cheie) if coloane_cheie else "toate"
+			versiune = f"{get_versiune()}-fara-duplicate-{cheie}"
+			df_unic = st.session_state.df[~duplicate["duplicat"]]
+			setare_date(df_unic, versiune, schite_daca_aproximativ(versiune, df_unic))
+			st.rerun()
+
+	st.subheader("🔍 Aproape duplicate")
+	prag = st.slider(
+		"Similaritatea minimă (Jaccard) dintre două înregistrări",
+		min_value=0.5, max_value=1.0, value=PRAG_SIMILARITATE, step=0.05,
+	)
+	if st.checkbox("Caută înregistrările aproape duplicate"):
+		aproape_duplicate = get_aproape_duplicate(prag)
+		grupuri = aproape_duplicate["grupuri"]
+		if grupuri.empty:
+			st.success("Nu există înregistrări aproape duplicate.")
+		else:
+			st.warning(
+				f"Există {grupuri['Grup'].nunique()} grupuri de înregistrări aproape duplicate "
+				f"({len(grupuri)} rânduri, {len(aproape_duplicate['perechi'])} perechi similare)."
+			)
+			randuri = st.session_state.df.iloc[grupuri["Rând"].to_numpy()].reset_index(drop=True)
+			st.dataframe(pd.concat([grupuri[["Grup", "Similaritate"]], randuri], axis=1), hide_index=True)
+		st.caption(
+			f"Perechi candidate găsite prin LSH și verificate: {aproape_duplicate['numar_candidate']}. "
+			"Valorile numerice sunt comparate pe intervale, iar cele categoriale exact."
+		)
 else:
 	st.warning("Încarcă mai întâi un fișier CSV.")
@@ -5,16 +5,25 @@ Permite alegerea strategiilor pentru tratarea outlierilor, completarea valorilor
 (Label Encoding și One Hot Encoding), scalarea numerică și împărțirea în seturi de antrenare/testare.
 
 Rezultatul final este salvat în `st.session_state` sub forma unui set de date pregătit pentru antrenarea modelelor ML.
+
+Etapele sunt antrenate doar pe setul de antrenare, iar pipeline-ul rezultat poate fi descărcat, salvat pe disc
+și aplicat pe date noi, citite pe bucăți, fără a recalcula statisticile.
 """
 
+from io import BytesIO
+
 import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder, MinMaxScaler, RobustScaler, StandardScaler
 import streamlit as st
 from streamlit_sortables import sort_items
 
+from etape_date import amprenta_randuri, cheie_etapa, get_cache_etape
+from incarcare_date import DIMENSIUNE_BUCATA, EXTENSII_ACCEPTATE, bucati_csv, bucati_parquet, format_fisier
 from nav_bar import nav_bar
+from outlieri_date import get_raport_outlieri
+from preprocesare_date import DIRECTOR_PIPELINE, PipelinePreprocesare, creare_etape, pipeline_salvate
+from schema_date import coloane_de_tip, get_schema, get_versiune
 
 
 st.set_page_config(page_title="Procesarea datelor", page_icon="⚙️", layout="wide")
@@ -25,195 +34,73 @@ df: pd.DataFrame = st.session_state.get("df", default=None)
 if "label_sort_orders" not in st.session_state:
 	st.session_state["label_sort_orders"] = {}
 
+RANDOM_STATE_IMPARTIRE = 42
 
-def tratare_outlieri_df(df: pd.DataFrame, strategie: str) -> pd.DataFrame:
-	"""
-	Aplică o strategie de tratare a outlierilor pe coloanele numerice dintr-un DataFrame.
 
-	Parametri:
-	----------
-	df : pd.DataFrame
-		Setul de date original.
-	strategie : str
-		Strategia aleasă pentru tratarea outlierilor. Opțiuni posibile:
-		- "Eliminare rânduri cu outlieri"
-		- "Înlocuire cu NaN"
-		- "Transformare logaritmică"
-		- "Capping (1%-99%)"
-		- "Păstrare" (nu aplică nicio modificare)
+def indici_impartire(df: pd.DataFrame, dimensiune_test: float, stratificat: bool):
+	"""
+	Împarte pozițiile rândurilor în seturi de antrenare și testare (reproductibil, cu `RANDOM_STATE_IMPARTIRE`).
 
 	Returnează:
 	-----------
-	pd.DataFrame
-		DataFrame-ul modificat conform strategiei selectate, fără a altera coloana 'Target'.
-	"""
-	df = df.copy()
-	for col in df.select_dtypes(include=["float64", "int64"]).columns:
-		if col == "Target":
-			continue
-		q1 = df[col].quantile(0.25)
-		q3 = df[col].quantile(0.75)
-		iqr = q3 - q1
-		lower = q1 - 1.5 * iqr
-		upper = q3 + 1.5 * iqr
-
-		if strategie == "Eliminare rânduri cu outlieri":
-			df = df[(df[col] >= lower) & (df[col] <= upper)]
-		elif strategie == "Înlocuire cu NaN":
-			df[col] = df[col].mask((df[col] < lower) | (df[col] > upper))
-		elif strategie == "Transformare logaritmică":
-			df[col] = np.log1p(df[col])
-		elif strategie == "Capping (1%-99%)":
-			lower_cap = df[col].quantile(0.01)
-			upper_cap = df[col].quantile(0.99)
-			df[col] = np.clip(df[col], lower_cap, upper_cap)
-		elif strategie == "Păstrare":
-			pass
-	return df
-
-
-def tratare_valori_lipsa_df(df: pd.DataFrame, strategie: str) -> pd.DataFrame:
+	tuple:
+		- pozitii_train, pozitii_test: np.ndarray — pozițiile rândurilor de antrenare și de testare.
 	"""
-	Tratează valorile lipsă dintr-un DataFrame conform unei strategii specificate.
+	stratify = df["Target"] if stratificat else None
+	return train_test_split(
+		np.arange(len(df)), test_size=dimensiune_test, stratify=stratify, random_state=RANDOM_STATE_IMPARTIRE
+	)
 
-	Parametri:
-	----------
-	df : pd.DataFrame
-		DataFrame-ul original cu posibile valori lipsă.
-	strategie : str
-		Metoda de completare pentru coloanele numerice:
-		- "Medie": înlocuiește valorile lipsă cu media coloanei.
-		- "Mediană": înlocuiește valorile lipsă cu mediana coloanei.
-		- "Mod": înlocuiește valorile lipsă cu valoarea modală (cea mai frecventă).
-
-	Ce face în plus:
-	----------------
-	- Pentru coloanele de tip object, category sau bool, înlocuiește valorile lipsă cu moda,
-	  indiferent de strategia selectată (dacă nu e coloana 'Target').
 
-	Returnează:
-	-----------
-	pd.DataFrame
-		O copie a DataFrame-ului original, cu valorile lipsă completate.
+def antrenare_etapa(etapa, df_train: pd.DataFrame):
 	"""
-	df = df.copy()
-	for col in df.select_dtypes(include=np.number).columns:
-		if col != "Target" and df[col].isnull().any():
-			if strategie == "Medie":
-				df[col] = df[col].fillna(df[col].mean())
-			elif strategie == "Mediană":
-				df[col] = df[col].fillna(df[col].median())
-			elif strategie == "Mod":
-				df[col] = df[col].fillna(df[col].mode()[0])
-	for col in df.select_dtypes(include=["object", "category", "bool"]).columns:
-		if col != "Target" and df[col].isnull().any():
-			df[col] = df[col].fillna(df[col].mode()[0])
-	return df
-
-
-def tratare_codificari_df(
-	df: pd.DataFrame, use_one_hot: bool, label_encoding: dict, max_categorii: int = None
-) -> pd.DataFrame:
-	"""
-	Codifică variabilele categoriale dintr-un DataFrame folosind Label Encoding și/sau One Hot Encoding.
-
-	Parametri:
-	----------
-	df : pd.DataFrame
-		Setul de date original.
-	use_one_hot : bool
-		Dacă este True, se aplică One Hot Encoding pentru variabilele categoriale care nu au fost deja codificate cu Label Encoding.
-	label_encoding : dict
-		Dicționar cu perechi {coloană: ordine_valori} ce specifică ordinea dorită pentru codificarea label.
-	max_categorii : int, optional
-		Număr maxim de categorii permis pentru aplicarea One Hot Encoding. Coloanele cu un număr mai mare de categorii vor fi ignorate.
+	Antrenează o etapă a pipeline-ului pe setul de antrenare și o aplică pe acesta.
 
 	Returnează:
 	-----------
-	pd.DataFrame
-		DataFrame-ul rezultat după aplicarea codificărilor. Coloana 'Target' este exclusă din orice codificare.
-	"""
-	df_transformed = df.copy()
-
-	cols_to_encode = [col for col in label_encoding if col != "Target"]
-
-	for col in cols_to_encode:
-		if col in df_transformed.columns:
-			encoder = LabelEncoder()
-			encoder.classes_ = np.array(label_encoding[col])
-			df_transformed[col] = encoder.transform(df_transformed[col])
-
-	if use_one_hot:
-		remaining_categoricals = df_transformed.select_dtypes(include="object").columns.difference(
-			list(label_encoding.keys()) + ["Target"]
-		)
-		cols_one_hot = []
-		for col in remaining_categoricals:
-			if max_categorii is None or df_transformed[col].nunique() <= max_categorii:
-				cols_one_hot.append(col)
-
-		if cols_one_hot:
-			df_transformed = pd.get_dummies(df_transformed, columns=cols_one_hot, drop_first=True)
-
-	return df_transformed
-
-
-def scalare_date(X: pd.DataFrame, metoda_scalare: str) -> pd.DataFrame:
+	tuple:
+		- etapa antrenată
+		- df_train: pd.DataFrame — setul de antrenare transformat.
 	"""
-	Aplică o metodă de scalare numerică asupra coloanelor numerice dintr-un DataFrame.
+	df_train = etapa.fit_transform(df_train)
+	return etapa, df_train
 
-	Parametri:
-	----------
-	X : pd.DataFrame
-		DataFrame-ul de intrare, conținând caracteristicile de scalat.
-	metoda_scalare : str
-		Metoda de scalare aleasă. Opțiuni posibile:
-		- "StandardScaler": scalare standard (medie 0, deviație standard 1)
-		- "MinMaxScaler": scalare între 0 și 1
-		- "RobustScaler": scalare robustă față de outlieri (mediana și IQR)
-		- "Niciuna": nu se aplică nicio scalare
 
-	Returnează:
-	-----------
-	pd.DataFrame
-		DataFrame-ul cu coloanele numerice scalate, restul coloanelor rămân neschimbate.
-	"""
-	if metoda_scalare == "Niciuna":
-		return X
-	if metoda_scalare == "StandardScaler":
-		scaler = StandardScaler()
-	elif metoda_scalare == "MinMaxScaler":
-		scaler = MinMaxScaler()
-	elif metoda_scalare == "RobustScaler":
-		scaler = RobustScaler()
-
-	X = X.copy()
-	coloane_numerice = X.select_dtypes(include=["float64", "int64"]).columns
-	X_scaled = scaler.fit_transform(X[coloane_numerice])
-	X[coloane_numerice] = pd.DataFrame(X_scaled, columns=coloane_numerice, index=X.index)
-	return X
-
-
-def pregatire_date(df: pd.DataFrame, config: dict):
+def pregatire_date(df: pd.DataFrame, config: dict, versiune: str = None):
 	"""
 	Preprocesează un DataFrame pentru antrenarea modelelor de machine learning, conform configurației oferite.
 
 	Pași realizați:
 	---------------
+	- Împarte datele în seturi de antrenare și testare, cu posibilitate de stratificare.
 	- Aplică o strategie de tratare a outlierilor.
 	- Completează valorile lipsă pe baza unei metode specificate.
 	- Codifică variabilele categoriale (Label Encoding / One Hot Encoding).
 	- Scalează datele numerice (Standard, MinMax, Robust, sau niciuna).
-	- Împarte datele în seturi de antrenare și testare, cu posibilitate de stratificare.
 	- Conversie la tip `category` pentru coloanele obiect.
 	- Resetarea indexului pentru toate seturile.
 
+	Fiecare etapă de după împărțire este antrenată doar pe setul de antrenare (vezi `preprocesare_date`)
+	și aplicată cu aceleași statistici pe setul de testare. Etapele antrenate formează un pipeline
+	care poate fi salvat și aplicat ulterior pe date noi.
+
+	Memorarea rezultatelor (vezi `etape_date`):
+	- împărțirea păstrează doar pozițiile rândurilor, sub cheia versiunii datelor și a opțiunilor de împărțire;
+	- etapele antrenate sunt păstrate sub o cheie formată din amprenta rândurilor de antrenare și configurația
+	  etapei și a tuturor etapelor anterioare, iar transformarea setului de testare sub cheia etapei antrenate
+	  și amprenta rândurilor de testare.
+	Schimbarea scalării sau a codificării refolosește etapele anterioare. Schimbarea dimensiunii testului
+	sau a stratificării schimbă rândurile de antrenare, deci reantrenează toate etapele (statisticile depind
+	de aceste rânduri); revenirea la o împărțire deja folosită refolosește etapele ei.
+
 	Parametri:
 	----------
 	df : pd.DataFrame
 		DataFrame-ul original ce conține și coloana 'Target'.
 	config : dict
 		Dicționar cu setările de preprocesare (strategii, codificare, scalare, split etc.).
+	versiune : str, optional
+		Versiunea datelor; implicit, versiunea datelor din session_state.
 
 	Returnează:
 	-----------
@@ -221,32 +108,92 @@ def pregatire_date(df: pd.DataFrame, config: dict):
 		- df_final: pd.DataFrame — datele de antrenare cu 'Target' inclus.
 		- X_train, X_test: pd.DataFrame — caracteristicile separate pentru antrenare și testare.
 		- y_train, y_test: pd.Series — valorile țintă corespunzătoare.
+		- info: dict — "cheie" (cheia rezultatului final), "pipeline" (pipeline-ul antrenat),
+		  "etape_recalculate" și "etape_refolosite" (etapele calculate acum, respectiv citite din cache).
 	"""
-	df = tratare_outlieri_df(df, config["tratare_outlieri"])
-	df = tratare_valori_lipsa_df(df, config["tratare_valori_lipsa"])
-	df = tratare_codificari_df(df, config["codificare_one_hot"], config["codificare_label"])
+	cache = get_cache_etape()
+	etape_recalculate = []
+	etape_refolosite = []
+	versiune = versiune if versiune is not None else get_versiune()
+
+	(pozitii_train, pozitii_test), din_cache = cache.obtinere(
+		cheie_etapa(versiune, "impartire", [config["dimensiune_test"], config["stratificat"]]),
+		lambda: indici_impartire(df, config["dimensiune_test"], config["stratificat"]),
+	)
+	(etape_refolosite if din_cache else etape_recalculate).append("impartire")
+	df_train = df.iloc[pozitii_train]
+	df_test = df.iloc[pozitii_test]
+	amprenta_test = amprenta_randuri(pozitii_test)
+
+	cheie = cheie_etapa(versiune, "antrenare", amprenta_randuri(pozitii_train))
+	etape_antrenate = []
+	for etapa, configuratie, neantrenata in creare_etape(config):
+		cheie = cheie_etapa(cheie, etapa, configuratie)
+		(antrenata, df_train), din_cache = cache.obtinere(
+			cheie, lambda neantrenata=neantrenata, df_train=df_train: antrenare_etapa(neantrenata, df_train)
+		)
+		df_test, _ = cache.obtinere(
+			cheie_etapa(cheie, "testare", amprenta_test),
+			lambda antrenata=antrenata, df_test=df_test: antrenata.transform(df_test),
+		)
+		etape_antrenate.append(antrenata)
+		(etape_refolosite if din_cache else etape_recalculate).append(etapa)
 
-	X = df.drop("Target", axis=1)
-	y = df["Target"]
+	cheie = cheie_etapa(cheie, "testare", amprenta_test)
+	X_train = df_train.drop("Target", axis=1).reset_index(drop=True)
+	X_test = df_test.drop("Target", axis=1).reset_index(drop=True)
+	y_train = df_train["Target"].reset_index(drop=True)
+	y_test = df_test["Target"].reset_index(drop=True)
 
-	X = scalare_date(X, config["metoda_scalare"])
+	df_final = X_train.copy()
+	df_final["Target"] = y_train
 
-	stratify = y if config["stratificat"] else None
-	X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=config["dimensiune_test"], stratify=stratify)
+	info = {
+		"cheie": cheie,
+		"pipeline": PipelinePreprocesare(config, etape_antrenate),
+		"etape_recalculate": etape_recalculate,
+		"etape_refolosite": etape_refolosite,
+	}
+	return df_final, X_train, X_test, y_train, y_test, info
 
-	for col in X_train.select_dtypes(include="object").columns:
-		X_train[col] = X_train[col].astype("category")
-		X_test[col] = X_test[col].astype("category")
 
-	X_train = X_train.reset_index(drop=True)
-	X_test = X_test.reset_index(drop=True)
-	y_train = y_train.reset_index(drop=True)
-	y_test = y_test.reset_index(drop=True)
+def aplicare_pipeline(pipeline: PipelinePreprocesare, fisier) -> tuple:
+	"""
+	Aplică un pipeline antrenat pe un fișier nou, citit și transformat pe bucăți.
 
-	df_final = X_train.copy()
-	df_final["Target"] = y_train
+	Parametri:
+	----------
+	pipeline : PipelinePreprocesare
+		Pipeline-ul antrenat.
+	fisier : file-like
+		Fișierul încărcat (CSV, eventual comprimat, sau Parquet).
 
-	return df_final, X_train, X_test, y_train, y_test
+	Returnează:
+	-----------
+	tuple:
+		- bytes — fișierul CSV cu datele transformate.
+		- pd.DataFrame — primele rânduri transformate, pentru previzualizare.
+		- int — numărul de rânduri transformate.
+	"""
+	format_date, compresie = format_fisier(fisier.name)
+	if format_date == "parquet":
+		bucati = bucati_parquet(fisier, DIMENSIUNE_BUCATA)
+	else:
+		bucati = bucati_csv(fisier, DIMENSIUNE_BUCATA, compresie)
+
+	progres = st.progress(0.0, text="Aplicare pipeline...")
+	iesire = BytesIO()
+	previzualizare = None
+	numar_randuri = 0
+	for transformata, fractiune in pipeline.transformare_pe_bucati(bucati):
+		transformata.to_csv(iesire, index=False, header=previzualizare is None)
+		if previzualizare is None:
+			previzualizare = transformata.head(20)
+		numar_randuri += len(transformata)
+		if fractiune is not None:
+			progres.progress(fractiune, text=f"Aplicare pipeline... {numar_randuri} rânduri")
+	progres.empty()
+	return iesire.getvalue(), previzualizare, numar_randuri
 
 
 if df is not None:
@@ -261,6 +208,15 @@ if df is not None:
 			"Păstrare",
 		],
 	)
+	if tratare_outlieri == "Eliminare rânduri cu outlieri":
+		st.caption("Rândurile sunt eliminate doar din setul de antrenare; setul de testare și datele noi le păstrează pe toate.")
+	with st.expander("Raport outlieri (limite IQR)"):
+		st.dataframe(
+			get_raport_outlieri()["raport"][
+				["limita_inferioara", "limita_superioara", "numar_outlieri", "procent_outlieri", "skew"]
+			],
+			use_container_width=True,
+		)
 
 	st.header("Tratare valori lipsă")
 	st.info(
@@ -286,7 +242,7 @@ if df is not None:
 	use_label_encoding = st.checkbox("Folosire Label Encoding pentru variabilele categoriale ordonate")
 
 	if use_label_encoding:
-		cat_cols = df.select_dtypes(include="object").columns.tolist()
+		cat_cols = coloane_de_tip(get_schema(), "categorială")
 		selected_cols = st.multiselect("Selectează coloanele pentru Label Encoding", options=cat_cols)
 
 		for col in selected_cols:
@@ -312,6 +268,11 @@ if df is not None:
 		value=0.2,
 	)
 	stratificat = st.checkbox("Împărțire stratificată")
+	st.caption(
+		"Etapele sunt antrenate doar pe setul de antrenare: schimbarea dimensiunii testului sau a stratificării "
+		"schimbă rândurile de antrenare și reantrenează toate etapele. Revenirea la o împărțire deja folosită "
+		"și schimbarea celorlalte opțiuni refolosesc rezultatele anterioare."
+	)
 
 	if st.button("Aplicare setări", type="primary"):
 		config = {
@@ -319,18 +280,78 @@ if df is not None:
 			"tratare_valori_lipsa": tratare_valori_lipsa,
 			"codificare_one_hot": use_one_hot,
 			"codificare_label": st.session_state.label_sort_orders,
+			"max_categorii": max_categorii,
 			"metoda_scalare": metoda_scalare,
 			"dimensiune_test": dimensiune_test,
 			"stratificat": stratificat,
 		}
 
-		df_final, X_train, X_test, y_train, y_test = pregatire_date(df, config)
-		st.session_state.seturi_date = {"X_train": X_train, "X_test": X_test, "y_train": y_train, "y_test": y_test}
+		df_final, X_train, X_test, y_train, y_test, info = pregatire_date(df, config)
+		st.session_state.seturi_date = {
+			"X_train": X_train,
+			"X_test": X_test,
+			"y_train": y_train,
+			"y_test": y_test,
+			"versiune": info["cheie"],
+		}
+		st.session_state.pipeline = info["pipeline"]
 
 		st.header("Date finale preprocesate")
+		if not info["etape_refolosite"]:
+			st.caption("Toate etapele au fost calculate.")
+		elif info["etape_recalculate"]:
+			st.caption(f"Etape recalculate: {', '.join(info['etape_recalculate'])}; celelalte au fost refolosite.")
+		else:
+			st.caption("Toate etapele au fost refolosite din rezultatele anterioare.")
 		st.dataframe(df_final.head(20))
 
 		st.session_state.config = config
 
+	if st.session_state.get("pipeline") is not None:
+		st.header("Pipeline de preprocesare")
+		pipeline: PipelinePreprocesare = st.session_state.pipeline
+		st.caption(
+			"Statisticile fiecărei etape (limite de outlieri, valori de completare, categorii, parametrii scalării) "
+			"au fost calculate pe setul de antrenare și sunt salvate împreună cu configurația."
+		)
+		coloana_descarcare, coloana_salvare = st.columns(2)
+		with coloana_descarcare:
+			st.download_button(
+				"Descărcare pipeline (.joblib)",
+				data=pipeline.salvare(),
+				file_name="pipeline_preprocesare.joblib",
+				mime="application/octet-stream",
+			)
+		with coloana_salvare:
+			if st.button("Salvare pipeline pe disc"):
+				cale = DIRECTOR_PIPELINE / f"pipeline_{st.session_state.seturi_date['versiune'][:12]}.joblib"
+				pipeline.salvare(cale)
+				st.success(f"Pipeline salvat în `{cale.relative_to(DIRECTOR_PIPELINE.parent)}`.")
+
+	st.header("Aplicare pipeline pe date noi")
+	surse = (["Pipeline-ul curent"] if st.session_state.get("pipeline") is not None else []) + [
+		cale.name for cale in pipeline_salvate()
+	]
+	if not surse:
+		st.info("Aplică setările de mai sus sau salvează un pipeline pentru a-l putea folosi pe date noi.")
+	else:
+		sursa = st.selectbox("Pipeline folosit", surse)
+		fisier_nou = st.file_uploader("Încarcă datele noi", type=EXTENSII_ACCEPTATE, key="date_noi")
+		if fisier_nou is not None and st.button("Transformare date noi"):
+			if sursa == "Pipeline-ul curent":
+				pipeline_ales = st.session_state.pipeline
+			else:
+				pipeline_ales = PipelinePreprocesare.incarcare(DIRECTOR_PIPELINE / sursa)
+			continut, previzualizare, numar_randuri = aplicare_pipeline(pipeline_ales, fisier_nou)
+			st.success(f"Au fost transformate {numar_randuri} rânduri.")
+			if previzualizare is not None:
+				st.dataframe(previzualizare)
+			st.download_button(
+				"Descărcare date transformate (.csv)",
+				data=continut,
+				file_name="date_transformate.csv",
+				mime="text/csv",
+			)
+
 else:
 	st.warning("Încarcă mai întâi un fișier CSV.")
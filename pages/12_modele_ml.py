@@ -102,8 +102,8 @@ if df is not None and config is not None and seturi_date is not None:
 		CLASE_ORDONATE = ["Dropout", "Enrolled", "Graduate"]
 		label_map = {label: idx for idx, label in enumerate(CLASE_ORDONATE)}
 		inverse_label_map = {idx: label for label, idx in label_map.items()}
-		y_train = y_train.map(label_map)
-		y_test = y_test.map(label_map)
+		y_train = y_train.map(label_map).astype(int)
+		y_test = y_test.map(label_map).astype(int)
 
 		for model_nume in modele_selectate:
 			model = MODELE_DISPONIBILE.get(model_nume)
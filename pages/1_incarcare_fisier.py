@@ -1,7 +1,12 @@
 """
-Încărcare fișier CSV în aplicația Streamlit.
+Încărcare fișier de date în aplicația Streamlit.
 
-- Permite utilizatorului să încarce un fișier `.csv`.
+- Permite utilizatorului să încarce un fișier `.csv`, `.csv.gz`, `.csv.zst`, `.zip` sau `.parquet`.
+- Oferă un mod de citire pe bucăți (streaming), cu progres afișat și limită de memorie configurabilă.
+- Oferă opțional o reprezentare compactă în memorie (categorii, tipuri numerice reduse), cu raport de memorie.
+- Oferă un mod de statistici aproximative, calculate din schițe actualizate în timpul citirii pe bucăți
+  (sau construite o singură dată după citirea completă); schema este citită tot din schițe.
+- Păstrează fișierele deja parsate într-un cache pe disc (Arrow), indexat după hash-ul conținutului.
 - Salvează datele în `st.session_state.df` pentru utilizare ulterioară.
 - Afișează confirmare de succes sau avertisment dacă nu s-a încărcat nimic.
 """
@@ -9,7 +14,18 @@
 import pandas as pd
 import streamlit as st
 
+from cache_date import citire_din_cache, get_hash_continut, salvare_in_cache
+from incarcare_date import (
+	DIMENSIUNE_BUCATA,
+	EXTENSII_ACCEPTATE,
+	LIMITA_MEMORIE_MB,
+	citire_fisier,
+	compactare_df,
+	raport_memorie,
+)
 from nav_bar import nav_bar
+from schema_date import setare_date
+from schite_date import SchiteDate, schite_daca_aproximativ
 
 
 st.set_page_config(page_title="Încărcare fișier", page_icon="📂", layout="wide")
@@ -18,25 +34,118 @@ nav_bar()
 st.title("Încărcare fișier")
 
 
+def afisare_raport_memorie(cheie: str, df: pd.DataFrame):
+	"""
+	Afișează raportul de memorie înainte și după compactarea setului de date.
+
+	Parametri:
+	----------
+	cheie : str
+		Cheia de cache a setului de date afișat.
+	df : pd.DataFrame
+		Setul de date compact.
+
+	Dacă raportul nu a fost calculat în sesiunea curentă (datele provin din cache),
+	se afișează doar memoria ocupată de forma compactă.
+	"""
+	raport = st.session_state.get("raport_memorie")
+	st.subheader("Raport de memorie")
+	if raport is None or raport["cheie"] != cheie:
+		st.metric("Memorie compactă", f"{df.memory_usage(deep=True).sum() / 1024 ** 2:.2f} MB")
+		return
+
+	raport = raport["raport"]
+	memorie_initiala = raport["Memorie inițială (KB)"].sum() / 1024
+	memorie_compacta = raport["Memorie compactă (KB)"].sum() / 1024
+
+	col1, col2, col3 = st.columns(3)
+	col1.metric("Memorie inițială", f"{memorie_initiala:.2f} MB")
+	col2.metric("Memorie compactă", f"{memorie_compacta:.2f} MB")
+	col3.metric("Reducere", f"{memorie_initiala / max(memorie_compacta, 1e-9):.1f}x")
+	st.dataframe(raport, use_container_width=True)
+
+
 def incarcare_fisier():
 	"""
-	Încarcă un fișier CSV în aplicația Streamlit și îl salvează în session_state.
+	Încarcă un fișier de date în aplicația Streamlit și îl salvează în session_state.
 
 	Ce face funcția:
 	----------------
-	- Deschide un selector de fișiere pentru utilizator, acceptând doar fișiere `.csv`.
-	- Dacă fișierul este selectat, acesta este citit cu Pandas și salvat în `st.session_state.df`.
+	- Deschide un selector de fișiere pentru utilizator, acceptând fișiere `.csv`, `.csv.gz`, `.csv.zst`, `.zip` și `.parquet`.
+	- Dacă fișierul este selectat, acesta este citit cu Pandas și salvat în `st.session_state.df`,
+	  împreună cu versiunea datelor și schema lor (`st.session_state.schema`).
+	- Fișierele comprimate sunt decomprimate în flux, iar fișierele Parquet sunt citite direct, fără parsare text.
+	- În modul de citire pe bucăți, fișierul este parcurs în bucăți de dimensiune configurabilă,
+	  cu tipuri compacte pe fiecare bucată, bară de progres și limită de memorie.
+	- Dacă același fișier a mai fost încărcat (același hash al conținutului și același mod de citire),
+	  datele sunt citite din cache-ul de pe disc prin memory-mapping, fără a mai parsa CSV-ul.
+	- În modul compact, coloanele sunt convertite la tipuri compacte și se afișează raportul de memorie.
+	- În modul aproximativ, statisticile descriptive sunt calculate din schițe (`st.session_state.schite`),
+	  construite bucată cu bucată în timpul citirii; paginile afișează și limitele de eroare.
 	- Afișează un mesaj de succes dacă fișierul a fost încărcat cu succes.
 	- În caz contrar, avertizează utilizatorul să încarce un fișier.
 	"""
-	uploaded_file = st.file_uploader("Încarcă un fișier CSV", type=["csv"])
+	uploaded_file = st.file_uploader(
+		"Încarcă un fișier CSV (simplu sau comprimat) ori Parquet", type=EXTENSII_ACCEPTATE
+	)
+
+	citire_pe_bucati = st.checkbox("Citire pe bucăți (pentru fișiere mari)")
+	if citire_pe_bucati:
+		col1, col2 = st.columns(2)
+		dimensiune_bucata = col1.number_input(
+			"Număr de rânduri per bucată", min_value=1_000, value=DIMENSIUNE_BUCATA, step=10_000
+		)
+		limita_memorie_mb = col2.number_input(
+			"Limita de memorie (MB)", min_value=16, value=LIMITA_MEMORIE_MB, step=64
+		)
+	reprezentare_compacta = st.checkbox("Reprezentare compactă în memorie (categorii, tipuri numerice reduse)")
+	st.session_state.mod_aproximativ = st.checkbox(
+		"Statistici aproximative (schițe: quantile, valori distincte, valori frecvente)",
+		value=st.session_state.get("mod_aproximativ", False),
+	)
 
 	if uploaded_file is not None:
-		df = pd.read_csv(uploaded_file)
-		st.session_state.df = df
+		mod_citire = "bucati" if citire_pe_bucati else "complet"
+		if reprezentare_compacta:
+			mod_citire += "-compact"
+		cheie = f"{get_hash_continut(uploaded_file)}-{mod_citire}"
+		df = citire_din_cache(cheie)
+		if df is not None:
+			setare_date(df, cheie, schite_daca_aproximativ(cheie, df))
+			st.success("Datele au fost încărcate din cache!")
+			if reprezentare_compacta:
+				afisare_raport_memorie(cheie, df)
+			return
+
+		schite = SchiteDate() if citire_pe_bucati and st.session_state.mod_aproximativ else None
+		if citire_pe_bucati:
+			bara_progres = st.progress(0.0, text="Citire fișier...")
+
+			def progres(fractiune, nr_randuri):
+				bara_progres.progress(fractiune or 0.0, text=f"Citire fișier... {nr_randuri:,} rânduri")
+
+		try:
+			if citire_pe_bucati:
+				df = citire_fisier(uploaded_file, True, int(dimensiune_bucata), limita_memorie_mb, progres, schite)
+			else:
+				df = citire_fisier(uploaded_file)
+		except (MemoryError, ImportError, ValueError, TypeError) as e:
+			st.error(str(e))
+			return
+		finally:
+			if citire_pe_bucati:
+				bara_progres.empty()
+		if reprezentare_compacta:
+			df_compact = compactare_df(df)
+			st.session_state.raport_memorie = {"cheie": cheie, "raport": raport_memorie(df, df_compact)}
+			df = df_compact
+		salvare_in_cache(df, cheie)
+		setare_date(df, cheie, schite if schite is not None else schite_daca_aproximativ(cheie, df))
 		st.success("Datele au fost citite cu succes!")
+		if reprezentare_compacta:
+			afisare_raport_memorie(cheie, df)
 	else:
-		st.warning("Încarcă un fișier CSV.")
+		st.warning("Încarcă un fișier de date.")
 
 
 incarcare_fisier()
@@ -1,7 +1,8 @@
 """
 Vizualizare date în aplicația Streamlit.
 
-- Afișează un număr selectabil de rânduri din datele încărcate.
+- Afișează datele paginat: doar rândurile din pagina curentă sunt trimise către browser.
+- Permite filtrarea după clasele din "Target" și sortarea după orice coloană, calculate pe server.
 - Aplică stilizare condiționată pe baza valorilor din coloana "Target":
 	- Graduate → verde
 	- Enrolled → albastru
@@ -10,11 +11,15 @@ Vizualizare date în aplicația Streamlit.
 - Utilizează librăria `streamlit_theme` pentru a identifica tema curentă.
 """
 
+import math
+
+import numpy as np
 import pandas as pd
 import streamlit as st
 from streamlit_theme import st_theme
 
 from nav_bar import nav_bar
+from schema_date import get_versiune
 
 
 st.set_page_config(page_title="Vizualizare date", page_icon="🔍", layout="wide")
@@ -23,43 +28,110 @@ nav_bar()
 st.title("Vizualizare date")
 df: pd.DataFrame = st.session_state.get("df", default=None)
 
-def colorare_randuri(rand):
+CULORI_LIGHT = {
+	"Graduate": "#ccffcc",
+	"Enrolled": "#cce5ff",
+	"Dropout": "#ffcccc"
+}
+CULORI_DARK = {
+	"Graduate": "#2e7d32",
+	"Enrolled": "#1565c0",
+	"Dropout": "#b71c1c"
+}
+FARA_SORTARE = "(fără sortare)"
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def ordine_randuri(versiune: str, _df: pd.DataFrame, coloana_sortare: str, crescator: bool, clase: tuple) -> np.ndarray:
+	"""
+	Calculează pe server pozițiile rândurilor după filtrarea pe clasele din 'Target' și sortare.
+
+	Parametri:
+	----------
+	versiune : str
+		Versiunea datelor, folosită drept cheie de cache (`_df` nu este inclus în cheie).
+	_df : pd.DataFrame
+		Setul de date complet.
+	coloana_sortare : str or None
+		Coloana după care se sortează; None păstrează ordinea inițială.
+	crescator : bool
+		Direcția sortării.
+	clase : tuple of str
+		Clasele din 'Target' păstrate; un tuplu gol înseamnă fără filtrare.
+
+	Returnează:
+	-----------
+	np.ndarray
+		Pozițiile (pentru `iloc`) rândurilor rezultate, în ordinea afișării.
+	"""
+	pozitii = np.arange(len(_df))
+	if clase:
+		pozitii = pozitii[_df["Target"].isin(clase).to_numpy()]
+	if coloana_sortare is not None:
+		valori = _df[coloana_sortare].iloc[pozitii].reset_index(drop=True)
+		ordine = valori.sort_values(ascending=crescator, kind="stable", na_position="last").index.to_numpy()
+		pozitii = pozitii[ordine]
+	return pozitii
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def clase_tinta(versiune: str, _df: pd.DataFrame) -> list:
+	"""
+	Returnează clasele distincte din coloana 'Target', calculate o singură dată per versiune a datelor.
+	"""
+	return sorted(_df["Target"].dropna().astype(str).unique().tolist())
+
+
+def colorare_randuri(fereastra: pd.DataFrame) -> pd.DataFrame:
 	"""
-	Aplică stilizare condiționată pentru un rând dintr-un DataFrame, în funcție de valoarea din coloana 'Target'.
+	Calculează vectorizat stilizarea condiționată pentru rândurile afișate, în funcție de valoarea din coloana 'Target'.
 
 	Parametri:
 	----------
-	rand : pd.Series
-	    Rândul din DataFrame care va fi stilizat.
+	fereastra : pd.DataFrame
+	    Rândurile din pagina curentă care vor fi stilizate.
 
 	Returnează:
 	-----------
-	list of str
-	    O listă de stiluri CSS aplicabile fiecărei celule din rând, colorate în funcție de valoarea 'Target' și de tema activă (light/dark):
+	pd.DataFrame
+	    Un DataFrame de aceeași formă cu stiluri CSS, în care fiecare rând primește culoarea clasei sale
+	    'Target' și a temei active (light/dark):
 	    - Graduate → verde
 	    - Enrolled → albastru
 	    - Dropout → roșu
 	"""
-	if theme == "light":
-		culori = {
-			"Graduate": "#ccffcc",
-			"Enrolled": "#cce5ff",
-			"Dropout": "#ffcccc"
-		}
+	culori = CULORI_LIGHT if theme == "light" else CULORI_DARK
+	if "Target" in fereastra.columns:
+		culoare_rand = fereastra["Target"].astype(object).map(culori).fillna("white")
 	else:
-		culori = {
-			"Graduate": "#2e7d32",
-			"Enrolled": "#1565c0",
-			"Dropout": "#b71c1c"
-		}
-	color = culori.get(rand["Target"], "white")
-	return [f"background-color: {color}; color: white"
-			if theme == "Dark"
-			else f"background-color: {color}"] * len(rand)
+		culoare_rand = pd.Series("white", index=fereastra.index)
+	stil_rand = "background-color: " + culoare_rand
+	if theme == "Dark":
+		stil_rand = stil_rand + "; color: white"
+	stiluri = np.repeat(stil_rand.to_numpy()[:, None], fereastra.shape[1], axis=1)
+	return pd.DataFrame(stiluri, index=fereastra.index, columns=fereastra.columns)
 
 
 if df is not None:
-	nr_randuri = st.slider("Alegeți câte rânduri doriți să vedeți", 1, df.shape[0], 5)
+	col1, col2, col3 = st.columns(3)
+	clase = ()
+	if "Target" in df.columns:
+		clase = tuple(col1.multiselect("Filtrare după Target", clase_tinta(get_versiune(), df)))
+	coloana_sortare = col2.selectbox("Sortare după", [FARA_SORTARE] + df.columns.tolist())
+	crescator = col3.radio("Ordine", ["Crescătoare", "Descrescătoare"], horizontal=True) == "Crescătoare"
+	if coloana_sortare == FARA_SORTARE:
+		coloana_sortare = None
+
+	pozitii = ordine_randuri(get_versiune(), df, coloana_sortare, crescator, clase)
+
+	col4, col5 = st.columns(2)
+	randuri_pe_pagina = col4.selectbox("Rânduri pe pagină", [10, 25, 50, 100, 250], index=0)
+	nr_pagini = max(1, math.ceil(len(pozitii) / randuri_pe_pagina))
+	pagina = col5.number_input(f"Pagina (din {nr_pagini})", min_value=1, max_value=nr_pagini, value=1)
+
+	inceput = (pagina - 1) * randuri_pe_pagina
+	sfarsit = min(inceput + randuri_pe_pagina, len(pozitii))
+	fereastra = df.iloc[pozitii[inceput:sfarsit]]
 
 	theme = None
 	st_theme_object = st_theme()
@@ -67,7 +139,8 @@ if df is not None:
 		theme = st_theme_object["base"]
 
 	if theme is not None:
-		df_styled = df.head(nr_randuri).style.apply(colorare_randuri, axis=1)
-		st.write(df_styled)
+		df_styled = fereastra.style.apply(colorare_randuri, axis=None)
+		st.dataframe(df_styled, use_container_width=True)
+		st.caption(f"Rândurile {inceput + 1 if sfarsit else 0}–{sfarsit} din {len(pozitii)}")
 else:
 	st.warning("Încarcă mai întâi un fișier CSV.")
@@ -3,53 +3,31 @@ Descriere detaliată a coloanelor din setul de date.
 
 - Permite selecția unei coloane pentru analiză.
 - Afișează o descriere predefinită pentru fiecare coloană (dacă există).
-- Detectează automat tipul variabilei: numerică, booleană sau categorială.
+- Preia tipul variabilei (numerică, booleană sau categorială) din schema calculată la încărcarea datelor.
 - Afișează statistici specifice în funcție de tipul detectat:
 	- Booleane: număr și procent de valori `True`
 	- Numerice: min, max, medie, mediană, deviație standard, quartile
-	- Categoriale: număr de valori unice, cele mai frecvente valori
+	- Categoriale: număr de valori unice, cele mai frecvente valori și distribuția lor pe clasele `Target`
+- Statisticile sunt citite din profilul datelor, calculat o singură dată per versiune a setului de date.
+- Valorile frecvente sunt citite din cubul de contingență categorie × `Target`.
+- În modul aproximativ, statisticile provin din schițe și sunt afișate împreună cu limitele de eroare.
 - Suportă afișare stilizată pentru o experiență intuitivă în Streamlit.
 """
 
 import pandas as pd
 import streamlit as st
 
+from contingenta_date import frecvente_din_cub, get_cub
 from nav_bar import nav_bar
+from profil_date import get_profil
+from schema_date import get_schema
 
 
 st.set_page_config(page_title="Descriere date", page_icon="🍎", layout="wide")
 nav_bar()
 st.title("Descriere date")
 df: pd.DataFrame = st.session_state.get("df", default=None)
-
-
-def get_tip_variabila(col):
-	"""
-	Determină tipul unei variabile (coloană) dintr-un DataFrame Pandas.
-
-	Parametri:
-	----------
-	col : pd.Series
-		Coloana a cărei tip logic se dorește determinat.
-
-	Returnează:
-	-----------
-	str
-		Tipul variabilei, ca șir de caractere:
-		- "booleană" pentru coloane de tip bool
-		- "numerică" pentru coloane numerice (int, float)
-		- "categorială" pentru tipuri obiect sau categorice
-		- "-" dacă tipul nu se încadrează în cele de mai sus
-	"""
-	match True:
-		case _ if pd.api.types.is_bool_dtype(col):
-			return "booleană"
-		case _ if pd.api.types.is_numeric_dtype(col):
-			return "numerică"
-		case _ if isinstance(col.dtype, pd.CategoricalDtype) or pd.api.types.is_object_dtype(col):
-			return "categorială"
-		case _:
-			return "-"
+schema: pd.DataFrame = get_schema()
 
 
 descrieri_coloane = {
@@ -94,26 +72,67 @@ descrieri_coloane = {
 
 if df is not None:
 	coloana_selectata = st.selectbox("Alege o coloană", df.columns)
-	col_data = df[coloana_selectata]
+	profil = get_profil()
 	st.subheader(f"{coloana_selectata}")
 	st.markdown("🍎 :red-background[**Descriere**] -> " + descrieri_coloane[coloana_selectata])
-	tip = get_tip_variabila(col_data)
+	info_coloana = schema.loc[coloana_selectata]
+	tip = info_coloana["tip"]
 	st.markdown(f"🔮 :violet-background[**Tip**] -> Variabilă {tip}")
+	utilizari = []
+	if info_coloana["tinta"]:
+		utilizari.append("variabilă țintă")
+	if info_coloana["caracteristica"]:
+		utilizari.append("variabilă explicativă")
+	utilizare = ", ".join(utilizari) if utilizari else "nerecomandată pentru modelare"
+	st.markdown(f"🎯 :green-background[**Utilizare**] -> {utilizare}")
+	if info_coloana["valori_lipsa"] > 0:
+		st.markdown(f"🚨 :red-background[**Valori lipsă**] -> {info_coloana['valori_lipsa']}")
 
 	if tip == "booleană":
-		st.write("✅ :green-background[**Număr valori True**] -> ", col_data.sum())
-		st.write("⭐ :orange-background[**Procent valori True**] -> ", round(100 * col_data.mean(), 2), "`%`")
+		booleene = profil["booleene"]
+		st.write("✅ :green-background[**Număr valori True**] -> ", booleene.at[coloana_selectata, "numar_true"])
+		st.write(
+			"⭐ :orange-background[**Procent valori True**] -> ",
+			round(booleene.at[coloana_selectata, "procent_true"], 2),
+			"`%`",
+		)
 	elif tip == "numerică":
-		st.write("⬇️ :blue-background[**Valoarea minimă**] -> ", round(col_data.min(), 2))
-		st.write("⬆️ :blue-background[**Valoarea maximă**] -> ", round(col_data.max(), 2))
-		st.write("🌻 :orange-background[**Media**] -> ", round(col_data.mean(), 2))
-		st.write("📏 :orange-background[**Deviația standard**] -> ", round(col_data.std(), 2))
-		st.write("📐 :orange-background[**Mediana**] -> ", round(col_data.median(), 2))
+		statistici = profil["numerice"].loc[coloana_selectata]
+		st.write("⬇️ :blue-background[**Valoarea minimă**] -> ", round(statistici["min"], 2))
+		st.write("⬆️ :blue-background[**Valoarea maximă**] -> ", round(statistici["max"], 2))
+		st.write("🌻 :orange-background[**Media**] -> ", round(statistici["media"], 2))
+		st.write("📏 :orange-background[**Deviația standard**] -> ", round(statistici["std"], 2))
+		st.write("📐 :orange-background[**Mediana**] -> ", round(statistici["mediana"], 2))
 		st.write("📊 :rainbow-background[**Quartile**]")
-		st.dataframe(col_data.quantile([0.25, 0.5, 0.75]), use_container_width=False)
+		quartile = pd.Series(
+			statistici[["q25", "mediana", "q75"]].to_numpy(), index=[0.25, 0.5, 0.75], name=coloana_selectata
+		)
+		st.dataframe(quartile, use_container_width=False)
+		if "eroare_rang" in statistici:
+			st.caption(
+				f"Mediana și quartilele sunt aproximative: eroare de rang de cel mult "
+				f"±{100 * statistici['eroare_rang']:.2f}% (cu probabilitate de 99%)."
+			)
 	elif tip == "categorială":
-		st.write("🌺 :rainbow-background[**Număr de valori unice**] -> ", col_data.nunique())
+		if "distincte" in profil:
+			estimare, eroare = profil["distincte"][coloana_selectata]
+			st.write(
+				"🌺 :rainbow-background[**Număr de valori unice**] -> ",
+				f"≈ {estimare:,.0f} (±{100 * eroare:.1f}%)",
+			)
+		else:
+			st.write("🌺 :rainbow-background[**Număr de valori unice**] -> ", info_coloana["cardinalitate"])
 		st.write("🏆 :orange-background[**Cele mai frecvente valori**]")
-		st.dataframe(col_data.value_counts().head(5), use_container_width=False)
+		if "eroare_frecvente" in profil:
+			st.dataframe(profil["frecvente"][coloana_selectata].head(5), use_container_width=False)
+		else:
+			tabel = get_cub()[coloana_selectata]
+			frecvente = frecvente_din_cub(tabel).head(5)
+			st.dataframe(pd.concat([frecvente, tabel.loc[frecvente.index]], axis=1), use_container_width=False)
+		if profil.get("eroare_frecvente", {}).get(coloana_selectata, 0) > 0:
+			st.caption(
+				f"Numărările sunt aproximative: valoarea reală poate fi mai mare cu cel mult "
+				f"{profil['eroare_frecvente'][coloana_selectata]:,}."
+			)
 else:
 	st.warning("Încarcă mai întâi un fișier CSV.")
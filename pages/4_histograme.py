@@ -9,6 +9,12 @@ Analiză vizuală și interpretativă a distribuției unei variabile numerice.
 	- Identificarea potențialilor outlieri
 	- Detectarea caracterului uniform sau multimodal al distribuției
 - Numărul de binuri este configurabil din interfața Streamlit.
+- Histograma afișată este obținută prin regruparea unei histograme de bază fine, calculată o singură dată
+  per versiune și coloană, astfel încât schimbarea numărului de binuri nu mai parcurge datele.
+- Statisticile descriptive sunt citite din profilul datelor, calculat o singură dată per versiune.
+- În modul aproximativ, histograma de bază este estimată din schița KLL a coloanei.
+- Distribuția poate fi comparată pe clasele `Target` (sau ale altei variabile categoriale), cu histogramele
+  claselor suprapuse, citite din distribuțiile pe clase calculate o singură dată per versiune.
 """
 
 import numpy as np
@@ -16,7 +22,10 @@ import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 
+from grupuri_date import coloane_grupare, get_distributii
 from nav_bar import nav_bar
+from profil_date import get_histograma, rebucketare
+from schema_date import coloane_de_tip, get_schema
 
 
 st.set_page_config(page_title="Histograme", page_icon="📊", layout="wide")
@@ -26,23 +35,23 @@ st.title("Histograme pentru variabilele numerice")
 df: pd.DataFrame = st.session_state.get("df", default=None)
 
 
-def histograma_si_interpretare(df: pd.DataFrame, coloana: str, num_bins: int):
+def histograma_si_interpretare(coloana: str, num_bins: int, histograma: dict):
 	"""
 	Generează o histogramă și oferă o interpretare statistică pentru o coloană numerică.
 
 	Parametri:
 	----------
-	df : pd.DataFrame
-		Setul de date care conține coloana de analizat.
 	coloana : str
 		Numele coloanei numerice pentru care se va crea histograma.
 	num_bins : int
 		Numărul de binuri (intervale) folosite pentru histograma.
+	histograma : dict
+		Histograma de bază a coloanei și statisticile ei din profil (vezi `profil_date.get_histograma`).
 
 	Ce face funcția:
 	----------------
-	1. Calculează histograma folosind NumPy și o afișează cu Plotly.
-	2. Determină statistici descriptive: medie, mediană, deviație standard, skewness, etc.
+	1. Regrupează histograma de bază în `num_bins` binuri și o afișează cu Plotly.
+	2. Preia statisticile descriptive din profil: medie, mediană, deviație standard, skewness, etc.
 	3. Evaluează forma distribuției (simetrică, skewed), dispersia și prezența outlierilor.
 	4. Afișează interpretarea textuală a acestor caracteristici în interfața Streamlit.
 
@@ -52,10 +61,10 @@ def histograma_si_interpretare(df: pd.DataFrame, coloana: str, num_bins: int):
 	- Interpretare textuală a formei și caracteristicilor distribuției
 	"""
 
-	serie = df[coloana].dropna()
+	statistici = histograma["statistici"]
 
-	# 1. Histograma (NumPy)
-	counts, bin_edges = np.histogram(serie, bins=num_bins)
+	# 1. Histograma (regrupare din histograma de bază)
+	counts, bin_edges = rebucketare(histograma["numarari"], histograma["margini"], num_bins)
 	bin_centers = (bin_edges[:-1] + bin_edges[1:]) / 2
 
 	# 2. Plot (Plotly)
@@ -73,14 +82,19 @@ def histograma_si_interpretare(df: pd.DataFrame, coloana: str, num_bins: int):
 		yaxis_title="Frecvență"
 	)
 	st.plotly_chart(fig, use_container_width=True)
+	if "eroare_rang" in statistici:
+		st.caption(
+			f"Histogramă aproximativă: numărul de observații din fiecare bin are o eroare de cel mult "
+			f"±{2 * statistici['eroare_rang'] * statistici['numar']:,.0f}."
+		)
 
 	# 3. Interpretare
-	skewness = serie.skew()
-	media = serie.mean()
-	mediana = serie.median()
-	std = serie.std()
-	minim = serie.min()
-	maxim = serie.max()
+	skewness = statistici["skew"]
+	media = statistici["media"]
+	mediana = statistici["mediana"]
+	std = statistici["std"]
+	minim = statistici["min"]
+	maxim = statistici["max"]
 	mod_bin = bin_centers[np.argmax(counts)]
 	max_count = counts.max()
 
@@ -131,10 +145,56 @@ def histograma_si_interpretare(df: pd.DataFrame, coloana: str, num_bins: int):
 		st.markdown(f"{outlieri}")
 
 
+def histograme_pe_clase(coloana: str, num_bins: int, distributii: dict, normalizare: bool):
+	"""
+	Suprapune histogramele unei coloane numerice pentru fiecare clasă a variabilei de grupare.
+
+	Parametri:
+	----------
+	coloana : str
+		Numele coloanei numerice.
+	num_bins : int
+		Numărul de binuri (intervale) folosite pentru histograme.
+	distributii : dict
+		Distribuțiile pe clase (vezi `grupuri_date.get_distributii`).
+	normalizare : bool
+		Dacă este True, frecvențele sunt afișate ca procent din numărul de observații al fiecărei clase.
+
+	Afișare:
+	--------
+	- Grafic Plotly cu câte o histogramă semi-transparentă pentru fiecare clasă
+	- Tabel cu numărul de observații, media, mediana, deviația standard și skewness-ul fiecărei clase
+	"""
+	statistici = distributii["statistici"][coloana]
+	coloana_grupare = statistici.index.name
+
+	fig = go.Figure()
+	for grup, numarari_baza in zip(distributii["grupuri"], distributii["histograme"][coloana]):
+		counts, bin_edges = rebucketare(numarari_baza, distributii["margini"][coloana], num_bins)
+		if normalizare:
+			counts = 100 * counts / max(counts.sum(), 1)
+		fig.add_trace(go.Bar(x=(bin_edges[:-1] + bin_edges[1:]) / 2, y=counts, name=str(grup), opacity=0.6))
+	fig.update_layout(
+		title=f"Histograma pentru `{coloana}` pe clasele `{coloana_grupare}`",
+		xaxis_title=coloana,
+		yaxis_title="Procent din clasă" if normalizare else "Frecvență",
+		barmode="overlay",
+	)
+	st.plotly_chart(fig, use_container_width=True)
+	st.dataframe(statistici[["numar", "media", "mediana", "std", "skew"]], use_container_width=True)
+
+
 if df is not None:
-	coloane_numerice = df.select_dtypes(include=['int64', 'float64']).columns
+	coloane_numerice = coloane_de_tip(get_schema(), "numerică")
 	coloana = st.selectbox("Alege o coloana numerica", coloane_numerice)
 	num_bins = st.slider(f"Alege numărul de binuri", min_value=5, max_value=30, value=15)
-	histograma_si_interpretare(df, coloana, num_bins)
+	coloana_grupare = st.selectbox(
+		"Compară distribuția pe clasele variabilei", ["(fără comparație)"] + coloane_grupare(get_schema())
+	)
+	histograma_si_interpretare(coloana, num_bins, get_histograma(coloana))
+	if coloana_grupare != "(fără comparație)":
+		st.markdown(f"### Comparație pe clasele `{coloana_grupare}`")
+		normalizare = st.checkbox("Frecvențe relative (procent din fiecare clasă)", value=True)
+		histograme_pe_clase(coloana, num_bins, get_distributii(coloana_grupare), normalizare)
 else:
 	st.warning("Încarcă mai întâi un fișier CSV.")
@@ -3,14 +3,28 @@ Vizualizare interactivă a unui boxplot pentru o variabilă numerică.
 
 Utilizatorul selectează o coloană, iar aplicația afișează distribuția și detectează outlieri.
 
-Include interpretare bazată pe skewness, medie, mediană și IQR.
+Include interpretare bazată pe skewness, medie, mediană și IQR, citite din profilul datelor calculat o singură dată per versiune.
+În modul aproximativ, pagina nu parcurge coloana: numărul de outlieri este estimat din schița KLL, cu limita
+de eroare afișată, iar mustățile și outlierii afișați provin din valorile păstrate de schiță.
+
+Boxplot-ul este construit din statisticile deja calculate (quartile, mediană, medie, mustăți) și din
+outlieri, eșantionați peste `MAX_OUTLIERI_AFISATI`, fără a trimite coloana întreagă către browser.
+Limitele și numărul de outlieri sunt citite din raportul de outlieri, calculat o singură dată per versiune.
+Boxplot-urile pot fi comparate pe clasele `Target` (sau ale altei variabile categoriale), din distribuțiile
+pe clase calculate o singură dată per versiune.
 """
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
 
+from grupuri_date import coloane_grupare, get_distributii
 from nav_bar import nav_bar
+from outlieri_date import get_raport_outlieri, masca_coloana
+from profil_date import get_profil
+from schite_date import get_schite
+from schema_date import coloane_de_tip, get_schema
 
 
 st.set_page_config(page_title="Box plots", page_icon="📦", layout="wide")
@@ -19,7 +33,21 @@ nav_bar()
 st.title("Box plots pentru variabilele numerice")
 df: pd.DataFrame = st.session_state.get("df", default=None)
 
-def boxplot_si_intepretare(df: pd.DataFrame, coloana: str):
+MAX_OUTLIERI_AFISATI = 1000
+
+
+def esantionare_outlieri(outlieri: np.ndarray, maxim: int = MAX_OUTLIERI_AFISATI, seed: int = 0) -> np.ndarray:
+	"""
+	Returnează cel mult `maxim` outlieri pentru afișare, păstrând întotdeauna valorile extreme.
+	"""
+	if len(outlieri) <= maxim:
+		return outlieri
+	rng = np.random.default_rng(seed)
+	esantion = rng.choice(outlieri, size=maxim - 2, replace=False)
+	return np.concatenate([[outlieri.min(), outlieri.max()], esantion])
+
+
+def boxplot_si_intepretare(df: pd.DataFrame, coloana: str, statistici: pd.Series, raport_outlieri: dict):
 	"""
 	Generează un boxplot interactiv și oferă interpretări statistice pentru o variabilă numerică.
 
@@ -29,46 +57,96 @@ def boxplot_si_intepretare(df: pd.DataFrame, coloana: str):
 		DataFrame-ul ce conține coloana analizată.
 	coloana : str
 		Numele coloanei numerice pentru care se generează boxplot-ul și interpretarea.
+	statistici : pd.Series
+		Statisticile coloanei din profilul datelor (mediană, medie, quartile, skewness).
+	raport_outlieri : dict or None
+		Raportul de outlieri al setului de date (vezi `outlieri_date.get_raport_outlieri`);
+		None în modul aproximativ, când valorile sunt citite din schița KLL a coloanei.
 
 	Ce face funcția:
 	----------------
-	- Creează un boxplot interactiv folosind Plotly, care afișează și media.
-	- Calculează și afișează statisticile esențiale:
+	- Creează un boxplot interactiv folosind Plotly, care afișează și media, din statisticile precalculate:
+	  se trimit către browser doar quartilele, mustățile și outlierii (eșantionați peste `MAX_OUTLIERI_AFISATI`).
+	- Preia din profil și afișează statisticile esențiale:
 		- Mediana, media, quartilele Q1 și Q3
 		- IQR (Interquartile Range)
 		- Numărul de outlieri (valori în afara intervalului [Q1 - 1.5*IQR, Q3 + 1.5*IQR])
 		- Forma distribuției estimată din skewness (simetrică, skewed stânga/dreapta)
 	- Afișează toate informațiile în interfața Streamlit cu marcaje vizuale colorate.
 	"""
-	serie = df[coloana].dropna()
-	mediana = serie.median()
-	media = serie.mean()
-	q1 = serie.quantile(0.25)
-	q3 = serie.quantile(0.75)
+	mediana = statistici["mediana"]
+	media = statistici["media"]
+	q1 = statistici["q25"]
+	q3 = statistici["q75"]
 	iqr = q3 - q1
-	minim = serie.min()
-	maxim = serie.max()
-	skew = serie.skew()
+	skew = statistici["skew"]
+
+	# Outlieri: sub Q1 - 1.5*IQR sau peste Q3 + 1.5*IQR
+	if "eroare_rang" in statistici:
+		# Modul aproximativ: valorile păstrate de schița KLL (toate valorile, dacă nu a avut loc nicio compactare)
+		kll = get_schite().coloane[coloana]["quantile"]
+		valori, _ = kll.elemente_ponderate()
+		lower_bound = q1 - 1.5 * iqr
+		upper_bound = q3 + 1.5 * iqr
+		este_outlier = (valori < lower_bound) | (valori > upper_bound)
+	else:
+		valori = df[coloana].to_numpy(dtype=np.float64, na_value=np.nan)
+		lower_bound, upper_bound = raport_outlieri["raport"].loc[coloana, ["limita_inferioara", "limita_superioara"]]
+		este_outlier = masca_coloana(raport_outlieri, coloana)
+	outlieri = valori[este_outlier]
+	# Mustățile se opresc la cea mai mică / mare valoare din interiorul limitelor
+	interior = valori[~este_outlier & ~np.isnan(valori)]
+	mustata_jos = interior.min() if len(interior) else lower_bound
+	mustata_sus = interior.max() if len(interior) else upper_bound
+	if "eroare_rang" in statistici:
+		# Minimul și maximul exacte (din momente) înlocuiesc mustățile când se află în interiorul limitelor
+		if statistici["min"] >= lower_bound:
+			mustata_jos = statistici["min"]
+		if statistici["max"] <= upper_bound:
+			mustata_sus = statistici["max"]
+	outlieri_afisati = esantionare_outlieri(outlieri)
 
 	fig = go.Figure()
 	fig.add_trace(
 		go.Box(
-			y=df[coloana],
+			x=[coloana],
+			q1=[q1],
+			median=[mediana],
+			q3=[q3],
+			lowerfence=[mustata_jos],
+			upperfence=[mustata_sus],
+			mean=[media],
 			name=coloana,
 			boxmean=True,
+			boxpoints=False,
 			marker=dict(color="royalblue"),
 		)
 	)
+	fig.add_trace(
+		go.Scatter(
+			x=[coloana] * len(outlieri_afisati),
+			y=outlieri_afisati,
+			mode="markers",
+			name="Outlieri",
+			marker=dict(color="royalblue", symbol="circle-open"),
+		)
+	)
 	fig.update_layout(
 		title=f"📦 Box Plot pentru `{coloana}`",
 		yaxis_title=coloana,
+		showlegend=False,
 	)
 	st.plotly_chart(fig, use_container_width=True)
-
-	# Outlieri: sub Q1 - 1.5*IQR sau peste Q3 + 1.5*IQR
-	lower_bound = q1 - 1.5 * iqr
-	upper_bound = q3 + 1.5 * iqr
-	outlieri = serie[(serie < lower_bound) | (serie > upper_bound)]
+	if "eroare_rang" in statistici and statistici["eroare_rang"] > 0:
+		st.caption("Outlierii afișați sunt valorile păstrate de schița KLL (un eșantion ponderat al coloanei).")
+	elif len(outlieri_afisati) < len(outlieri):
+		st.caption(f"Sunt afișați {len(outlieri_afisati)} din {len(outlieri)} outlieri (eșantion aleator, cu valorile extreme).")
+	if "eroare_rang" in statistici:
+		# Modul aproximativ: fracțiunea de valori din afara intervalului, estimată din schița KLL
+		fractiune = kll.rang(lower_bound, strict=True) + 1 - kll.rang(upper_bound)
+		numar_outlieri = f"≈ {statistici['numar'] * fractiune:,.0f} (±{2 * statistici['eroare_rang'] * statistici['numar']:,.0f})"
+	else:
+		numar_outlieri = raport_outlieri["raport"].at[coloana, "numar_outlieri"]
 
 	# Forma distribuției
 	if -0.5 < skew < 0.5:
@@ -87,13 +165,66 @@ def boxplot_si_intepretare(df: pd.DataFrame, coloana: str):
 	st.markdown(f":violet-background[**Media:**] {media:.2f}")
 	st.markdown(f":blue-background[**Quartile:**] Q1 = {q1:.2f}, Q3 = {q3:.2f}")
 	st.markdown(f":orange-background[**IQR (Interquartile Range):**] {iqr:.2f}")
-	st.markdown(f":red-background[**Outlieri detectați:**] {len(outlieri)} observații")
+	st.markdown(f":red-background[**Outlieri detectați:**] {numar_outlieri} observații")
 	st.markdown(f":{culoare}-background[**Forma distribuției:**] {forma}")
 
 
+def boxplot_pe_clase(coloana: str, distributii: dict):
+	"""
+	Afișează câte un boxplot pentru fiecare clasă a variabilei de grupare, din statisticile precalculate.
+
+	Parametri:
+	----------
+	coloana : str
+		Numele coloanei numerice.
+	distributii : dict
+		Distribuțiile pe clase (vezi `grupuri_date.get_distributii`).
+
+	Afișare:
+	--------
+	- Grafic Plotly cu boxplot-urile claselor (quartile, mediană, medie, mustăți), fără puncte individuale
+	- Tabel cu mediana, media, quartilele și numărul de outlieri al fiecărei clase
+	"""
+	statistici = distributii["statistici"][coloana]
+	coloana_grupare = statistici.index.name
+
+	fig = go.Figure()
+	for grup, rand in statistici.iterrows():
+		fig.add_trace(
+			go.Box(
+				x=[str(grup)],
+				q1=[rand["q25"]],
+				median=[rand["mediana"]],
+				q3=[rand["q75"]],
+				lowerfence=[rand["mustata_jos"]],
+				upperfence=[rand["mustata_sus"]],
+				mean=[rand["media"]],
+				name=str(grup),
+				boxmean=True,
+				boxpoints=False,
+			)
+		)
+	fig.update_layout(
+		title=f"📦 Box Plot pentru `{coloana}` pe clasele `{coloana_grupare}`",
+		xaxis_title=coloana_grupare,
+		yaxis_title=coloana,
+	)
+	st.plotly_chart(fig, use_container_width=True)
+	st.dataframe(statistici[["numar", "mediana", "media", "q25", "q75", "numar_outlieri"]], use_container_width=True)
+
+
 if df is not None:
-	coloane_numerice = df.select_dtypes(include=['int64', 'float64']).columns
+	coloane_numerice = coloane_de_tip(get_schema(), "numerică")
 	coloana = st.selectbox("Alege o coloana", coloane_numerice)
-	boxplot_si_intepretare(df, coloana)
+	coloana_grupare = st.selectbox(
+		"Compară distribuția pe clasele variabilei", ["(fără comparație)"] + coloane_grupare(get_schema())
+	)
+	aproximativ = st.session_state.get("mod_aproximativ", False)
+	boxplot_si_intepretare(
+		df, coloana, get_profil()["numerice"].loc[coloana], None if aproximativ else get_raport_outlieri()
+	)
+	if coloana_grupare != "(fără comparație)":
+		st.header(f"Comparație pe clasele `{coloana_grupare}`")
+		boxplot_pe_clase(coloana, get_distributii(coloana_grupare))
 else:
 	st.warning("Încarcă mai întâi un fișier CSV.")
@@ -4,13 +4,18 @@ Afișează un pie chart pentru o variabilă categorială selectată din setul de
 Permite interpretarea distribuției: categorie dominantă, echilibru, valori rare.
 
 Util pentru înțelegerea variabilelor categoriale într-un mod vizual.
+
+Diagrama este construită din cubul de contingență categorie × `Target`, calculat o singură dată
+per versiune a datelor, cu categoriile rare grupate opțional într-o felie "Altele".
 """
 
 import pandas as pd
 import plotly.express as px
 import streamlit as st
 
+from contingenta_date import frecvente_din_cub, get_cub
 from nav_bar import nav_bar
+from schema_date import coloane_de_tip, get_schema
 
 
 st.set_page_config(page_title="Pie charts", page_icon="🥧", layout="wide")
@@ -19,21 +24,50 @@ nav_bar()
 st.title("Pie charts pentru variabilele categoriale")
 df: pd.DataFrame = st.session_state.get("df", default=None)
 
+ETICHETA_ALTELE = "Altele"
+
+
+def grupare_altele(frecvente: pd.Series, max_categorii: int) -> pd.Series:
+	"""
+	Păstrează cele mai frecvente `max_categorii` categorii și le adună pe celelalte într-o singură categorie "Altele".
+
+	Parametri:
+	----------
+	frecvente : pd.Series
+		Numărul de apariții per categorie, sortat descrescător.
+	max_categorii : int
+		Numărul maxim de categorii afișate separat.
+
+	Returnează:
+	-----------
+	pd.Series
+		Frecvențele categoriilor afișate, plus categoria "Altele" dacă există categorii grupate.
+	"""
+	if len(frecvente) <= max_categorii:
+		return frecvente
+	afisate = frecvente.iloc[:max_categorii]
+	afisate.index = afisate.index.astype(object)
+	altele = pd.Series([frecvente.iloc[max_categorii:].sum()], index=[ETICHETA_ALTELE])
+	return pd.concat([afisate, altele])
 
-def plot_pie_si_interpretare(df: pd.DataFrame, coloana: str):
+
+def plot_pie_si_interpretare(frecvente: pd.Series, coloana: str, max_categorii: int):
 	"""
 	Generează o diagramă circulară (pie chart) și interpretează distribuția unei variabile categoriale.
 
 	Parametri:
 	----------
-	df : pd.DataFrame
-		Setul de date care conține coloana analizată.
+	frecvente : pd.Series
+		Numărul de apariții per categorie, sortat descrescător (vezi `contingenta_date.frecvente_din_cub`).
 	coloana : str
 		Numele coloanei categoriale pentru care se va construi diagrama.
+	max_categorii : int
+		Numărul maxim de categorii afișate separat; restul sunt grupate în "Altele".
 
 	Ce face funcția:
 	----------------
-	- Afișează un pie chart interactiv cu Plotly, evidențiind proporțiile fiecărei categorii.
+	- Afișează un pie chart interactiv cu Plotly, evidențiind proporțiile fiecărei categorii,
+	  construit doar din tabelul de frecvențe (o felie per categorie).
 	- Identifică și afișează:
 		- Cea mai frecventă categorie și procentajul său
 		- Numărul total de categorii
@@ -41,17 +75,17 @@ def plot_pie_si_interpretare(df: pd.DataFrame, coloana: str):
 		- Categoriile rare (sub 5% din total)
 	- Prezintă interpretarea textuală direct în interfața Streamlit.
 	"""
-	serie = df[coloana].dropna()
+	felii = grupare_altele(frecvente, max_categorii)
 
 	fig = px.pie(
-		df,
-		names=coloana,
+		names=felii.index.astype(str),
+		values=felii.to_numpy(),
 		title=f"Distribuția valorilor pentru variabila `{coloana}`",
 		hole=0.3
 	)
 	st.plotly_chart(fig, use_container_width=True)
 
-	frecvente = serie.value_counts(normalize=True)
+	frecvente = frecvente / frecvente.sum()
 	top_cat = frecvente.index[0]
 	top_pct = frecvente.iloc[0] * 100
 	total_cat = len(frecvente)
@@ -72,8 +106,12 @@ def plot_pie_si_interpretare(df: pd.DataFrame, coloana: str):
 
 
 if df is not None:
-	coloane_categoriale = df.select_dtypes(include=['object', 'category']).columns
+	coloane_categoriale = coloane_de_tip(get_schema(), "categorială")
 	coloana = st.selectbox("Alege o coloană categorială", coloane_categoriale)
-	plot_pie_si_interpretare(df, coloana)
+	max_categorii = st.slider(
+		"Număr maxim de categorii afișate separat (restul sunt grupate în „Altele”)",
+		min_value=2, max_value=30, value=10,
+	)
+	plot_pie_si_interpretare(frecvente_din_cub(get_cub()[coloana]), coloana, max_categorii)
 else:
 	st.warning("Încarcă mai întâi un fișier CSV.")
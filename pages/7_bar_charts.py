@@ -4,13 +4,17 @@ Vizualizează distribuția valorilor unei variabile categoriale în funcție de
 Folosește un stacked bar chart pentru cele mai frecvente 5 valori din coloana selectată.
 
 Include și explicații pas cu pas pentru procesul de agregare și afișare.
+
+Numărările sunt citite din cubul de contingență categorie × `Target`, calculat o singură dată per versiune a datelor.
 """
 
 import pandas as pd
 import plotly.express as px
 import streamlit as st
 
+from contingenta_date import COLOANA_TINTA, get_cub
 from nav_bar import nav_bar
+from schema_date import coloane_de_tip, get_schema
 
 
 st.set_page_config(page_title="Stacked bar charts", page_icon="📚", layout="wide")
@@ -19,42 +23,37 @@ st.title("Stacked bar charts - agregări în Pandas")
 df: pd.DataFrame = st.session_state.get("df", default=None)
 
 
-def stacked_bar_chart(df: pd.DataFrame, coloana: str):
+def stacked_bar_chart(tabel: pd.DataFrame, coloana: str):
 	"""
 	Creează un stacked bar chart pentru variabila selectată și distribuția claselor din coloana 'Target'.
 
 	Parametri:
 	----------
-	df : pd.DataFrame
-		Setul de date ce conține coloana analizată și coloana țintă 'Target'.
+	tabel : pd.DataFrame
+		Tabelul de contingență al coloanei (valori × clase 'Target'), din cubul de contingență.
 	coloana : str
 		Numele coloanei categoriale pentru care se analizează distribuția claselor.
 
 	Ce face funcția:
 	----------------
-	- Selectează cele mai frecvente 5 valori din coloana dată.
-	- Calculează distribuția clasei 'Target' pentru fiecare dintre aceste valori.
+	- Selectează cele mai frecvente 5 valori din coloana dată (după totalul pe rând din tabel).
+	- Preia distribuția clasei 'Target' pentru fiecare dintre aceste valori direct din tabel.
 	- Afișează o diagramă bară stivuită (stacked bar chart) interactivă cu Plotly.
 	"""
 
-	top_values = df[coloana].value_counts().head(5).index
-
-	df_top = df[df[coloana].isin(top_values)]
-
-	grouped = df_top.groupby([coloana, "Target"]).size().reset_index(name="count")
+	total_count = tabel.sum(axis=1)
+	top_values = total_count.sort_values(ascending=False, kind="stable").head(5).index
 
-	totals = grouped.groupby(coloana)["count"].sum().reset_index(name="total_count")
-	grouped = grouped.merge(totals, on=coloana)
+	grouped = tabel.loc[top_values].stack().reset_index(name="count")
+	grouped = grouped[grouped["count"] > 0]
 
-	grouped = grouped.sort_values(by="total_count", ascending=False)
-
-	grouped[coloana] = pd.Categorical(grouped[coloana], categories=grouped[coloana].unique(), ordered=True)
+	grouped[coloana] = pd.Categorical(grouped[coloana], categories=top_values, ordered=True)
 
 	fig = px.bar(
 		grouped,
 		x=coloana,
 		y="count",
-		color="Target",
+		color=COLOANA_TINTA,
 		barmode="stack",
 		title=f"Distribuția claselor din `Target` pentru cele mai frecvente valori din `{coloana}`"
 	)
@@ -63,53 +62,51 @@ def stacked_bar_chart(df: pd.DataFrame, coloana: str):
 
 
 if df is not None:
-	coloane_categoriale = df.select_dtypes(include=['object', 'category']).columns
+	coloane_categoriale = coloane_de_tip(get_schema(), "categorială")
 	coloana = st.selectbox("Alege o coloană categorială", coloane_categoriale)
-	stacked_bar_chart(df, coloana)
+	stacked_bar_chart(get_cub()[coloana], coloana)
 
 	st.header("Explicații")
 
 	st.markdown("""
-	1. **Selecția valorilor cele mai frecvente din variabila categorică**  
-	   Am păstrat doar **primele 5 valori cele mai frecvente** din coloana aleasă (indiferent de clasa `Target`), astfel încât graficul să fie clar și concentrat pe cele mai reprezentative cazuri.
+	1. **Tabelul de contingență (calculat o singură dată)**  
+	   La încărcarea datelor, pentru fiecare variabilă categorică am numărat câte apariții are fiecare combinație `valoare_coloana + Target`. Valorile și clasele sunt înlocuite cu coduri întregi, iar toate perechile sunt numărate dintr-un singur `np.bincount`, fără `groupby`.
 		""")
 
-	st.code("top_values = df[coloana].value_counts().head(5).index", language="python")
+	st.code("""
+	combinate = coduri_coloana * (numar_clase + 1) + coduri_target
+	tabel = np.bincount(combinate, minlength=numar_valori * (numar_clase + 1)).reshape(numar_valori, numar_clase + 1)
+	""", language="python")
 
 	st.markdown("""
-	2. **Filtrarea datasetului**  
-	   Am păstrat doar rândurile din DataFrame unde valoarea din coloană este una dintre cele 5 selectate anterior.
+	2. **Calcularea totalului per categorie**  
+	   Totalul unei valori (pe toate clasele de `Target`) este suma pe rândul ei din tabel.
 		""")
 
-	st.code("df_top = df[df[coloana].isin(top_values)]", language="python")
+	st.code("total_count = tabel.sum(axis=1)", language="python")
 
 	st.markdown("""
-	3. **Gruparea și agregarea**  
-	   Am grupat datele după combinația `valoare_coloana + Target` și am numărat câte apariții are fiecare combinație (folosind `groupby().size()`).
+	3. **Selecția valorilor cele mai frecvente din variabila categorică**  
+	   Am păstrat doar **primele 5 valori cele mai frecvente** din coloana aleasă (indiferent de clasa `Target`), astfel încât graficul să fie clar și concentrat pe cele mai reprezentative cazuri.
 		""")
 
-	st.code("""grouped = df_top.groupby([coloana, "Target"]).size().reset_index(name="count"))""",
-			language="python")
+	st.code("top_values = total_count.sort_values(ascending=False).head(5).index", language="python")
 
 	st.markdown("""
-	4. **Calcularea totalului per categorie**  
-	   Pentru a putea sorta barele în funcție de câte valori are fiecare categorie în total (pe toate clasele de `Target`), am agregat suma per categorie.
+	4. **Formatul lung pentru grafic**  
+	   Am extras rândurile celor 5 valori din tabel și le-am transformat în perechi `valoare_coloana + Target` cu numărul de apariții.
 		""")
 
-	st.code("""
-	totals = grouped.groupby(coloana)["count"].sum().reset_index(name="total_count")
-	grouped = grouped.merge(totals, on=coloana)
-	""", language="python")
+	st.code("""grouped = tabel.loc[top_values].stack().reset_index(name="count")""", language="python")
 
 	st.markdown("""
 	5. **Sortarea**  
-	   Am sortat datele în funcție de numărul total de observații per categorie și am forțat ordinea pe axa X să reflecte această sortare.
+	   Am forțat ordinea pe axa X să reflecte numărul total de observații per categorie.
 		""")
 
 	st.code("""
-	grouped = grouped.sort_values(by="total_count", ascending=False)
 	grouped[coloana] = pd.Categorical(grouped[coloana],
-									  categories=grouped[coloana].unique(),
+									  categories=top_values,
 									  ordered=True)
 	""", language="python")
 
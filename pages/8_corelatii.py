@@ -3,14 +3,25 @@ Vizualizează corelațiile dintre variabilele selectate dintr-un DataFrame.
 
 Aplică codificare label pentru coloanele categoriale și afișează un heatmap interactiv.
 
-Util pentru identificarea relațiilor liniare între variabile.
+Util pentru identificarea relațiilor liniare (Pearson) sau monotone (Spearman) între variabile.
+Pentru variabilele categoriale nominale oferă măsuri de asociere care nu depind de codificare:
+Cramér's V și informația mutuală normalizată.
+
+Matricele late (ex. setul de antrenare după One Hot Encoding) sunt afișate ca heatmap Plotly,
+trimis către browser ca o singură matrice 2D, cu filtrare după prag sau după cele mai puternice k perechi.
+
+Matricea codificată și matricele de corelație pentru toate coloanele sunt calculate o singură dată
+per versiune a datelor; orice selecție de coloane este extrasă din ele ca submatrice.
 """
 
 import altair as alt
+import numpy as np
 import pandas as pd
-from sklearn.preprocessing import LabelEncoder
+import plotly.graph_objects as go
 import streamlit as st
 
+from asociatii_date import get_asocieri
+from corelatii_date import filtrare_matrice, get_corelatii, get_corelatii_seturi
 from nav_bar import nav_bar
 
 
@@ -20,55 +31,34 @@ st.title("Corelații dintre variabile")
 df: pd.DataFrame = st.session_state.get("df", default=None)
 
 
-def codificare_coloane_categoriale(df, coloane_selectate):
-	"""
-	Aplică Label Encoding pentru coloanele categoriale selectate dintr-un DataFrame.
-
-	Parametri:
-	----------
-	df : pd.DataFrame
-		Setul de date original.
-	coloane_selectate : list of str
-		Lista cu numele coloanelor ce urmează a fi codificate.
-
-	Returnează:
-	-----------
-	pd.DataFrame
-		Un DataFrame nou care conține doar coloanele selectate, codificate numeric.
-	"""
-	df_encoded = df[coloane_selectate].copy()
-
-	for col in coloane_selectate:
-		if df[col].dtype == "object" or df[col].dtype.name == "category":
-			le = LabelEncoder()
-			df_encoded[col] = le.fit_transform(df_encoded[col])
-	return df_encoded
-
-
-def matrice_corelatie(df, coloane_selectate):
+def matrice_corelatie(corelatii, coloane_selectate, asociere: bool = False):
 	"""
-	Calculează și afișează o matrice de corelație pentru coloanele categoriale selectate, codificate numeric.
+	Afișează matricea de corelație pentru coloanele selectate, extrasă din matricea completă.
 
 	Parametri:
 	----------
-	df : pd.DataFrame
-		Setul de date original.
+	corelatii : pd.DataFrame
+		Matricea de corelație a tuturor coloanelor codificate (vezi `corelatii_date.get_corelatii`).
 	coloane_selectate : list of str
-		Lista coloanelor categoriale pentru care se va calcula corelația.
+		Lista coloanelor pentru care se afișează corelația.
+	asociere : bool, implicit False
+		Dacă este True, matricea conține măsuri de asociere între 0 și 1 (Cramér's V, informație mutuală),
+		iar scala de culori pornește de la 0.
 
 	Ce face funcția:
 	----------------
-	- Aplică Label Encoding pe coloanele selectate.
-	- Calculează coeficienții de corelație Pearson între coloanele codificate.
+	- Extrage submatricea coloanelor selectate (coloanele categoriale sunt codificate label).
 	- Afișează o matrice de corelație sub formă de heatmap interactiv cu Altair.
 	- Dacă sunt mai puțin de 10 coloane, afișează și valorile numerice direct pe hartă.
 	"""
-	df_encoded = codificare_coloane_categoriale(df, coloane_selectate)
-	df_corr = df_encoded.corr()
+	df_corr = corelatii.loc[coloane_selectate, coloane_selectate]
 	corr_df = df_corr.stack().reset_index()
 	corr_df.columns = ["x", "y", "corr"]
 
-	color_scale = alt.Scale(domain=[-1, 0, 1], range=["red", "yellow", "green"])
+	if asociere:
+		color_scale = alt.Scale(domain=[0, 1], range=["yellow", "green"])
+	else:
+		color_scale = alt.Scale(domain=[-1, 0, 1], range=["red", "yellow", "green"])
 
 	heatmap = (
 		alt.Chart(corr_df)
@@ -77,7 +67,7 @@ def matrice_corelatie(df, coloane_selectate):
 		.properties(title="Matricea de corelație")
 	)
 
-	if df_encoded.shape[1] < 10:
+	if len(coloane_selectate) < 10:
 		text = (
 			alt.Chart(corr_df)
 			.mark_text(size=12, color="black")
@@ -90,10 +80,110 @@ def matrice_corelatie(df, coloane_selectate):
 	st.altair_chart(chart, use_container_width=True)
 
 
+PRAG_MATRICE_LARGA = 30
+
+
+def heatmap_larg(corelatii, asociere: bool = False, prag: float = None, top_k: int = None):
+	"""
+	Afișează o matrice de corelație lată ca heatmap Plotly, opțional doar cu corelațiile puternice.
+
+	Parametri:
+	----------
+	corelatii : pd.DataFrame
+		Submatricea de corelație (sau de asociere) a coloanelor selectate.
+	asociere : bool, implicit False
+		Dacă este True, valorile sunt între 0 și 1 (Cramér's V, informație mutuală).
+	prag : float, optional
+		Sunt afișate doar valorile cu |valoare| >= prag.
+	top_k : int, optional
+		Sunt afișate doar cele mai puternice `top_k` perechi de coloane.
+
+	Ce face funcția:
+	----------------
+	- Filtrează matricea și păstrează doar coloanele care au cel puțin o corelație afișată.
+	- Trimite matricea către browser ca un singur tablou 2D (`go.Heatmap`), nu ca o listă de celule.
+	- Afișează, pentru matricele filtrate, și lista perechilor păstrate, ordonată după |valoare|.
+	"""
+	filtrata = filtrare_matrice(corelatii, prag, top_k)
+	if filtrata.empty:
+		st.info("Nicio pereche de coloane nu îndeplinește criteriul de filtrare.")
+		return
+
+	if asociere:
+		scala = [[0, "yellow"], [1, "green"]]
+		zmin = 0
+	else:
+		scala = [[0, "red"], [0.5, "yellow"], [1, "green"]]
+		zmin = -1
+	fig = go.Figure(
+		go.Heatmap(
+			z=filtrata.to_numpy(),
+			x=filtrata.columns.astype(str),
+			y=filtrata.index.astype(str),
+			zmin=zmin,
+			zmax=1,
+			colorscale=scala,
+			hoverongaps=False,
+		)
+	)
+	fig.update_layout(
+		title=f"Matricea de corelație ({len(filtrata)} coloane)",
+		height=min(max(500, 14 * len(filtrata)), 1800),
+		yaxis=dict(autorange="reversed"),
+	)
+	st.plotly_chart(fig, use_container_width=True)
+
+	if prag is not None or top_k is not None:
+		sus = np.triu(np.ones(filtrata.shape, dtype=bool), k=1)
+		perechi = filtrata.where(sus).stack().rename("valoare").reset_index()
+		perechi.columns = ["Coloana 1", "Coloana 2", "valoare"]
+		perechi = perechi.reindex(perechi["valoare"].abs().sort_values(ascending=False).index)
+		st.dataframe(perechi, hide_index=True, use_container_width=True)
+
+
 if df is not None:
-	coloane_selectate = st.multiselect("Alegeți coloanele pentru matricea de corelație", df.columns)
+	sursa = st.radio(
+		"Setul de date", ["Datele încărcate", "Setul de antrenare procesat (după codificare)"], horizontal=True
+	)
+	corelatii_seturi = get_corelatii_seturi() if sursa != "Datele încărcate" else None
+	if sursa != "Datele încărcate" and corelatii_seturi is None:
+		st.info("Setul de antrenare nu a fost încă generat. Aplică setările din pagina de procesare a datelor.")
+
+	metode = ["Pearson", "Spearman"] if corelatii_seturi is not None else ["Pearson", "Spearman", "Cramér's V", "Informație mutuală"]
+	metoda = st.radio("Coeficient de corelație / asociere", metode, horizontal=True)
+	asociere = metoda in ["Cramér's V", "Informație mutuală"]
+	if asociere:
+		st.info("Cramér's V și informația mutuală sunt calculate doar pentru variabilele categoriale și booleene.")
+		matrice = get_asocieri()["cramer_v" if metoda == "Cramér's V" else "informatie_mutuala"]
+	elif corelatii_seturi is not None:
+		matrice = corelatii_seturi[metoda.lower()]
+	else:
+		matrice = get_corelatii()[metoda.lower()]
+
+	if st.checkbox(f"Toate coloanele ({len(matrice.columns)})"):
+		coloane_selectate = matrice.columns.tolist()
+	else:
+		coloane_selectate = st.multiselect("Alegeți coloanele pentru matricea de corelație", matrice.columns)
+
+	mod_larg = st.checkbox(
+		"Mod matrice largă (heatmap Plotly, cu filtrarea corelațiilor puternice)",
+		value=len(coloane_selectate) > PRAG_MATRICE_LARGA,
+	)
+	prag = top_k = None
+	if mod_larg:
+		filtru = st.radio(
+			"Afișare", ["Toate valorile", "Doar |valoare| ≥ prag", "Cele mai puternice k perechi"], horizontal=True
+		)
+		if filtru == "Doar |valoare| ≥ prag":
+			prag = st.slider("Prag", min_value=0.0, max_value=1.0, value=0.5, step=0.05)
+		elif filtru == "Cele mai puternice k perechi":
+			top_k = st.number_input("Număr de perechi (k)", min_value=1, value=20, step=5)
+
 	if st.button("Afișare matrice de corelație"):
-		matrice_corelatie(df, coloane_selectate)
+		if mod_larg:
+			heatmap_larg(matrice.loc[coloane_selectate, coloane_selectate], asociere, prag, top_k)
+		else:
+			matrice_corelatie(matrice, coloane_selectate, asociere)
 
 	st.header("Interpretare")
 
@@ -104,6 +194,13 @@ if df is not None:
 			- :orange-background[**Galben**] -> corelație slabă sau inexistentă — nu există o relație liniară clară între variabile.
 			- :red-background[**Roșu**] -> corelație negativă — când o variabilă crește, cealaltă tinde să scadă.
 
+			Coeficientul **Spearman** este calculat pe rangurile valorilor și măsoară relațiile monotone (nu neapărat liniare).
+
+			Pentru variabilele categoriale nominale (ex. `Course`, `Target`), codurile numerice nu au o ordine reală,
+			deci Pearson și Spearman pot induce în eroare. **Cramér's V** (din testul χ²) și **informația mutuală
+			normalizată** măsoară cât de puternic sunt asociate două variabile, între `0` (independență) și `1`
+			(o variabilă o determină complet pe cealaltă), fără a indica un sens al relației.
+
 			Pe **diagonala principală** avem întotdeauna valoarea `1`, deoarece fiecare variabilă este perfect corelată cu ea însăși.
 			""")
 else:
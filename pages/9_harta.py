@@ -3,14 +3,16 @@ Generează o hartă choropleth care arată distribuția studenților după țara
 
 Folosește o transformare logaritmică pentru a echilibra reprezentarea vizuală a frecvențelor.
 
+Harta este construită o singură dată per versiune a datelor (vezi `harta_date`), iar geometria țărilor
+este servită local, din `static/geo`, fără acces la rețea.
+
 Afișează detalii interactive și oferă contextul interpretării în interfața Streamlit.
 """
 
-import numpy as np
 import pandas as pd
-import plotly.express as px
 import streamlit as st
 
+from harta_date import COLOANA_TARA, DIRECTOR_GEO, FISIER_GEOMETRIE, config_harta, geometrie_locala, get_harta
 from nav_bar import nav_bar
 
 
@@ -20,24 +22,22 @@ st.title("Hartă")
 df: pd.DataFrame = st.session_state.get("df", default=None)
 
 if df is not None:
-	if "Country of origin" in df.columns:
-		country_counts = df["Country of origin"].value_counts().reset_index()
-		country_counts.columns = ["Țară", "Număr de studenți"]
-		country_counts["Număr de studenți_log"] = np.log1p(country_counts["Număr de studenți"])
-
-		fig = px.choropleth(
-			country_counts,
-			locations="Țară",
-			locationmode="country names",
-			color="Număr de studenți_log",
-			color_continuous_scale="magenta",
-			title="Distribuția studenților pe țări",
-			hover_data={"Țară": True, "Număr de studenți": True, "Număr de studenți_log": False}
-		)
-
-		fig.update_layout(height=700)
-
-		st.plotly_chart(fig, use_container_width=True)
+	if COLOANA_TARA in df.columns:
+		harta = get_harta()
+		if not geometrie_locala():
+			st.info(
+				f"Geometria țărilor nu există local (`static/{DIRECTOR_GEO.name}/{FISIER_GEOMETRIE}`), "
+				"așa că browserul o va descărca de pe CDN-ul Plotly. Vezi README pentru rularea fără acces la rețea."
+			)
+		if harta["nerezolvate"]:
+			st.caption(f"Țări nerecunoscute, neafișate pe hartă: {', '.join(harta['nerezolvate'])}")
+		if harta["fara_geometrie"]:
+			st.caption(
+				"Țări fără contur în harta inclusă (prea mici la scara 1:110m), neafișate pe hartă: "
+				f"{', '.join(harta['fara_geometrie'])}"
+			)
+
+		st.plotly_chart(harta["figura"], use_container_width=True, config=config_harta())
 
 		st.header("Modul de realizare a hărții")
 		st.markdown("""
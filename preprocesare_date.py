@@ -0,0 +1,429 @@
+"""
+Pipeline de preprocesare antrenat o singură dată (pe setul de antrenare) și aplicabil ulterior pe date noi.
+
+- Fiecare etapă are două operații: `fit` calculează statisticile pe setul de antrenare (limite de outlieri,
+  valori de completare, clasele codificărilor, parametrii scalării), iar `transform` le aplică fără a le recalcula.
+- `PipelinePreprocesare` înlănțuie etapele, păstrează configurația din care au fost create și poate fi salvat
+  pe disc (`joblib`) și reîncărcat pentru aplicarea pe loturi noi de studenți.
+- Datele noi pot fi transformate pe bucăți (`transformare_pe_bucati`), fără a fi încărcate complet în memorie.
+"""
+
+import copy
+from io import BytesIO
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler, RobustScaler, StandardScaler
+
+from contingenta_date import COLOANA_TINTA
+
+
+DIRECTOR_PIPELINE = Path(__file__).parent / ".pipeline_preprocesare"
+SCALARI = {"StandardScaler": StandardScaler, "MinMaxScaler": MinMaxScaler, "RobustScaler": RobustScaler}
+
+
+def coloane_numerice(df: pd.DataFrame) -> list:
+	"""
+	Returnează coloanele numerice ale unui DataFrame, fără coloana 'Target'.
+	"""
+	return [col for col in df.select_dtypes(include="number").columns if col != COLOANA_TINTA]
+
+
+def bloc_numeric(df: pd.DataFrame, coloane: list) -> np.ndarray:
+	"""
+	Returnează coloanele date ca o singură matrice `float64` (rânduri × coloane), cu NaN pentru valorile lipsă.
+	"""
+	return df[coloane].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def inlocuire_bloc(df: pd.DataFrame, coloane: list, X: np.ndarray) -> pd.DataFrame:
+	"""
+	Returnează o copie a DataFrame-ului în care coloanele date sunt înlocuite cu matricea `X`
+	(rânduri × coloane), dintr-o singură operație, păstrând ordinea coloanelor.
+	"""
+	bloc = pd.DataFrame(X, index=df.index, columns=coloane)
+	return pd.concat([df.drop(columns=coloane), bloc], axis=1)[df.columns]
+
+
+def quantile_bloc(X: np.ndarray, quantile: list) -> np.ndarray:
+	"""
+	Calculează quantilele tuturor coloanelor unei matrice deodată, ignorând valorile lipsă
+	(interpolare liniară, ca `pd.Series.quantile`).
+
+	Coloanele sunt sortate o singură dată, pe rânduri contigue; pentru fiecare coloană, pozițiile
+	quantilelor sunt calculate din numărul de valori prezente (NaN sunt sortate la final).
+
+	Parametri:
+	----------
+	X : np.ndarray
+		Matricea valorilor (rânduri × coloane).
+	quantile : list of float
+		Quantilele cerute, în [0, 1].
+
+	Returnează:
+	-----------
+	np.ndarray
+		Matrice (quantile × coloane); NaN pentru coloanele fără nicio valoare.
+	"""
+	quantile = np.asarray(quantile, dtype=np.float64)
+	if len(X) == 0:
+		return np.full((len(quantile), X.shape[1]), np.nan)
+	sortat = np.sort(np.ascontiguousarray(X.T), axis=1)
+	ultim = np.maximum(np.count_nonzero(~np.isnan(sortat), axis=1) - 1, 0)
+	pozitie = quantile[:, None] * ultim
+	jos = np.floor(pozitie).astype(np.intp)
+	sus = np.minimum(jos + 1, ultim)
+	valori_jos = np.take_along_axis(sortat, jos.T, axis=1).T
+	valori_sus = np.take_along_axis(sortat, sus.T, axis=1).T
+	return valori_jos + (valori_sus - valori_jos) * (pozitie - jos)
+
+
+class EtapaPreprocesare:
+	"""
+	Etapă a pipeline-ului de preprocesare: `fit` învață statisticile, `transform` le aplică.
+	"""
+
+	def fit(self, df: pd.DataFrame):
+		return self
+
+	def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+		return df
+
+	def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+		return self.fit(df).transform(df)
+
+
+class TratareOutlieri(EtapaPreprocesare):
+	"""
+	Tratarea outlierilor de pe coloanele numerice, cu limite calculate pe setul de antrenare.
+
+	Parametri:
+	----------
+	strategie : str
+		- "Eliminare rânduri cu outlieri": elimină rândurile cu cel puțin o valoare în afara limitelor IQR,
+		  doar din setul de antrenare (`fit_transform`); setul de testare și datele noi păstrează toate rândurile
+		- "Înlocuire cu NaN": înlocuiește valorile din afara limitelor IQR cu NaN
+		- "Transformare logaritmică": aplică log(1 + x)
+		- "Capping (1%-99%)": limitează valorile la quantilele 1% și 99%
+		- "Păstrare": nu aplică nicio modificare
+
+	Limitele tuturor coloanelor sunt calculate deodată (`quantile_bloc`) și rămân fixe: eliminarea
+	rândurilor folosește o singură mască combinată, deci rezultatul nu depinde de ordinea coloanelor.
+	Transformările sunt aplicate pe întregul bloc numeric, fără o buclă pe coloane.
+	"""
+
+	def __init__(self, strategie: str):
+		self.strategie = strategie
+
+	def fit(self, df: pd.DataFrame):
+		self.coloane = coloane_numerice(df)
+		self.limita_inferioara = None
+		self.limita_superioara = None
+		if self.strategie == "Capping (1%-99%)":
+			self.limita_inferioara, self.limita_superioara = quantile_bloc(bloc_numeric(df, self.coloane), [0.01, 0.99])
+		elif self.strategie in ["Eliminare rânduri cu outlieri", "Înlocuire cu NaN"]:
+			q1, q3 = quantile_bloc(bloc_numeric(df, self.coloane), [0.25, 0.75])
+			iqr = q3 - q1
+			self.limita_inferioara = q1 - 1.5 * iqr
+			self.limita_superioara = q3 + 1.5 * iqr
+		if self.limita_inferioara is not None:
+			# O coloană fără valori în setul de antrenare nu are limite (altfel `np.clip` ar produce doar NaN)
+			self.limita_inferioara = np.where(np.isnan(self.limita_inferioara), -np.inf, self.limita_inferioara)
+			self.limita_superioara = np.where(np.isnan(self.limita_superioara), np.inf, self.limita_superioara)
+		return self
+
+	def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+		return self.aplicare(df, eliminare_randuri=False)
+
+	def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+		return self.fit(df).aplicare(df, eliminare_randuri=True)
+
+	def aplicare(self, df: pd.DataFrame, eliminare_randuri: bool) -> pd.DataFrame:
+		"""
+		Aplică strategia aleasă; rândurile cu outlieri sunt eliminate doar dacă `eliminare_randuri` este True
+		(pe setul de antrenare), altfel sunt păstrate neschimbate.
+		"""
+		if self.strategie == "Păstrare" or not self.coloane:
+			return df
+		if self.strategie == "Eliminare rânduri cu outlieri" and not eliminare_randuri:
+			return df
+		X = bloc_numeric(df, self.coloane)
+		if self.strategie == "Transformare logaritmică":
+			X = np.log1p(X)
+		elif self.strategie == "Capping (1%-99%)":
+			np.clip(X, self.limita_inferioara, self.limita_superioara, out=X)
+		else:
+			# Valorile lipsă nu sunt outlieri (comparațiile cu NaN sunt False)
+			in_afara = (X < self.limita_inferioara) | (X > self.limita_superioara)
+			if self.strategie == "Eliminare rânduri cu outlieri":
+				pastrate = ~in_afara.any(axis=1)
+				return df if pastrate.all() else df[pastrate]
+			X[in_afara] = np.nan
+		return inlocuire_bloc(df, self.coloane, X)
+
+
+class TratareValoriLipsa(EtapaPreprocesare):
+	"""
+	Completarea valorilor lipsă cu valori calculate pe setul de antrenare.
+
+	Parametri:
+	----------
+	strategie : str
+		Metoda de completare pentru coloanele numerice: "Medie", "Mediană" sau "Mod".
+		Coloanele de tip object, category sau bool sunt completate cu valoarea modală.
+	"""
+
+	def __init__(self, strategie: str):
+		self.strategie = strategie
+
+	def fit(self, df: pd.DataFrame):
+		self.valori = {}
+		for col in coloane_numerice(df):
+			if df[col].notna().any():
+				if self.strategie == "Medie":
+					self.valori[col] = df[col].mean()
+				elif self.strategie == "Mediană":
+					self.valori[col] = df[col].median()
+				elif self.strategie == "Mod":
+					self.valori[col] = df[col].mode()[0]
+		for col in df.select_dtypes(include=["object", "category", "bool"]).columns:
+			if col != COLOANA_TINTA and df[col].notna().any():
+				self.valori[col] = df[col].mode()[0]
+		return self
+
+	def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+		valori = {col: valoare for col, valoare in self.valori.items() if col in df.columns and df[col].isna().any()}
+		return df.fillna(valori) if valori else df
+
+
+class Codificare(EtapaPreprocesare):
+	"""
+	Label Encoding (în ordinea aleasă de utilizator) și One Hot Encoding, cu clasele fixate pe setul de antrenare.
+
+	Parametri:
+	----------
+	use_one_hot : bool
+		Dacă este True, se aplică One Hot Encoding pentru variabilele categoriale care nu sunt codificate cu Label Encoding.
+	label_encoding : dict
+		Dicționar {coloană: ordine_valori} pentru Label Encoding.
+	max_categorii : int, optional
+		Număr maxim de categorii pentru One Hot Encoding; coloanele cu mai multe categorii sunt ignorate.
+
+	Valorile necunoscute la transformare primesc codul -1 (Label Encoding), respectiv zero
+	pe toate coloanele binare (One Hot Encoding).
+	"""
+
+	def __init__(self, use_one_hot: bool, label_encoding: dict, max_categorii: int = None):
+		self.use_one_hot = use_one_hot
+		self.label_encoding = {col: list(ordine) for col, ordine in label_encoding.items() if col != COLOANA_TINTA}
+		self.max_categorii = max_categorii
+
+	def fit(self, df: pd.DataFrame):
+		self.categorii_one_hot = {}
+		if self.use_one_hot:
+			ramase = df.select_dtypes(include=["object", "category"]).columns.difference(
+				list(self.label_encoding) + [COLOANA_TINTA]
+			)
+			for col in ramase:
+				categorii = pd.Series(df[col].dropna().unique()).sort_values().tolist()
+				if self.max_categorii is None or len(categorii) <= self.max_categorii:
+					self.categorii_one_hot[col] = categorii
+		return self
+
+	def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+		df = df.copy()
+		for col, ordine in self.label_encoding.items():
+			if col in df.columns:
+				df[col] = pd.Categorical(df[col].astype(str), categories=ordine).codes.astype(np.int64)
+		coloane_one_hot = [col for col in self.categorii_one_hot if col in df.columns]
+		for col in coloane_one_hot:
+			df[col] = pd.Categorical(df[col], categories=self.categorii_one_hot[col])
+		if coloane_one_hot:
+			df = pd.get_dummies(df, columns=coloane_one_hot, drop_first=True)
+		return df
+
+
+class Scalare(EtapaPreprocesare):
+	"""
+	Scalarea coloanelor numerice, cu parametrii scalării învățați pe setul de antrenare.
+
+	Parametri:
+	----------
+	metoda_scalare : str
+		"StandardScaler", "MinMaxScaler", "RobustScaler" sau "Niciuna".
+	"""
+
+	def __init__(self, metoda_scalare: str):
+		self.metoda_scalare = metoda_scalare
+
+	def fit(self, df: pd.DataFrame):
+		self.coloane = coloane_numerice(df)
+		self.scaler = None
+		if self.metoda_scalare in SCALARI and self.coloane:
+			self.scaler = SCALARI[self.metoda_scalare]().fit(df[self.coloane])
+		return self
+
+	def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+		if self.scaler is None:
+			return df
+		df = df.copy()
+		df[self.coloane] = pd.DataFrame(self.scaler.transform(df[self.coloane]), columns=self.coloane, index=df.index)
+		return df
+
+
+class ConversieCategorii(EtapaPreprocesare):
+	"""
+	Fixarea tipurilor de ieșire ale pipeline-ului la cele din setul de antrenare, astfel încât antrenarea
+	și datele noi (ex. un CSV citit pe bucăți, fără tipurile compacte) să aibă aceleași tipuri și coduri.
+
+	- Coloanele `object` și `category` devin `category`, cu categoriile învățate pe setul de antrenare
+	  (categoriile existente, pentru coloanele deja categoriale; valorile distincte sortate, pentru cele obiect).
+	- Celelalte coloane sunt convertite la tipul din setul de antrenare doar dacă valorile se păstrează exact
+	  (ex. `int64` → `int8`); altfel, coloana își păstrează tipul (ex. un întreg cu valori lipsă rămâne real).
+	"""
+
+	def fit(self, df: pd.DataFrame):
+		self.categorii = {}
+		self.tipuri = {}
+		for col in df.columns:
+			if col == COLOANA_TINTA:
+				continue
+			if isinstance(df[col].dtype, pd.CategoricalDtype):
+				self.categorii[col] = df[col].cat.categories.tolist()
+			elif pd.api.types.is_object_dtype(df[col]):
+				self.categorii[col] = pd.Series(df[col].dropna().unique()).sort_values().tolist()
+			else:
+				self.tipuri[col] = df[col].dtype
+		return self
+
+	def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+		df = df.copy()
+		for col, categorii in self.categorii.items():
+			if col in df.columns:
+				df[col] = pd.Categorical(df[col], categories=categorii)
+		for col, tip in self.tipuri.items():
+			if col in df.columns and df[col].dtype != tip:
+				try:
+					convertita = df[col].astype(tip)
+				except (ValueError, TypeError):
+					continue
+				if convertita.astype(df[col].dtype).equals(df[col]):
+					df[col] = convertita
+		return df
+
+
+def creare_etape(config: dict) -> list:
+	"""
+	Creează etapele (neantrenate) ale pipeline-ului din configurația paginii de procesare.
+
+	Returnează:
+	-----------
+	list of tuple (str, object, EtapaPreprocesare)
+		Numele etapei, configurația ei (folosită în cheile de cache) și etapa.
+	"""
+	return [
+		("outlieri", config["tratare_outlieri"], TratareOutlieri(config["tratare_outlieri"])),
+		("valori_lipsa", config["tratare_valori_lipsa"], TratareValoriLipsa(config["tratare_valori_lipsa"])),
+		(
+			"codificare",
+			[config["codificare_one_hot"], config["codificare_label"], config.get("max_categorii")],
+			Codificare(config["codificare_one_hot"], config["codificare_label"], config.get("max_categorii")),
+		),
+		("scalare", config["metoda_scalare"], Scalare(config["metoda_scalare"])),
+		("categorii", None, ConversieCategorii()),
+	]
+
+
+class PipelinePreprocesare:
+	"""
+	Pipeline-ul complet de preprocesare: etapele antrenate, împreună cu configurația din care au fost create.
+
+	Parametri:
+	----------
+	config : dict
+		Configurația paginii de procesare (strategii, codificare, scalare, împărțire).
+	etape : list of EtapaPreprocesare, optional
+		Etapele deja antrenate; implicit, etapele sunt create din configurație și trebuie antrenate cu `fit`.
+	"""
+
+	def __init__(self, config: dict, etape: list = None):
+		self.config = copy.deepcopy(config)
+		self.etape = etape if etape is not None else [etapa for _, _, etapa in creare_etape(config)]
+
+	def fit(self, df: pd.DataFrame):
+		"""
+		Antrenează etapele, pe rând, pe setul de antrenare (fiecare pe ieșirea etapei anterioare).
+		"""
+		for etapa in self.etape:
+			df = etapa.fit_transform(df)
+		return self
+
+	def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+		"""
+		Aplică etapele antrenate pe un set de date nou, fără a recalcula nicio statistică.
+		"""
+		for etapa in self.etape:
+			df = etapa.transform(df)
+		return df
+
+	def transformare_pe_bucati(self, bucati):
+		"""
+		Aplică pipeline-ul pe bucăți succesive de date.
+
+		Parametri:
+		----------
+		bucati : iterable of (pd.DataFrame, float or None)
+			Bucățile citite și fracțiunea parcursă (ex. `incarcare_date.bucati_csv` sau `bucati_parquet`).
+
+		Returnează:
+		-----------
+		generator of (pd.DataFrame, float or None)
+			Bucățile transformate, cu fracțiunea parcursă; toate au aceleași coloane și tipuri,
+			indiferent de valorile prezente în bucată.
+		"""
+		for bucata, fractiune in bucati:
+			yield self.transform(bucata), fractiune
+
+	def salvare(self, cale=None) -> bytes:
+		"""
+		Serializează pipeline-ul (etapele antrenate și configurația) cu `joblib`.
+
+		Parametri:
+		----------
+		cale : str or Path, optional
+			Fișierul în care este salvat pipeline-ul; dacă lipsește, sunt returnați doar octeții.
+
+		Returnează:
+		-----------
+		bytes
+			Conținutul fișierului serializat.
+		"""
+		buffer = BytesIO()
+		joblib.dump(self, buffer)
+		continut = buffer.getvalue()
+		if cale is not None:
+			cale = Path(cale)
+			cale.parent.mkdir(parents=True, exist_ok=True)
+			temporar = cale.with_suffix(cale.suffix + ".tmp")
+			temporar.write_bytes(continut)
+			temporar.replace(cale)
+		return continut
+
+	@staticmethod
+	def incarcare(cale) -> "PipelinePreprocesare":
+		"""
+		Încarcă un pipeline salvat cu `salvare`. Fișierul trebuie să provină dintr-o sursă de încredere
+		(`joblib` poate executa cod la deserializare).
+		"""
+		return joblib.load(cale)
+
+
+def pipeline_salvate() -> list:
+	"""
+	Returnează fișierele pipeline-urilor salvate local, de la cel mai recent.
+	"""
+	if not DIRECTOR_PIPELINE.is_dir():
+		return []
+	return sorted(DIRECTOR_PIPELINE.glob("*.joblib"), key=lambda cale: cale.stat().st_mtime, reverse=True)
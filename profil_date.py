@@ -0,0 +1,348 @@
+"""
+Profilul statistic al setului de date, calculat într-o singură trecere vectorizată și păstrat în cache.
+
+- Pentru coloanele numerice: număr de observații, valori lipsă, minim, maxim, medie, deviație standard,
+  skewness și quantile, calculate pe întregul bloc numeric deodată (NumPy).
+- Pentru coloanele booleene: număr și procent de valori `True`.
+- Pentru coloanele categoriale: număr de valori unice și cele mai frecvente valori (top-k),
+  numărate din codurile întregi ale categoriilor.
+- Profilul este calculat o singură dată per versiune a datelor și citit de paginile de descriere,
+  histograme și box plots.
+- În modul aproximativ (`st.session_state.mod_aproximativ`), profilul este construit din schițele
+  create la citirea datelor, împreună cu limitele de eroare ale fiecărei statistici.
+- Pentru fiecare coloană numerică se păstrează o histogramă de bază fină (`NUMAR_BINURI_BAZA` binuri),
+  din care orice histogramă cu mai puține binuri se obține prin regrupare, fără a parcurge din nou datele.
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from schema_date import coloane_de_tip, get_schema, get_versiune
+from schite_date import SchiteDate, get_schite
+
+
+QUANTILE = [0.01, 0.25, 0.5, 0.75, 0.99]
+NUME_QUANTILE = ["q01", "q25", "mediana", "q75", "q99"]
+TOP_K = 10
+NUMAR_BINURI_BAZA = 1200
+
+
+def std_skew(n: np.ndarray, m2: np.ndarray, m3: np.ndarray):
+	"""
+	Calculează deviația standard (ddof=1) și skewness-ul ajustat (ca în Pandas) din numărul de valori
+	și sumele abaterilor la pătrat și la cub.
+	"""
+	with np.errstate(invalid="ignore", divide="ignore"):
+		std = np.sqrt(m2 / (n - 1))
+		skew = (n * np.sqrt(n - 1) / (n - 2)) * (m3 / m2 ** 1.5)
+	skew = np.where(m2 == 0, 0.0, skew)
+	skew = np.where(n < 3, np.nan, skew)
+	return std, skew
+
+
+def profil_numeric(df: pd.DataFrame) -> pd.DataFrame:
+	"""
+	Calculează statisticile descriptive pentru toate coloanele numerice, într-o singură trecere.
+
+	Parametri:
+	----------
+	df : pd.DataFrame
+		DataFrame-ul care conține doar coloanele numerice.
+
+	Returnează:
+	-----------
+	pd.DataFrame
+		Tabel indexat după coloane, cu: "numar", "valori_lipsa", "min", "max", "media", "std",
+		"skew" și quantilele "q01", "q25", "mediana", "q75", "q99".
+		Deviația standard folosește ddof=1, iar skewness-ul este estimatorul ajustat folosit de Pandas.
+	"""
+	X = df.to_numpy(dtype=np.float64, na_value=np.nan)
+	lipsa = np.isnan(X)
+	n = (~lipsa).sum(axis=0)
+
+	with np.errstate(invalid="ignore", divide="ignore"):
+		media = np.nansum(X, axis=0) / n
+		abateri = np.where(lipsa, 0.0, X - media)
+		m2 = (abateri ** 2).sum(axis=0)
+		m3 = (abateri ** 3).sum(axis=0)
+	std, skew = std_skew(n, m2, m3)
+
+	if len(X):
+		with warnings.catch_warnings():
+			warnings.simplefilter("ignore", RuntimeWarning)
+			minim = np.nanmin(X, axis=0)
+			maxim = np.nanmax(X, axis=0)
+			quantile = np.nanquantile(X, QUANTILE, axis=0)
+	else:
+		minim = maxim = np.full(X.shape[1], np.nan)
+		quantile = np.full((len(QUANTILE), X.shape[1]), np.nan)
+
+	profil = pd.DataFrame({
+		"numar": n,
+		"valori_lipsa": lipsa.sum(axis=0),
+		"min": minim,
+		"max": maxim,
+		"media": media,
+		"std": std,
+		"skew": skew,
+	}, index=df.columns)
+	for nume, valori in zip(NUME_QUANTILE, quantile):
+		profil[nume] = valori
+	return profil
+
+
+def profil_boolean(df: pd.DataFrame) -> pd.DataFrame:
+	"""
+	Calculează numărul și procentul de valori `True` pentru toate coloanele booleene.
+
+	Parametri:
+	----------
+	df : pd.DataFrame
+		DataFrame-ul care conține doar coloanele booleene.
+
+	Returnează:
+	-----------
+	pd.DataFrame
+		Tabel indexat după coloane, cu "numar_true" și "procent_true" (în procente, față de valorile prezente).
+	"""
+	X = df.to_numpy(dtype=np.float64, na_value=np.nan)
+	with np.errstate(invalid="ignore"):
+		numar_true = np.nansum(X, axis=0)
+		procent_true = 100 * numar_true / (~np.isnan(X)).sum(axis=0)
+	return pd.DataFrame({"numar_true": numar_true.astype(np.int64), "procent_true": procent_true}, index=df.columns)
+
+
+def numarare_valori(serie: pd.Series) -> pd.Series:
+	"""
+	Numără aparițiile fiecărei valori dintr-o coloană, folosind codurile întregi și `np.bincount`.
+
+	Parametri:
+	----------
+	serie : pd.Series
+		Coloana analizată (categorială sau obiect).
+
+	Returnează:
+	-----------
+	pd.Series
+		Numărul de apariții per valoare, sortat descrescător (valorile lipsă sunt ignorate).
+	"""
+	if isinstance(serie.dtype, pd.CategoricalDtype):
+		coduri = serie.cat.codes.to_numpy()
+		categorii = serie.cat.categories
+	else:
+		coduri, categorii = pd.factorize(serie)
+	numarari = np.bincount(coduri[coduri >= 0], minlength=len(categorii))
+	frecvente = pd.Series(numarari, index=pd.Index(categorii, name=serie.name), name="count")
+	return frecvente.sort_values(ascending=False, kind="stable")
+
+
+def calcul_profil(df: pd.DataFrame, schema: pd.DataFrame) -> dict:
+	"""
+	Calculează profilul complet al unui DataFrame.
+
+	Parametri:
+	----------
+	df : pd.DataFrame
+		Setul de date.
+	schema : pd.DataFrame
+		Schema setului de date (vezi `schema_date.calcul_schema`).
+
+	Returnează:
+	-----------
+	dict
+		- "numerice": pd.DataFrame — statisticile coloanelor numerice (vezi `profil_numeric`)
+		- "booleene": pd.DataFrame — statisticile coloanelor booleene (vezi `profil_boolean`)
+		- "frecvente": dict {coloană: pd.Series} — cele mai frecvente `TOP_K` valori ale coloanelor categoriale
+	"""
+	coloane_categoriale = coloane_de_tip(schema, "categorială")
+	return {
+		"numerice": profil_numeric(df[coloane_de_tip(schema, "numerică")]),
+		"booleene": profil_boolean(df[coloane_de_tip(schema, "booleană")]),
+		"frecvente": {col: numarare_valori(df[col]).head(TOP_K) for col in coloane_categoriale},
+	}
+
+
+def profil_aproximativ(schite: SchiteDate, top_k: int) -> dict:
+	"""
+	Construiește din schițe un profil cu aceeași structură ca `calcul_profil`.
+
+	Parametri:
+	----------
+	schite : SchiteDate
+		Schițele setului de date (vezi `schite_date`).
+	top_k : int
+		Numărul de valori frecvente returnate pentru fiecare coloană categorială.
+
+	Returnează:
+	-----------
+	dict
+		- "numerice": pd.DataFrame — statistici numerice; quantilele provin din KLL,
+		  iar coloana "eroare_rang" conține eroarea normalizată de rang
+		- "booleene": pd.DataFrame — număr și procent de valori `True` (exacte)
+		- "frecvente": dict {coloană: pd.Series} — cele mai frecvente valori estimate
+		- "eroare_frecvente": dict {coloană: int} — limita erorii de numărare pentru fiecare valoare
+		- "distincte": dict {coloană: (estimare, eroare_relativă)} — numărul estimat de valori distincte
+	"""
+	numerice = {}
+	booleene = {}
+	frecvente = {}
+	eroare_frecvente = {}
+	distincte = {}
+	for col, tip in schite.tipuri.items():
+		coloana = schite.coloane.get(col, {})
+		if tip == "numerică":
+			momente = coloana["momente"]
+			kll = coloana["quantile"]
+			statistici = {
+				"numar": momente.n,
+				"valori_lipsa": schite.nr_randuri - momente.n,
+				"min": momente.min if momente.n else np.nan,
+				"max": momente.max if momente.n else np.nan,
+				"media": momente.media if momente.n else np.nan,
+				"std": momente.std,
+				"skew": momente.skew,
+			}
+			statistici.update(zip(NUME_QUANTILE, kll.quantile(QUANTILE)))
+			statistici["eroare_rang"] = kll.eroare_rang
+			numerice[col] = statistici
+		elif tip == "booleană":
+			contoare = coloana["frecvente"].contoare
+			numar_true = int(contoare.get(True, 0))
+			total = int(coloana["frecvente"].n)
+			booleene[col] = {"numar_true": numar_true, "procent_true": 100 * numar_true / total if total else np.nan}
+		if "distincte" in coloana:
+			distincte[col] = (coloana["distincte"].estimare(), coloana["distincte"].eroare_relativa)
+		if tip == "categorială":
+			frecvente[col] = coloana["frecvente"].top(top_k).rename("count")
+			eroare_frecvente[col] = coloana["frecvente"].eroare
+
+	return {
+		"numerice": pd.DataFrame.from_dict(numerice, orient="index"),
+		"booleene": pd.DataFrame.from_dict(booleene, orient="index"),
+		"frecvente": frecvente,
+		"eroare_frecvente": eroare_frecvente,
+		"distincte": distincte,
+	}
+
+
+def margini_histograma(minim: float, maxim: float, numar_binuri: int = NUMAR_BINURI_BAZA) -> np.ndarray:
+	"""
+	Returnează marginile a `numar_binuri` binuri egale pe intervalul [minim, maxim], ca `np.histogram`
+	(interval [0, 1] pentru o coloană fără valori, interval lărgit cu 0.5 pentru o coloană constantă).
+	"""
+	valori = [minim, maxim] if np.isfinite([minim, maxim]).all() else []
+	return np.histogram_bin_edges(valori, bins=numar_binuri)
+
+
+def rebucketare(numarari: np.ndarray, margini: np.ndarray, numar_binuri: int):
+	"""
+	Regrupează o histogramă de bază într-o histogramă cu mai puține binuri.
+
+	Parametri:
+	----------
+	numarari : np.ndarray
+		Numărul de observații din fiecare bin al histogramei de bază.
+	margini : np.ndarray
+		Marginile binurilor de bază (`len(numarari) + 1` valori).
+	numar_binuri : int
+		Numărul de binuri dorit (cel mult numărul de binuri de bază).
+
+	Returnează:
+	-----------
+	tuple (np.ndarray, np.ndarray)
+		Numărările și marginile noilor binuri. Marginile sunt alese dintre marginile de bază,
+		deci numărările sunt exacte; când `numar_binuri` nu divide numărul de binuri de bază,
+		lățimea binurilor variază cu cel mult o lățime de bază.
+	"""
+	indici = np.rint(np.arange(numar_binuri) * (len(numarari) / numar_binuri)).astype(np.int64)
+	return np.add.reduceat(numarari, indici), margini[np.append(indici, len(numarari))]
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def histograma_versiune(
+	versiune: str, coloana: str, aproximativ: bool, _df: pd.DataFrame, _statistici: pd.Series, _schite: SchiteDate = None
+) -> dict:
+	"""
+	Calculează histograma de bază a unei coloane numerice, o singură dată per versiune a datelor.
+
+	Parametri:
+	----------
+	versiune : str
+		Versiunea datelor (cheia de cache, împreună cu coloana și modul de calcul).
+	coloana : str
+		Coloana numerică.
+	aproximativ : bool
+		Dacă este True, histograma este estimată din schița KLL a coloanei.
+	_df : pd.DataFrame
+		Setul de date (nu face parte din cheia de cache).
+	_statistici : pd.Series
+		Statisticile coloanei din profil (nu fac parte din cheia de cache).
+	_schite : SchiteDate, optional
+		Schițele versiunii, folosite în modul aproximativ (nu fac parte din cheia de cache).
+
+	Returnează:
+	-----------
+	dict
+		- "numarari": np.ndarray — numărul de observații din cele `NUMAR_BINURI_BAZA` binuri
+		- "margini": np.ndarray — marginile binurilor
+		- "statistici": pd.Series — statisticile coloanei (medie, mediană, deviație standard, skewness etc.)
+	"""
+	margini = margini_histograma(_statistici["min"], _statistici["max"])
+	if aproximativ:
+		numarari = np.rint(_schite.coloane[coloana]["quantile"].histograma(margini)).astype(np.int64)
+	else:
+		valori = _df[coloana].to_numpy(dtype=np.float64, na_value=np.nan)
+		numarari, _ = np.histogram(valori[~np.isnan(valori)], bins=margini)
+	return {"numarari": numarari, "margini": margini, "statistici": _statistici}
+
+
+@st.cache_data(show_spinner="Calcul profil date...", max_entries=8)
+def profil_versiune(versiune: str, _df: pd.DataFrame, _schema: pd.DataFrame) -> dict:
+	"""
+	Returnează profilul pentru o versiune a datelor, calculat o singură dată și partajat între sesiuni.
+	"""
+	return calcul_profil(_df, _schema)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def profil_aproximativ_versiune(versiune: str, _schite: SchiteDate) -> dict:
+	"""
+	Returnează profilul aproximativ pentru o versiune a datelor, construit o singură dată din schițe.
+	"""
+	return profil_aproximativ(_schite, TOP_K)
+
+
+def get_profil():
+	"""
+	Returnează profilul datelor din session_state sau None dacă nu există date încărcate.
+
+	În modul aproximativ, profilul este construit din schițe și conține și limitele de eroare.
+	"""
+	df = st.session_state.get("df")
+	if df is None:
+		return None
+	if st.session_state.get("mod_aproximativ", False):
+		return profil_aproximativ_versiune(get_versiune(), get_schite())
+	return profil_versiune(get_versiune(), df, get_schema())
+
+
+def get_histograma(coloana: str):
+	"""
+	Returnează histograma de bază și statisticile unei coloane numerice (vezi `histograma_versiune`)
+	sau None dacă nu există date încărcate.
+	"""
+	profil = get_profil()
+	if profil is None:
+		return None
+	aproximativ = st.session_state.get("mod_aproximativ", False)
+	return histograma_versiune(
+		get_versiune(),
+		coloana,
+		aproximativ,
+		st.session_state.df,
+		profil["numerice"].loc[coloana],
+		get_schite() if aproximativ else None,
+	)
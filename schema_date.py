@@ -0,0 +1,183 @@
+"""
+Schema setului de date, calculată o singură dată la încărcare și partajată de toate paginile.
+
+- Pentru fiecare coloană reține tipul logic (numerică, booleană, categorială), cardinalitatea,
+  numărul de valori lipsă și dacă poate fi folosită ca variabilă țintă sau ca variabilă explicativă.
+- Schema este păstrată în `st.session_state.schema`, alături de `st.session_state.df`
+  și de versiunea datelor (`st.session_state.versiune_date`).
+- Orice modificare a datelor trebuie făcută prin `setare_date`, care actualizează versiunea
+  și invalidează schema; paginile citesc schema cu `get_schema`.
+- În modul aproximativ, cardinalitatea și valorile lipsă sunt citite din schițele versiunii
+  (vezi `schite_date`), fără a parcurge setul de date.
+"""
+
+import uuid
+
+import pandas as pd
+import streamlit as st
+
+
+MAX_CLASE_TINTA = 20
+
+
+def get_tip_variabila(col):
+	"""
+	Determină tipul unei variabile (coloană) dintr-un DataFrame Pandas.
+
+	Parametri:
+	----------
+	col : pd.Series
+		Coloana a cărei tip logic se dorește determinat.
+
+	Returnează:
+	-----------
+	str
+		Tipul variabilei, ca șir de caractere:
+		- "booleană" pentru coloane de tip bool
+		- "numerică" pentru coloane numerice (int, float)
+		- "categorială" pentru tipuri obiect sau categorice
+		- "-" dacă tipul nu se încadrează în cele de mai sus
+	"""
+	match True:
+		case _ if pd.api.types.is_bool_dtype(col):
+			return "booleană"
+		case _ if pd.api.types.is_numeric_dtype(col):
+			return "numerică"
+		case _ if isinstance(col.dtype, pd.CategoricalDtype) or pd.api.types.is_object_dtype(col):
+			return "categorială"
+		case _:
+			return "-"
+
+
+def calcul_schema(df: pd.DataFrame, statistici: pd.DataFrame = None) -> pd.DataFrame:
+	"""
+	Calculează schema unui DataFrame într-o singură trecere.
+
+	Parametri:
+	----------
+	df : pd.DataFrame
+		Setul de date analizat.
+	statistici : pd.DataFrame, optional
+		Cardinalitatea, valorile lipsă și eroarea relativă a cardinalității, citite din schițe
+		(vezi `SchiteDate.statistici_schema`). Doar coloanele care lipsesc din acest tabel sunt parcurse.
+		Un identificator este recunoscut și când cardinalitatea estimată este sub numărul de valori,
+		în limita a trei erori standard.
+
+	Returnează:
+	-----------
+	pd.DataFrame
+		Tabel indexat după numele coloanelor, cu coloanele:
+		- "tip": tipul logic al variabilei (vezi `get_tip_variabila`)
+		- "cardinalitate": numărul de valori distincte (fără valori lipsă)
+		- "valori_lipsa": numărul de valori lipsă
+		- "tinta": True dacă variabila este categorială sau booleană, cu 2-20 de clase
+		- "caracteristica": True dacă variabila nu este constantă și nu este un identificator
+	"""
+	tipuri = pd.Series({col: get_tip_variabila(df[col]) for col in df.columns}, dtype=object)
+	if statistici is None:
+		statistici = pd.DataFrame(columns=["cardinalitate", "valori_lipsa", "eroare_cardinalitate"])
+	ramase = df.columns.difference(statistici.index, sort=False)
+	cardinalitate = df[ramase].nunique().reindex(df.columns).fillna(statistici["cardinalitate"]).astype("int64")
+	valori_lipsa = df[ramase].isnull().sum().reindex(df.columns).fillna(statistici["valori_lipsa"]).astype("int64")
+	eroare = statistici["eroare_cardinalitate"].reindex(df.columns, fill_value=0.0).astype("float64")
+	valori_prezente = len(df) - valori_lipsa
+
+	tinta = tipuri.isin(["categorială", "booleană"]) & cardinalitate.between(2, MAX_CLASE_TINTA)
+	identificator = (
+		(tipuri == "categorială")
+		& (cardinalitate >= (1 - 3 * eroare) * valori_prezente)
+		& (valori_prezente > MAX_CLASE_TINTA)
+	)
+	caracteristica = (tipuri != "-") & (cardinalitate > 1) & ~identificator
+
+	schema = pd.DataFrame({
+		"tip": tipuri,
+		"cardinalitate": cardinalitate,
+		"valori_lipsa": valori_lipsa,
+		"tinta": tinta,
+		"caracteristica": caracteristica,
+	})
+	schema.index.name = "coloana"
+	return schema
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def schema_versiune(versiune: str, aproximativ: bool, _df: pd.DataFrame, _schite=None) -> pd.DataFrame:
+	"""
+	Returnează schema pentru o versiune a datelor, calculată o singură dată și partajată între sesiuni.
+
+	Parametrii `_df` și `_schite` nu sunt folosiți pentru cheia de cache; versiunea identifică datele,
+	iar `aproximativ` indică dacă schema a fost citită din schițe.
+	"""
+	return calcul_schema(_df, _schite.statistici_schema() if aproximativ else None)
+
+
+def setare_date(df: pd.DataFrame, versiune: str = None, schite=None):
+	"""
+	Salvează un set de date în session_state, împreună cu versiunea și schema sa.
+
+	Parametri:
+	----------
+	df : pd.DataFrame
+		Noul set de date.
+	versiune : str, optional
+		Identificatorul versiunii datelor (ex. hash-ul conținutului fișierului încărcat).
+		Dacă lipsește, se generează un identificator nou.
+	schite : SchiteDate, optional
+		Schițele noii versiuni (modul aproximativ, vezi `schite_date.schite_daca_aproximativ`);
+		sunt păstrate în session_state, iar schema este citită din ele.
+	"""
+	if versiune is None:
+		versiune = uuid.uuid4().hex
+	st.session_state.df = df
+	st.session_state.versiune_date = versiune
+	if schite is not None:
+		st.session_state.schite = schite
+		st.session_state.schite_versiune = versiune
+	st.session_state.schema = schema_versiune(versiune, schite is not None, df, schite)
+
+
+def get_versiune():
+	"""
+	Returnează versiunea datelor din session_state sau None dacă nu există date încărcate.
+	"""
+	if st.session_state.get("df") is None:
+		return None
+	if "versiune_date" not in st.session_state:
+		setare_date(st.session_state.df)
+	return st.session_state.versiune_date
+
+
+def get_schema():
+	"""
+	Returnează schema datelor din session_state, calculând-o doar dacă lipsește.
+
+	Returnează:
+	-----------
+	pd.DataFrame or None
+		Schema setului de date curent sau None dacă nu există date încărcate.
+	"""
+	if st.session_state.get("df") is None:
+		return None
+	if "schema" not in st.session_state:
+		setare_date(st.session_state.df, st.session_state.get("versiune_date"))
+	return st.session_state.schema
+
+
+def coloane_de_tip(schema: pd.DataFrame, *tipuri: str) -> list:
+	"""
+	Returnează numele coloanelor din schemă care au unul dintre tipurile logice date.
+
+	Parametri:
+	----------
+	schema : pd.DataFrame
+		Schema obținută cu `get_schema`.
+	*tipuri : str
+		Tipurile logice căutate (ex. "numerică", "categorială").
+
+	Returnează:
+	-----------
+	list of str
+		Coloanele cu tipurile cerute, în ordinea din setul de date.
+	"""
+	return schema.index[schema["tip"].isin(tipuri)].tolist()
@@ -0,0 +1,454 @@
+"""
+Schițe (sketches) combinabile pentru statistici aproximative pe seturi de date foarte mari.
+
+- `SchitaKLL`: quantile aproximative (algoritmul KLL), cu eroare de rang garantată probabilistic.
+- `SchitaHLL`: număr aproximativ de valori distincte (HyperLogLog).
+- `SchitaFrecvente`: cele mai frecvente valori (Misra-Gries / Space-Saving), cu limită a erorii de numărare.
+- `MomenteNumerice`: număr, minim, maxim, medie, deviație standard și skewness, exacte și combinabile.
+
+Schițele sunt actualizate bucată cu bucată în timpul citirii fișierului (vezi `incarcare_date`)
+și pot fi combinate între ele; paginile de descriere le folosesc în modul aproximativ.
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from schema_date import get_tip_variabila, get_versiune
+
+
+K_KLL = 200
+P_HLL = 14
+K_FRECVENTE = 50
+DIMENSIUNE_BUCATA_SCHITE = 100_000
+
+
+def valori_numerice(serie: pd.Series) -> np.ndarray:
+	"""
+	Returnează valorile prezente dintr-o coloană ca vector `float64`, fără valori lipsă.
+	"""
+	valori = serie.to_numpy(dtype=np.float64, na_value=np.nan)
+	return valori[~np.isnan(valori)]
+
+
+class MomenteNumerice:
+	"""
+	Momente exacte și combinabile ale unei coloane numerice (formulele paralele Chan/Pébay).
+	"""
+
+	def __init__(self):
+		self.n = 0
+		self.media = 0.0
+		self.m2 = 0.0
+		self.m3 = 0.0
+		self.min = np.inf
+		self.max = -np.inf
+
+	def combinare_momente(self, n_b, media_b, m2_b, m3_b, min_b, max_b):
+		"""
+		Combină momentele curente cu momentele unui alt set de valori.
+		"""
+		if n_b == 0:
+			return
+		n_a = self.n
+		n = n_a + n_b
+		delta = media_b - self.media
+		self.m3 = (
+			self.m3 + m3_b
+			+ delta ** 3 * n_a * n_b * (n_a - n_b) / n ** 2
+			+ 3 * delta * (n_a * m2_b - n_b * self.m2) / n
+		)
+		self.m2 = self.m2 + m2_b + delta ** 2 * n_a * n_b / n
+		self.media = self.media + delta * n_b / n
+		self.n = n
+		self.min = min(self.min, min_b)
+		self.max = max(self.max, max_b)
+
+	def actualizare(self, valori: np.ndarray):
+		"""
+		Adaugă un vector de valori (fără valori lipsă).
+		"""
+		if len(valori) == 0:
+			return
+		media = valori.mean()
+		abateri = valori - media
+		self.combinare_momente(
+			len(valori), media, (abateri ** 2).sum(), (abateri ** 3).sum(), valori.min(), valori.max()
+		)
+
+	def combinare(self, alta: "MomenteNumerice"):
+		"""
+		Combină momentele cu cele ale altei schițe.
+		"""
+		self.combinare_momente(alta.n, alta.media, alta.m2, alta.m3, alta.min, alta.max)
+
+	@property
+	def std(self):
+		return np.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else np.nan
+
+	@property
+	def skew(self):
+		if self.n < 3:
+			return np.nan
+		if self.m2 == 0:
+			return 0.0
+		n = self.n
+		return (n * np.sqrt(n - 1) / (n - 2)) * (self.m3 / self.m2 ** 1.5)
+
+
+class SchitaKLL:
+	"""
+	Schiță KLL pentru quantile aproximative.
+
+	Valorile sunt păstrate pe niveluri; o valoare de pe nivelul h reprezintă 2^h valori originale.
+	Când un nivel își depășește capacitatea, este sortat și jumătate din valori (alese cu un
+	offset aleator) sunt promovate pe nivelul următor. Memoria ocupată este O(k), indiferent de n.
+	"""
+
+	def __init__(self, k: int = K_KLL, seed: int = 0):
+		self.k = k
+		self.n = 0
+		self.niveluri = [np.empty(0)]
+		self.rng = np.random.default_rng(seed)
+
+	def capacitate(self, nivel: int) -> int:
+		inaltime = len(self.niveluri)
+		return max(2, int(np.ceil(self.k * (2 / 3) ** (inaltime - 1 - nivel))))
+
+	def compactare(self):
+		"""
+		Compactează nivelurile care și-au depășit capacitatea, de jos în sus.
+		"""
+		nivel = 0
+		while nivel < len(self.niveluri):
+			if len(self.niveluri[nivel]) > self.capacitate(nivel):
+				if nivel + 1 == len(self.niveluri):
+					self.niveluri.append(np.empty(0))
+				elemente = np.sort(self.niveluri[nivel])
+				pastrate = elemente[len(elemente) - len(elemente) % 2:]
+				elemente = elemente[:len(elemente) - len(elemente) % 2]
+				promovate = elemente[self.rng.integers(2)::2]
+				self.niveluri[nivel] = pastrate
+				self.niveluri[nivel + 1] = np.concatenate([self.niveluri[nivel + 1], promovate])
+			nivel += 1
+
+	def actualizare(self, valori: np.ndarray):
+		"""
+		Adaugă un vector de valori (fără valori lipsă).
+		"""
+		self.n += len(valori)
+		self.niveluri[0] = np.concatenate([self.niveluri[0], valori])
+		self.compactare()
+
+	def combinare(self, alta: "SchitaKLL"):
+		"""
+		Combină schița cu o altă schiță KLL (rezultatul aproximează reuniunea datelor).
+		"""
+		while len(self.niveluri) < len(alta.niveluri):
+			self.niveluri.append(np.empty(0))
+		for nivel, elemente in enumerate(alta.niveluri):
+			self.niveluri[nivel] = np.concatenate([self.niveluri[nivel], elemente])
+		self.n += alta.n
+		self.k = min(self.k, alta.k)
+		self.compactare()
+
+	def elemente_ponderate(self):
+		"""
+		Returnează valorile păstrate, sortate, împreună cu ponderile lor.
+		"""
+		valori = np.concatenate(self.niveluri)
+		ponderi = np.concatenate([np.full(len(elemente), 2.0 ** nivel) for nivel, elemente in enumerate(self.niveluri)])
+		ordine = np.argsort(valori, kind="stable")
+		return valori[ordine], ponderi[ordine]
+
+	def quantile(self, q):
+		"""
+		Returnează quantilele aproximative pentru fracțiunile `q` (scalar sau vector).
+		"""
+		valori, ponderi = self.elemente_ponderate()
+		if len(valori) == 0:
+			return np.full(np.shape(q), np.nan)
+		cumulate = np.cumsum(ponderi)
+		pozitii = np.searchsorted(cumulate, np.asarray(q) * cumulate[-1], side="left")
+		return valori[np.minimum(pozitii, len(valori) - 1)]
+
+	def rang(self, x, strict: bool = False):
+		"""
+		Returnează fracțiunea aproximativă de valori mai mici (sau egale, dacă `strict` este False) decât `x`.
+		"""
+		valori, ponderi = self.elemente_ponderate()
+		if len(valori) == 0:
+			return np.nan
+		cumulate = np.concatenate([[0.0], np.cumsum(ponderi)])
+		pozitii = np.searchsorted(valori, x, side="left" if strict else "right")
+		return cumulate[pozitii] / cumulate[-1]
+
+	def histograma(self, bin_edges: np.ndarray) -> np.ndarray:
+		"""
+		Returnează numărul aproximativ de valori din fiecare bin, pe baza valorilor ponderate.
+		"""
+		valori, ponderi = self.elemente_ponderate()
+		counts, _ = np.histogram(valori, bins=bin_edges, weights=ponderi)
+		return counts
+
+	@property
+	def eroare_rang(self) -> float:
+		"""
+		Eroarea normalizată de rang (≈ 99% încredere); 0 dacă nu a avut loc nicio compactare.
+		"""
+		if len(self.niveluri) == 1:
+			return 0.0
+		return 2.296 / self.k ** 0.9723
+
+
+class SchitaHLL:
+	"""
+	Schiță HyperLogLog pentru numărul de valori distincte, cu 2^p registre.
+	"""
+
+	def __init__(self, p: int = P_HLL):
+		self.p = p
+		self.registre = np.zeros(2 ** p, dtype=np.uint8)
+
+	@staticmethod
+	def hash_serie(serie: pd.Series) -> np.ndarray:
+		"""
+		Calculează hash-uri pe 64 de biți pentru valorile prezente, consistente între bucăți.
+		"""
+		if isinstance(serie.dtype, pd.CategoricalDtype):
+			coduri = serie.cat.codes.to_numpy()
+			hash_categorii = pd.util.hash_array(serie.cat.categories.astype(str).to_numpy(dtype=object))
+			return hash_categorii[coduri[coduri >= 0]]
+		if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+			return pd.util.hash_array(valori_numerice(serie) + 0.0)
+		return pd.util.hash_array(serie.dropna().astype(str).to_numpy(dtype=object))
+
+	def actualizare(self, serie: pd.Series):
+		"""
+		Adaugă valorile unei coloane.
+		"""
+		h = self.hash_serie(serie)
+		if len(h) == 0:
+			return
+		biti_rest = 64 - self.p
+		index = (h >> np.uint64(biti_rest)).astype(np.int64)
+		rest = (h & np.uint64((1 << biti_rest) - 1)).astype(np.float64)
+		rang = np.where(rest == 0, biti_rest + 1, biti_rest - np.floor(np.log2(np.maximum(rest, 1))))
+		np.maximum.at(self.registre, index, rang.astype(np.uint8))
+
+	def combinare(self, alta: "SchitaHLL"):
+		"""
+		Combină schița cu o altă schiță HLL (maximul registrelor).
+		"""
+		np.maximum(self.registre, alta.registre, out=self.registre)
+
+	def estimare(self) -> float:
+		"""
+		Returnează numărul estimat de valori distincte.
+		"""
+		m = len(self.registre)
+		alpha = 0.7213 / (1 + 1.079 / m)
+		estimare = alpha * m ** 2 / np.sum(2.0 ** -self.registre.astype(np.float64))
+		registre_nule = np.count_nonzero(self.registre == 0)
+		if estimare <= 2.5 * m and registre_nule > 0:
+			estimare = m * np.log(m / registre_nule)
+		return float(estimare)
+
+	@property
+	def eroare_relativa(self) -> float:
+		"""
+		Eroarea standard relativă a estimării (1.04 / sqrt(m)).
+		"""
+		return 1.04 / np.sqrt(len(self.registre))
+
+
+class SchitaFrecvente:
+	"""
+	Schiță Misra-Gries pentru cele mai frecvente valori, cu cel mult k contoare.
+
+	Numărările estimate sunt limite inferioare; numărul real se află în intervalul [estimare, estimare + eroare].
+	"""
+
+	def __init__(self, k: int = K_FRECVENTE):
+		self.k = k
+		self.n = 0
+		self.eroare = 0
+		self.contoare = pd.Series(dtype=np.int64)
+
+	def adaugare_contoare(self, contoare: pd.Series, n: int, eroare: int = 0):
+		"""
+		Adaugă contoarele unei alte bucăți și reduce schița la cel mult k contoare.
+		"""
+		self.n += n
+		self.eroare += eroare
+		combinate = self.contoare.add(contoare, fill_value=0).astype(np.int64)
+		if len(combinate) > self.k:
+			prag = combinate.nlargest(self.k + 1).iloc[-1]
+			combinate = combinate - prag
+			combinate = combinate[combinate > 0]
+			self.eroare += int(prag)
+		self.contoare = combinate
+
+	def actualizare(self, serie: pd.Series):
+		"""
+		Adaugă valorile unei coloane (numărate exact în interiorul bucății).
+		"""
+		contoare = serie.astype(object).value_counts()
+		self.adaugare_contoare(contoare, int(contoare.sum()))
+
+	def combinare(self, alta: "SchitaFrecvente"):
+		"""
+		Combină schița cu o altă schiță de frecvențe.
+		"""
+		self.adaugare_contoare(alta.contoare, alta.n, alta.eroare)
+
+	def top(self, numar: int) -> pd.Series:
+		"""
+		Returnează cele mai frecvente `numar` valori, cu numărările estimate.
+		"""
+		return self.contoare.sort_values(ascending=False, kind="stable").head(numar)
+
+
+class SchiteDate:
+	"""
+	Colecție de schițe pentru toate coloanele unui set de date, actualizată bucată cu bucată.
+
+	- coloane numerice: `MomenteNumerice`, `SchitaKLL`, `SchitaHLL`
+	- coloane categoriale: `SchitaHLL`, `SchitaFrecvente`
+	- coloane booleene: `SchitaFrecvente` (exactă, având doar două valori)
+	"""
+
+	def __init__(self):
+		self.tipuri = {}
+		self.coloane = {}
+		self.nr_randuri = 0
+
+	def actualizare(self, bucata: pd.DataFrame):
+		"""
+		Actualizează schițele cu o bucată de date. Tipul coloanelor este stabilit la prima bucată.
+		"""
+		if not self.tipuri:
+			for col in bucata.columns:
+				tip = get_tip_variabila(bucata[col])
+				self.tipuri[col] = tip
+				if tip == "numerică":
+					self.coloane[col] = {
+						"momente": MomenteNumerice(),
+						"quantile": SchitaKLL(),
+						"distincte": SchitaHLL(),
+					}
+				elif tip == "categorială":
+					self.coloane[col] = {"distincte": SchitaHLL(), "frecvente": SchitaFrecvente()}
+				elif tip == "booleană":
+					self.coloane[col] = {"frecvente": SchitaFrecvente()}
+
+		self.nr_randuri += len(bucata)
+		for col, schite in self.coloane.items():
+			serie = bucata[col]
+			if "momente" in schite:
+				valori = valori_numerice(serie)
+				schite["momente"].actualizare(valori)
+				schite["quantile"].actualizare(valori)
+			if "distincte" in schite:
+				schite["distincte"].actualizare(serie)
+			if "frecvente" in schite:
+				schite["frecvente"].actualizare(serie)
+
+	def statistici_schema(self) -> pd.DataFrame:
+		"""
+		Returnează, pentru coloanele urmărite, cardinalitatea și numărul de valori lipsă citite din schițe
+		(vezi `schema_date.calcul_schema`), fără a parcurge datele.
+
+		Returnează:
+		-----------
+		pd.DataFrame
+			Indexat după coloane, cu:
+			- "cardinalitate": estimarea HyperLogLog (exactă pentru coloanele booleene)
+			- "valori_lipsa": numărul exact de valori lipsă (rânduri minus valorile numărate de schiță)
+			- "eroare_cardinalitate": eroarea relativă a cardinalității (0 pentru coloanele booleene)
+		"""
+		statistici = {}
+		for col, schite in self.coloane.items():
+			if "momente" in schite:
+				prezente = schite["momente"].n
+			else:
+				prezente = schite["frecvente"].n
+			if "distincte" in schite:
+				cardinalitate = int(round(schite["distincte"].estimare()))
+				eroare = schite["distincte"].eroare_relativa
+			else:
+				cardinalitate = int((schite["frecvente"].contoare > 0).sum())
+				eroare = 0.0
+			statistici[col] = {
+				"cardinalitate": min(cardinalitate, prezente),
+				"valori_lipsa": self.nr_randuri - prezente,
+				"eroare_cardinalitate": eroare,
+			}
+		return pd.DataFrame.from_dict(
+			statistici, orient="index", columns=["cardinalitate", "valori_lipsa", "eroare_cardinalitate"]
+		)
+
+	def golire(self):
+		"""
+		Elimină toate schițele (ex. când tipul unei coloane se schimbă după primele bucăți).
+		"""
+		self.tipuri = {}
+		self.coloane = {}
+		self.nr_randuri = 0
+
+	def combinare(self, alta: "SchiteDate"):
+		"""
+		Combină schițele cu cele ale altei colecții cu aceleași coloane.
+		"""
+		if not self.tipuri:
+			self.tipuri = dict(alta.tipuri)
+			self.coloane = alta.coloane
+			self.nr_randuri = alta.nr_randuri
+			return
+		self.nr_randuri += alta.nr_randuri
+		for col, schite in self.coloane.items():
+			for nume, schita in schite.items():
+				schita.combinare(alta.coloane[col][nume])
+
+
+def construire_schite(df: pd.DataFrame, dimensiune_bucata: int = DIMENSIUNE_BUCATA_SCHITE) -> SchiteDate:
+	"""
+	Construiește schițele pentru un DataFrame deja încărcat, parcurgându-l pe bucăți.
+	"""
+	schite = SchiteDate()
+	for inceput in range(0, max(len(df), 1), dimensiune_bucata):
+		schite.actualizare(df.iloc[inceput:inceput + dimensiune_bucata])
+	return schite
+
+
+@st.cache_data(show_spinner="Construire schițe...", max_entries=8)
+def schite_versiune(versiune: str, _df: pd.DataFrame) -> SchiteDate:
+	"""
+	Returnează schițele pentru o versiune a datelor, construite o singură dată și partajate între sesiuni.
+	"""
+	return construire_schite(_df)
+
+
+def schite_daca_aproximativ(versiune: str, df: pd.DataFrame):
+	"""
+	Returnează schițele unei noi versiuni a datelor dacă modul aproximativ este activ (construite o singură dată),
+	altfel None. Rezultatul se transmite la `setare_date`, astfel încât schema să fie citită din schițe.
+	"""
+	if not st.session_state.get("mod_aproximativ", False):
+		return None
+	return schite_versiune(versiune, df)
+
+
+def get_schite():
+	"""
+	Returnează schițele datelor curente: cele construite la citire, dacă aparțin versiunii curente,
+	altfel le construiește (o singură dată per versiune).
+	"""
+	df = st.session_state.get("df")
+	if df is None:
+		return None
+	versiune = get_versiune()
+	if st.session_state.get("schite_versiune") == versiune:
+		return st.session_state.schite
+	return schite_versiune(versiune, df)
+